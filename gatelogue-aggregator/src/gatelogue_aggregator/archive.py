@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+import zipfile
+from threading import Lock
+from typing import TYPE_CHECKING, NamedTuple, Self
+
+import msgspec
+import msgspec.json
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+class ArchivedResponse(NamedTuple):
+    status: int
+    text: str
+    etag: bytes | None
+
+
+class _Record(msgspec.Struct):
+    url: str
+    status: int
+    text: str
+    etag: str | None
+
+
+class Archive:
+    """Responses to the network requests of a run, stored in a zip file with one compressed entry per URL.
+    A run recorded into an archive can be replayed from it later without any network access"""
+
+    def __init__(self, path: Path, *, recording: bool):
+        self.path = path
+        self.recording = recording
+        self.lock = Lock()
+        self.zip = zipfile.ZipFile(path, "w" if recording else "r", compression=zipfile.ZIP_DEFLATED, compresslevel=9)
+        self.names: set[str] = set() if recording else set(self.zip.namelist())
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @staticmethod
+    def _name(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json"
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _read(self, name: str) -> tuple[str, ArchivedResponse]:
+        with self.lock:
+            data = self.zip.read(name)
+        record = msgspec.json.decode(data, type=_Record)
+        etag = None if record.etag is None else record.etag.encode()
+        return record.url, ArchivedResponse(record.status, record.text, etag)
+
+    def get(self, url: str) -> ArchivedResponse:
+        name = self._name(url)
+        if name not in self.names:
+            msg = f"{url} was not recorded in {self.path}"
+            raise LookupError(msg)
+        return self._read(name)[1]
+
+    def responses(self) -> Iterator[tuple[str, ArchivedResponse]]:
+        """Every recorded URL and its response"""
+        for name in sorted(self.names):
+            yield self._read(name)
+
+    def put(self, url: str, response: ArchivedResponse):
+        """Records the response to ``url``. Only the first response to every URL is kept"""
+        name = self._name(url)
+        etag = None if response.etag is None else response.etag.decode()
+        data = msgspec.json.encode(_Record(url, response.status, response.text, etag))
+        with self.lock:
+            if name in self.names:
+                return
+            self.names.add(name)
+            self.zip.writestr(name, data)
+
+    def close(self):
+        with self.lock:
+            self.zip.close()
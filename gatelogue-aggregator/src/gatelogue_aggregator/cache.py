@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+import zlib
+from threading import Lock
+from typing import TYPE_CHECKING, ClassVar, NamedTuple
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class CacheEntry(NamedTuple):
+    key: str
+    url: str
+    hash: str
+    etag: bytes | None
+    until: float | None
+    size: int
+    accessed: float
+
+
+class CacheStats(NamedTuple):
+    entries: int
+    objects: int
+    size: int
+    """Total size of the entries' decompressed bodies in bytes"""
+    stored_size: int
+    """Total size of the compressed objects on disk in bytes"""
+    oldest_access: float | None
+
+
+class Cache:
+    """Download cache in a directory. Metadata of every entry is kept in one SQLite index (``index.db``),
+    and bodies are stored zlib-compressed under ``objects/``, named by the SHA-256 hash of their contents,
+    so identical bodies under different keys are only stored once"""
+
+    CACHES_LOCK: ClassVar[Lock] = Lock()
+    CACHES: ClassVar[dict[Path, Cache]] = {}
+
+    def __init__(self, cache_dir: Path):
+        self.dir = cache_dir
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.lock = Lock()
+        self.conn = sqlite3.connect(self.dir / "index.db", check_same_thread=False, autocommit=True)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS Entry ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, hash TEXT NOT NULL, etag BLOB, until REAL, "
+            "size INTEGER NOT NULL, accessed REAL NOT NULL"
+            ") STRICT"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS EntryHashIndex ON Entry (hash)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS EntryAccessedIndex ON Entry (accessed)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS Derived ("
+            "hash TEXT NOT NULL, name TEXT NOT NULL, data BLOB NOT NULL, PRIMARY KEY (hash, name)"
+            ") STRICT"
+        )
+
+    @classmethod
+    def of(cls, cache_dir: Path) -> Cache:
+        """The cache in ``cache_dir``, shared between all callers"""
+        with cls.CACHES_LOCK:
+            if (cache := cls.CACHES.get(cache_dir)) is None:
+                cache = cls.CACHES[cache_dir] = cls(cache_dir)
+            return cache
+
+    def _object_path(self, hash_: str) -> Path:
+        return self.dir / "objects" / hash_[:2] / hash_
+
+    def entry(self, key: str) -> CacheEntry | None:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT key, url, hash, etag, until, size, accessed FROM Entry WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or not self._object_path(row[2]).exists():
+            return None
+        return CacheEntry(*row)
+
+    def read(self, entry: CacheEntry) -> str:
+        """Reads the body of an entry, and marks it as accessed"""
+        text = zlib.decompress(self._object_path(entry.hash).read_bytes()).decode("utf-8")
+        with self.lock:
+            self.conn.execute("UPDATE Entry SET accessed = ? WHERE key = ?", (time.time(), entry.key))
+        return text
+
+    def put(self, key: str, url: str, text: str, etag: bytes | None, until: float | None):
+        body = text.encode("utf-8")
+        hash_ = hashlib.sha256(body).hexdigest()
+        path = self._object_path(hash_)
+        compressed = None if path.exists() else zlib.compress(body)
+        with self.lock:
+            if compressed is not None and not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(compressed)
+                tmp.replace(path)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO Entry (key, url, hash, etag, until, size, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, hash_, etag, until, len(body), time.time()),
+            )
+
+    def expired(self) -> list[CacheEntry]:
+        """All entries whose expiry time has passed"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, url, hash, etag, until, size, accessed FROM Entry WHERE until IS NULL OR until <= ?",
+                (time.time(),),
+            ).fetchall()
+        return [CacheEntry(*row) for row in rows]
+
+    def extend(self, key: str, until: float):
+        """Sets a new expiry time for an entry whose body is known to be still up-to-date"""
+        with self.lock:
+            self.conn.execute("UPDATE Entry SET until = ? WHERE key = ?", (until, key))
+
+    def derived(self, hash_: str, name: str) -> bytes | None:
+        """The result of ``name`` on the body with hash ``hash_``, if saved with :py:meth:`put_derived`"""
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM Derived WHERE hash = ? AND name = ?", (hash_, name)).fetchone()
+        return None if row is None else row[0]
+
+    def put_derived(self, hash_: str, name: str, data: bytes):
+        """Saves data derived from the body with hash ``hash_``, such as what a source extracted from it.
+        It is kept for as long as an entry has that body"""
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO Derived (hash, name, data) VALUES (?, ?, ?)", (hash_, name, data))
+
+    def remove(self, key: str):
+        with self.lock:
+            self.conn.execute("DELETE FROM Entry WHERE key = ?", (key,))
+
+    def stats(self) -> CacheStats:
+        with self.lock:
+            entries, size, oldest_access = self.conn.execute(
+                "SELECT count(*), coalesce(sum(size), 0), min(accessed) FROM Entry"
+            ).fetchone()
+        objects = [p for p in (self.dir / "objects").glob("*/*") if p.suffix != ".tmp"]
+        return CacheStats(entries, len(objects), size, sum(p.stat().st_size for p in objects), oldest_access)
+
+    def prune(self, *, max_size: int | None = None, max_age: float | None = None) -> int:
+        """Evicts entries not accessed in the last ``max_age`` seconds, then the least recently accessed entries
+        until the bodies of those left take up at most ``max_size`` bytes, then deletes objects and derived data
+        no entry refers to
+
+        :return: Number of entries evicted
+        """
+        with self.lock:
+            before = self.conn.execute("SELECT count(*) FROM Entry").fetchone()[0]
+            if max_age is not None:
+                self.conn.execute("DELETE FROM Entry WHERE accessed < ?", (time.time() - max_age,))
+            if max_size is not None:
+                self.conn.execute(
+                    "DELETE FROM Entry WHERE key IN ("
+                    "SELECT key FROM (SELECT key, sum(size) OVER (ORDER BY accessed DESC, key) AS total FROM Entry) "
+                    "WHERE total > ?)",
+                    (max_size,),
+                )
+            after = self.conn.execute("SELECT count(*) FROM Entry").fetchone()[0]
+            self.conn.execute("DELETE FROM Derived WHERE hash NOT IN (SELECT hash FROM Entry)")
+            hashes = {hash_ for (hash_,) in self.conn.execute("SELECT DISTINCT hash FROM Entry")}
+
+            for path in (self.dir / "objects").glob("*/*"):
+                if path.name not in hashes:
+                    path.unlink(missing_ok=True)
+        return before - after
@@ -1,24 +1,40 @@
 from __future__ import annotations
 
+import contextlib
 import sqlite3
+import tempfile
+from datetime import datetime
 from pathlib import Path
 
 import click
-import gatelogue_types as gt
 import msgspec.json
 import rich
-import rich.progress
 
 from gatelogue_aggregator.__about__ import __version__
-from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import DEFAULT_CACHE_DIR, DEFAULT_CACHE_DURATION, DEFAULT_COOLDOWN, DEFAULT_TIMEOUT
-from gatelogue_aggregator.gatelogue_data import GatelogueData
-from gatelogue_aggregator.logging import INFO1
-from gatelogue_aggregator.source import Source
-from gatelogue_aggregator.sources import SOURCES
+from gatelogue_aggregator.cache import Cache
+from gatelogue_aggregator.config import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_CACHE_DURATION,
+    DEFAULT_CACHE_MAX_SIZE,
+    DEFAULT_COOLDOWN,
+    DEFAULT_HTML_PARSER,
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_TIMEOUT,
+    HTML_PARSERS,
+    Config,
+)
+from gatelogue_aggregator.logging import ERROR, INFO1, INFO2, timed
+
+# `gatelogue_types`, the downloader, `GatelogueData` and the sources are only imported by the commands that need them,
+# as importing every source (and the libraries they use) takes a while
 
 
 def _enc_hook(obj):
+    from gatelogue_aggregator.source import Source  # noqa: PLC0415
+
     if isinstance(obj, type) and issubclass(obj, Source):
         return str(obj)
     raise NotImplementedError(obj)
@@ -53,6 +69,13 @@ def gatelogue_aggregator():
     show_default=True,
     help="how long to hold cached files retrieved from URLs for",
 )
+@click.option(
+    "--cache-max-size",
+    default=DEFAULT_CACHE_MAX_SIZE,
+    type=int,
+    show_default=True,
+    help="size in bytes to prune the cache down to after running, evicting the least recently used entries first",
+)
 @click.option(
     "--timeout",
     default=DEFAULT_TIMEOUT,
@@ -65,7 +88,21 @@ def gatelogue_aggregator():
     default=DEFAULT_COOLDOWN,
     type=int,
     show_default=True,
-    help="how long to wait before sending new requests to the same URL if `429 Too Many Requests` is received",
+    help="how long to wait before retrying a failed network request, doubled with every attempt, unless the server sends `Retry-After`",
+)
+@click.option(
+    "--max-attempts",
+    default=DEFAULT_MAX_ATTEMPTS,
+    type=int,
+    show_default=True,
+    help="how many times to try a network request before giving up",
+)
+@click.option(
+    "--rate-limit",
+    default=DEFAULT_RATE_LIMIT,
+    type=float,
+    show_default=True,
+    help="maximum number of network requests per second to the same host (use 0 for no limit)",
 )
 @click.option(
     "-o",
@@ -86,6 +123,61 @@ def gatelogue_aggregator():
     show_default=True,
     help="maximum number of concurrent workers that download and process data",
 )
+@click.option(
+    "--max-connections",
+    type=int,
+    default=DEFAULT_MAX_CONNECTIONS,
+    show_default=True,
+    help="maximum number of network requests in flight at once when downloading ahead of time",
+)
+@click.option(
+    "--max-connections-per-host",
+    type=int,
+    default=DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    show_default=True,
+    help="maximum number of network requests in flight at once to the same host when downloading ahead of time",
+)
+@click.option(
+    "-d",
+    "--database",
+    default=":memory:",
+    type=str,
+    show_default=True,
+    help="where to create the working database during aggregation, which must not exist yet (use `:memory:` to keep it in memory)",
+)
+@click.option(
+    "-b/-B",
+    "--batch/--no-batch",
+    default=True,
+    show_default=True,
+    help="write to the working database in one transaction per source and per merge pass, with faster but less durable PRAGMAs",
+)
+@click.option(
+    "-s/-S",
+    "--staging/--no-staging",
+    default=True,
+    show_default=True,
+    help="build every source into its own database concurrently before importing them, instead of one at a time",
+)
+@click.option(
+    "--html-parser",
+    type=click.Choice(HTML_PARSERS),
+    default=DEFAULT_HTML_PARSER,
+    show_default=True,
+    help="what to parse wiki pages with; lxml is faster but has to be installed with the lxml extra",
+)
+@click.option(
+    "--record",
+    type=Path,
+    default=None,
+    help="record the responses to all network requests into this zip archive, starting from an empty cache",
+)
+@click.option(
+    "--offline",
+    type=Path,
+    default=None,
+    help="answer all network requests from an archive made with `--record` instead of the network (do not use with --record)",
+)
 @click.option(
     "-ce",
     "--cache-exclude",
@@ -114,18 +206,34 @@ def run(
     *,
     cache_dir: Path,
     cache_duration: int,
+    cache_max_size: int,
     timeout: int,
     cooldown: int,
+    max_attempts: int,
+    rate_limit: float,
     output: Path,
     report: bool,
     max_workers: int,
+    max_connections: int,
+    max_connections_per_host: int,
+    database: str,
+    batch: bool,
+    staging: bool,
     cache_exclude: str,
+    html_parser: str,
+    record: Path | None,
+    offline: Path | None,
     include: str,
     exclude: str,
 ):
+    from gatelogue_aggregator.downloader import archive  # noqa: PLC0415
+    from gatelogue_aggregator.gatelogue_data import GatelogueData  # noqa: PLC0415
+    from gatelogue_aggregator.sources import SOURCES  # noqa: PLC0415
+
     if include and exclude:
         raise click.BadOptionUsage("--include/--exclude", "cannot use --include and --exclude at the same time")  # noqa: EM101
-
+    if record is not None and offline is not None:
+        raise click.BadOptionUsage("--record/--offline", "cannot use --record and --offline at the same time")  # noqa: EM101
     sources = [
         a
         for a in SOURCES()
@@ -136,24 +244,54 @@ def run(
     # pyrefly: ignore [bad-assignment]
     cache_exclude = [c.__name__ for c in sources] if cache_exclude == "*" else cache_exclude.split(";")
 
-    config = Config(
-        cache_dir=cache_dir,
-        cache_duration=cache_duration,
-        timeout=timeout,
-        cooldown=cooldown,
-        # pyrefly: ignore [bad-argument-type]
-        cache_exclude=cache_exclude,
-        max_workers=max_workers,
-    )
+    with contextlib.ExitStack() as stack:
+        if record is not None or offline is not None:
+            # nothing may be read from an existing cache, so that every response goes through the archive
+            cache_dir = Path(
+                stack.enter_context(tempfile.TemporaryDirectory(prefix="gatelogue-", ignore_cleanup_errors=True))
+            )
+
+        config = Config(
+            cache_dir=cache_dir,
+            cache_duration=cache_duration,
+            cache_max_size=cache_max_size,
+            timeout=timeout,
+            cooldown=cooldown,
+            max_attempts=max_attempts,
+            rate_limit=rate_limit,
+            # pyrefly: ignore [bad-argument-type]
+            cache_exclude=cache_exclude,
+            max_workers=max_workers,
+            max_connections=max_connections,
+            max_connections_per_host=max_connections_per_host,
+            staging=staging,
+            batch=batch,
+            html_parser=html_parser,
+        )
+
+        if record is not None:
+            archive_context = archive(record, recording=True)
+        elif offline is not None:
+            archive_context = archive(offline, recording=False)
+        else:
+            archive_context = contextlib.nullcontext()
 
-    gd = GatelogueData(config, sources)
+        with archive_context as a, timed(INFO1, "Aggregation"):
+            gd = GatelogueData(config, sources, database)
+        if a is not None and a.recording:
+            rich.print(INFO1 + f"Recorded {len(a)} response(s) to {record}")
 
-    if report:
-        gd.report()
+        evicted = Cache.of(config.cache_dir).prune(max_size=config.cache_max_size)
+        rich.print(INFO1 + f"Evicted {evicted} entries from the cache")
 
-    if output != Path("/dev/null"):
-        rich.print(INFO1 + f"Writing to {output}")
-        gd.gd.conn.backup(sqlite3.connect(output))
+        if report:
+            gd.report()
+
+        if output != Path("/dev/null"):
+            with timed(INFO1, f"Writing to {output}"):
+                gd.gd.drop_indices()
+                if Path(database).resolve() != output.resolve():
+                    gd.gd.conn.backup(sqlite3.connect(output))
 
 
 # @gatelogue_aggregator.command(help="create a graph of the DB")
@@ -198,7 +336,94 @@ def run(
     help="path to output the sourceless DB to",
 )
 def drop_sources(*, input_: Path, output: Path):
+    import gatelogue_types as gt  # noqa: PLC0415
+
     gd = gt.GD.from_bytes(input_.read_bytes())
     gd.drop_sources()
     gd.conn.commit()
     gd.conn.backup(sqlite3.connect(output))
+
+
+@gatelogue_aggregator.command(
+    help="time parsing the wiki pages in an archive made with `run --record` with every installed HTML parser"
+)
+@click.argument("archive_path", metavar="ARCHIVE", type=Path)
+@click.option(
+    "-n",
+    "--repeat",
+    type=int,
+    default=3,
+    show_default=True,
+    help="how many times to parse all pages with each parser, keeping the fastest time",
+)
+def benchmark_html(*, archive_path: Path, repeat: int):
+    import timeit  # noqa: PLC0415
+
+    from bs4 import BeautifulSoup  # noqa: PLC0415
+    from bs4.builder import builder_registry  # noqa: PLC0415
+
+    from gatelogue_aggregator.archive import Archive  # noqa: PLC0415
+
+    pages = []
+    with Archive(archive_path, recording=False) as a:
+        for _, response in a.responses():
+            try:
+                pages.append(msgspec.json.decode(response.text)["parse"]["text"])
+            except (msgspec.DecodeError, KeyError, TypeError):
+                continue
+    rich.print(INFO1 + f"Parsing {len(pages)} wiki page(s) {repeat} time(s) with each parser")
+
+    for parser in HTML_PARSERS:
+        if builder_registry.lookup(parser) is None:
+            rich.print(ERROR + f"{parser} is not installed")
+            continue
+
+        def parse_all(parser: str = parser):
+            for page in pages:
+                BeautifulSoup(page, features=parser)
+
+        rich.print(INFO2 + f"{parser}: {min(timeit.repeat(parse_all, number=1, repeat=repeat)):.3f}s")
+
+
+@gatelogue_aggregator.group(help="inspect or clean up the download cache")
+def cache():
+    pass
+
+
+_cache_dir_option = click.option(
+    "--cache-dir",
+    default=DEFAULT_CACHE_DIR,
+    type=Path,
+    show_default=True,
+    help="where files downloaded from the Internet are cached",
+)
+
+
+@cache.command(help="print statistics about the download cache")
+@_cache_dir_option
+def stats(*, cache_dir: Path):
+    s = Cache.of(cache_dir).stats()
+    rich.print(INFO1 + f"{s.entries} cached file(s) in {cache_dir}, stored as {s.objects} object(s)")
+    rich.print(INFO1 + f"{s.size} bytes cached, taking up {s.stored_size} bytes compressed")
+    if s.oldest_access is not None:
+        rich.print(INFO1 + f"Least recently used file was last used at {datetime.fromtimestamp(s.oldest_access)}")  # noqa: DTZ006
+
+
+@cache.command(help="evict entries from the download cache")
+@_cache_dir_option
+@click.option(
+    "--max-size",
+    type=int,
+    default=None,
+    help="size in bytes to prune the cache down to, evicting the least recently used entries first",
+)
+@click.option(
+    "--max-age",
+    type=int,
+    default=None,
+    help="evict entries that have not been used for this many seconds",
+)
+@click.option("-a", "--all", "all_", is_flag=True, default=False, help="evict all entries")
+def prune(*, cache_dir: Path, max_size: int | None, max_age: int | None, all_: bool):
+    evicted = Cache.of(cache_dir).prune(max_size=0 if all_ else max_size, max_age=max_age)
+    rich.print(INFO1 + f"Evicted {evicted} entries from {cache_dir}")
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import dataclasses
-from typing import TYPE_CHECKING
+import tempfile
+from pathlib import Path
 
-from gatelogue_aggregator.downloader import DEFAULT_CACHE_DIR, DEFAULT_CACHE_DURATION, DEFAULT_COOLDOWN, DEFAULT_TIMEOUT
-
-if TYPE_CHECKING:
-    from pathlib import Path
+DEFAULT_TIMEOUT = 60
+DEFAULT_COOLDOWN = 15
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "gatelogue"
+DEFAULT_CACHE_DURATION = 3600
+DEFAULT_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 4
+DEFAULT_RATE_LIMIT = 4.0
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_HTML_PARSER = "html.parser"
+HTML_PARSERS = ("html.parser", "lxml")
+"""BeautifulSoup tree builders that wiki pages can be parsed with. ``lxml`` is faster, but only available if installed"""
 
 
 @dataclasses.dataclass
@@ -14,6 +23,14 @@ class Config:
     cache_dir: Path = DEFAULT_CACHE_DIR
     timeout: int = DEFAULT_TIMEOUT
     cooldown: int = DEFAULT_COOLDOWN
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    rate_limit: float = DEFAULT_RATE_LIMIT
     cache_duration: int = DEFAULT_CACHE_DURATION
+    cache_max_size: int = DEFAULT_CACHE_MAX_SIZE
     cache_exclude: list[str] = dataclasses.field(default_factory=list)
     max_workers: int = 8
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST
+    staging: bool = True
+    batch: bool = True
+    html_parser: str = DEFAULT_HTML_PARSER
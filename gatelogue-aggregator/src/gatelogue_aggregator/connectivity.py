@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import itertools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Iterable, Iterator
+
+
+def located_node_edges(conn: sqlite3.Connection) -> Iterator[tuple[int, int]]:
+    """Every pair of located nodes that can be travelled between, i.e. in proximity, or with a flight or connection between them"""
+    return itertools.chain(
+        conn.execute("SELECT node1, node2 FROM Proximity"),
+        conn.execute(
+            "SELECT DISTINCT A.airport, B.airport FROM AirFlight "
+            'INNER JOIN AirGate A ON AirFlight."from" = A.i '
+            'INNER JOIN AirGate B ON AirFlight."to" = B.i'
+        ),
+        conn.execute(
+            "SELECT DISTINCT A.stop, B.stop FROM BusConnection "
+            'INNER JOIN BusBerth A ON BusConnection."from" = A.i '
+            'INNER JOIN BusBerth B ON BusConnection."to" = B.i'
+        ),
+        conn.execute(
+            "SELECT DISTINCT A.stop, B.stop FROM SeaConnection "
+            'INNER JOIN SeaDock A ON SeaConnection."from" = A.i '
+            'INNER JOIN SeaDock B ON SeaConnection."to" = B.i'
+        ),
+        conn.execute(
+            "SELECT DISTINCT A.station, B.station FROM RailConnection "
+            'INNER JOIN RailPlatform A ON RailConnection."from" = A.i '
+            'INNER JOIN RailPlatform B ON RailConnection."to" = B.i'
+        ),
+    )
+
+
+class DisjointSet[T]:
+    """Union-find over a fixed set of items, keeping track of the members of every component"""
+
+    def __init__(self, items: Iterable[T]):
+        self.parent: dict[T, T] = {item: item for item in items}
+        self.members: dict[T, set[T]] = {item: {item} for item in self.parent}
+
+    def find(self, item: T) -> T:
+        root = item
+        while (parent := self.parent[root]) != root:
+            root = parent
+        while item != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, item1: T, item2: T) -> bool:
+        """Joins the components of both items. Items that are not part of the set are ignored.
+
+        :return: Whether two different components were joined
+        """
+        if item1 not in self.parent or item2 not in self.parent:
+            return False
+        root1 = self.find(item1)
+        root2 = self.find(item2)
+        if root1 == root2:
+            return False
+        if len(self.members[root1]) < len(self.members[root2]):
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        self.members[root1] |= self.members.pop(root2)
+        return True
+
+    def union_all(self, pairs: Iterable[tuple[T, T]]):
+        for item1, item2 in pairs:
+            self.union(item1, item2)
+
+    def components(self) -> list[set[T]]:
+        return list(self.members.values())
+
+    def isolated(self) -> list[set[T]]:
+        """Copies of every component other than the largest"""
+        components = self.components()
+        if len(components) > 0:
+            components.remove(max(components, key=len))
+        return [set(c) for c in components]
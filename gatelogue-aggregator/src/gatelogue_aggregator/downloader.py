@@ -1,37 +1,175 @@
 from __future__ import annotations
 
-import tempfile
+import asyncio
+import contextlib
+import csv
+import dataclasses
+import email.utils
+import gc
+import hashlib
+import io
+import marshal
+import random
 import time
-from datetime import timedelta
-from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import Future
+from datetime import UTC, datetime, timedelta
+from itertools import batched, islice
 from threading import Lock
-from typing import TYPE_CHECKING
-from urllib.parse import urlparse
+from typing import TYPE_CHECKING, NamedTuple
+from urllib.parse import parse_qs, quote, urlparse
 
 import msgspec
 import msgspec.json
-import pandas as pd
+import msgspec.msgpack
 import rich
-import rich.status
-from bs4 import BeautifulSoup
+import rnet
+import rnet.exceptions
 from rnet import Emulation
-from rnet.blocking import Client, Response
+from rnet.blocking import Client
 from rnet.redirect import Policy
 
-from gatelogue_aggregator.logging import ERROR, INFO3, progress_bar
+from gatelogue_aggregator.archive import Archive, ArchivedResponse
+from gatelogue_aggregator.cache import Cache, CacheEntry
+from gatelogue_aggregator.logging import ERROR, INFO2, INFO3, RESULT, progress_bar
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
+
+    import bs4
+    import pandas as pd
+    from bs4 import BeautifulSoup
+
     from gatelogue_aggregator.config import Config
 
-DEFAULT_TIMEOUT = 60
-DEFAULT_COOLDOWN = 15
-DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "gatelogue"
-DEFAULT_CACHE_DURATION = 3600
+WIKI_API = "https://wiki.minecartrapidtransit.net/api.php"
+MAX_BACKOFF = 300
+
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
 
 SESSION = Client(redirect=Policy.limited(10), emulation=Emulation.Chrome145)
 
-COOLDOWN_LOCK = Lock()
-COOLDOWN: dict[str, float] = {}
+
+@dataclasses.dataclass
+class _Bucket:
+    tokens: float
+    updated: float
+    paused_until: float = 0.0
+
+
+class RateLimiter:
+    """Token bucket per host, refilled at ``rate`` tokens per second up to ``rate`` tokens (or 1 if ``rate < 1``).
+    Hosts can also be paused, e.g. when they respond with ``429 Too Many Requests``"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.buckets: dict[str, _Bucket] = {}
+
+    def _bucket(self, netloc: str, burst: float, now: float) -> _Bucket:
+        if (bucket := self.buckets.get(netloc)) is None:
+            bucket = self.buckets[netloc] = _Bucket(burst, now)
+        return bucket
+
+    def reserve(self, netloc: str, rate: float) -> float:
+        """Takes a token for a request to ``netloc``
+
+        :return: How long to wait in seconds before sending the request
+        """
+        now = time.monotonic()
+        burst = max(1.0, rate)
+        with self.lock:
+            bucket = self._bucket(netloc, burst, now)
+            wait = max(0.0, bucket.paused_until - now)
+            if rate > 0:
+                bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated) * rate) - 1
+                bucket.updated = now
+                if bucket.tokens < 0:
+                    wait = max(wait, -bucket.tokens / rate)
+            return wait
+
+    def pause(self, netloc: str, seconds: float):
+        """Stops requests to ``netloc`` for the next ``seconds`` seconds"""
+        now = time.monotonic()
+        with self.lock:
+            bucket = self._bucket(netloc, 1.0, now)
+            bucket.paused_until = max(bucket.paused_until, now + seconds)
+
+
+RATE_LIMITER = RateLimiter()
+
+ARCHIVE: Archive | None = None
+
+PREFETCHED_LOCK = Lock()
+PREFETCHED: dict[str, Future[str]] = {}
+
+
+class Request(NamedTuple):
+    url: str
+    key: str
+    empty_is_error: bool = False
+
+
+@contextlib.contextmanager
+def archive(path: Path, *, recording: bool) -> Iterator[Archive]:
+    """While in this context, the response to every network request is recorded into an :py:class:`Archive` at ``path``,
+    or, if not ``recording``, every network request is answered from that archive without touching the network"""
+    global ARCHIVE  # noqa: PLW0603
+    with Archive(path, recording=recording) as a:
+        ARCHIVE = a
+        try:
+            yield a
+        finally:
+            ARCHIVE = None
+
+
+def _replay(url: str) -> ArchivedResponse | None:
+    if ARCHIVE is None or ARCHIVE.recording:
+        return None
+    rich.print(INFO3 + f"Replaying {url}")
+    return ARCHIVE.get(url)
+
+
+def _record(url: str, response: ArchivedResponse) -> ArchivedResponse:
+    if ARCHIVE is not None and ARCHIVE.recording and response.status != 304:
+        ARCHIVE.put(url, response)
+    return response
+
+
+def _retry_after(value: bytes | None) -> float | None:
+    if value is None:
+        return None
+    text = value.decode().strip()
+    if text.isdigit():
+        return float(text)
+    try:
+        return max(0.0, (email.utils.parsedate_to_datetime(text) - datetime.now(UTC)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int, config: Config, retry_after: bytes | None = None) -> float:
+    """How long to wait before retrying after ``attempt`` failed attempts. Honours ``Retry-After`` if given,
+    otherwise doubles ``config.cooldown`` with every attempt, with jitter"""
+    if (delay := _retry_after(retry_after)) is not None:
+        return min(delay, MAX_BACKOFF)
+    delay = min(config.cooldown * 2 ** (attempt - 1), MAX_BACKOFF)
+    return delay / 2 + random.uniform(0, delay / 2)  # noqa: S311
+
+
+def _should_retry(url: str, netloc: str, attempt: int, config: Config, retry_after: bytes | None = None) -> bool:
+    if attempt >= config.max_attempts:
+        rich.print(ERROR + f"Giving up on {url} after {attempt} attempt(s)")
+        return False
+    delay = _backoff(attempt, config, retry_after)
+    RATE_LIMITER.pause(netloc, delay)
+    rich.print(ERROR + f"Will try {url} again in {delay:.0f}s (attempt {attempt + 1}/{config.max_attempts})")
+    return True
+
+
+def _is_error(status: int, text: str, *, empty_is_error: bool) -> bool:
+    # a 304 never has a body, so it is not an error even if an empty body is
+    return status >= 400 or (empty_is_error and status != 304 and text == "")
 
 
 def _get_url(
@@ -40,33 +178,71 @@ def _get_url(
     *,
     etag: bytes | None = None,
     empty_is_error: bool = False,
-) -> Response:
+) -> tuple[int, str, bytes | None]:
+    if (response := _replay(url)) is not None:
+        return response
     with progress_bar(INFO3, f"  Downloading {url}"):
         netloc = urlparse(url).netloc
-        with COOLDOWN_LOCK:
-            cond = netloc in COOLDOWN and time.time() < (cool := COOLDOWN[netloc])
-        if cond:
-            rich.print(INFO3 + f"Waiting for {url} cooldown")
-            time.sleep(abs(cool - time.time()))
-
         headers = {"If-None-Match": etag.decode()} if etag is not None else {}
-        response = SESSION.get(url, timeout=timedelta(seconds=config.timeout), headers=headers)
 
-        if response.status.as_int() >= 400 or (empty_is_error and response.text == ""):
-            rich.print(ERROR + f"Received {response.status} error from {url}:\n{response.text()}")
-            if response.status.as_int() in (408, 429):
-                with COOLDOWN_LOCK:
-                    COOLDOWN[netloc] = time.time() + DEFAULT_COOLDOWN
-                rich.print(ERROR + f"Will try {url} again in 15s")
-                return _get_url(url, config, empty_is_error=empty_is_error)
+        attempt = 0
+        while True:
+            attempt += 1
+            if (wait := RATE_LIMITER.reserve(netloc, config.rate_limit)) > 0:
+                if wait >= 1:
+                    rich.print(INFO3 + f"Waiting {wait:.0f}s for {url}")
+                time.sleep(wait)
 
-        return response
+            try:
+                response = SESSION.get(url, timeout=timedelta(seconds=config.timeout), headers=headers)
+                status = response.status.as_int()
+                text = response.text("utf-8")
+            except (rnet.exceptions.ConnectionError, rnet.exceptions.TimeoutError) as e:
+                rich.print(ERROR + f"Could not connect to {url}: {e}")
+                if _should_retry(url, netloc, attempt, config):
+                    continue
+                raise
+
+            if _is_error(status, text, empty_is_error=empty_is_error):
+                rich.print(ERROR + f"Received {status} error from {url}:\n{text}")
+                if (status in RETRY_STATUSES or status < 400) and _should_retry(
+                    url, netloc, attempt, config, response.headers.get("retry-after", None)
+                ):
+                    continue
+
+            return _record(url, ArchivedResponse(status, text, response.headers.get("etag", None)))
 
 
-def _deconstruct_response(response: Response):
-    text = response.text("utf-8")
-    etag = response.headers.get("etag", None)
-    return text, etag
+def _write_cache(url: str, key: str, config: Config, text: str, etag: bytes | None, until: float | None):
+    if until is None or until <= time.time():
+        until = time.time() + config.cache_duration
+    Cache.of(config.cache_dir).put(key, url, text, etag, until)
+    rich.print(INFO3 + f"Saved {url} to cache as {key}")
+
+
+def _keep_cached(url: str, key: str, config: Config, entry: CacheEntry | None, status: int) -> str:
+    """After an error response, which is never cached, returns the body of ``entry`` if there is one, however old"""
+    if entry is None:
+        msg = f"Received {status} error from {url}"
+        raise ValueError(msg)
+    rich.print(ERROR + f"Keeping {url} at cache {key} after receiving {status} error")
+    return Cache.of(config.cache_dir).read(entry)
+
+
+def _prefetched(key: str) -> str | None:
+    with PREFETCHED_LOCK:
+        future = PREFETCHED.get(key)
+    if future is None:
+        return None
+    try:
+        return future.result()
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _discard_prefetched(key: str):
+    with PREFETCHED_LOCK:
+        PREFETCHED.pop(key, None)
 
 
 def get_url(
@@ -76,90 +252,418 @@ def get_url(
     *,
     empty_is_error: bool = False,
 ) -> str:
-    cache = config.cache_dir / key
-    etag_path = config.cache_dir / (key + ".etag")
-    until_path = config.cache_dir / (key + ".until")
-
-    etag = etag_path.read_bytes() if etag_path.exists() else None
-    until = float(until_path.read_text()) if until_path.exists() else None
-
-    if not cache.exists():
-        response = _get_url(url, config, empty_is_error=empty_is_error)
-        text, etag = _deconstruct_response(response)
-    elif until is not None and until > time.time():
-        text = cache.read_text()
-        rich.print(INFO3 + f"Reading {url} from {cache}")
-    elif etag is not None:
-        rich.print(INFO3 + f"Checking etag {etag} for {url} and cache {cache}")
-        response = _get_url(url, config, etag=etag, empty_is_error=empty_is_error)
-        if response.status.as_int() == 304:
-            text = cache.read_text()
-            rich.print(INFO3 + f"No change to {url} at cache {cache}")
-        else:
-            text, etag = _deconstruct_response(response)
-            rich.print(INFO3 + f"Change detected at {url} at cache {cache} with etag {etag}")
+    if (text := _prefetched(key)) is not None:
+        return text
+
+    cache = Cache.of(config.cache_dir)
+    entry = cache.entry(key)
+    etag = until = None
+
+    if entry is None:
+        status, text, etag = _get_url(url, config, empty_is_error=empty_is_error)
+    elif entry.until is not None and entry.until > time.time():
+        rich.print(INFO3 + f"Reading {url} from cache as {key}")
+        return cache.read(entry)
+    elif entry.etag is not None:
+        rich.print(INFO3 + f"Checking etag {entry.etag} for {url} and cache {key}")
+        status, text, etag = _get_url(url, config, etag=entry.etag, empty_is_error=empty_is_error)
+        if status == 304:
+            text, etag, until = cache.read(entry), entry.etag, entry.until
+            rich.print(INFO3 + f"No change to {url} at cache {key}")
+        elif not _is_error(status, text, empty_is_error=empty_is_error):
+            rich.print(INFO3 + f"Change detected at {url} at cache {key} with etag {etag}")
     else:
-        response = _get_url(url, config, empty_is_error=empty_is_error)
-        text, etag = _deconstruct_response(response)
+        status, text, etag = _get_url(url, config, empty_is_error=empty_is_error)
 
-    cache.parent.mkdir(parents=True, exist_ok=True)
-    cache.touch()
-    cache.write_text(text)
-    rich.print(INFO3 + f"Saved {url} to cache {cache}")
+    if _is_error(status, text, empty_is_error=empty_is_error):
+        return _keep_cached(url, key, config, entry, status)
+    _write_cache(url, key, config, text, etag, until)
+    return text
 
-    if until is None or until <= time.time():
-        until = time.time() + config.cache_duration
-    if etag is not None:
-        etag_path.touch()
-        etag_path.write_bytes(etag)
-    if until is not None:
-        until_path.touch()
-        until_path.write_text(str(until))
+
+class _Limits:
+    def __init__(self, config: Config):
+        self.total = asyncio.Semaphore(config.max_connections)
+        self.per_host: defaultdict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(config.max_connections_per_host)
+        )
+
+
+async def _get_url_async(
+    client: rnet.Client,
+    url: str,
+    config: Config,
+    limits: _Limits,
+    *,
+    etag: bytes | None = None,
+    empty_is_error: bool = False,
+) -> tuple[int, str, bytes | None]:
+    if (response := _replay(url)) is not None:
+        return response
+    netloc = urlparse(url).netloc
+    headers = {"If-None-Match": etag.decode()} if etag is not None else {}
+
+    attempt = 0
+    while True:
+        attempt += 1
+        async with limits.per_host[netloc]:
+            if (wait := RATE_LIMITER.reserve(netloc, config.rate_limit)) > 0:
+                if wait >= 1:
+                    rich.print(INFO3 + f"Waiting {wait:.0f}s for {url}")
+                await asyncio.sleep(wait)
+
+            async with limits.total:
+                rich.print(INFO3 + f"Downloading {url}")
+                try:
+                    response = await client.get(url, timeout=timedelta(seconds=config.timeout), headers=headers)
+                    status = response.status.as_int()
+                    text = await response.text("utf-8")
+                except (rnet.exceptions.ConnectionError, rnet.exceptions.TimeoutError) as e:
+                    rich.print(ERROR + f"Could not connect to {url}: {e}")
+                    if _should_retry(url, netloc, attempt, config):
+                        continue
+                    raise
+
+        if _is_error(status, text, empty_is_error=empty_is_error):
+            rich.print(ERROR + f"Received {status} error from {url}:\n{text}")
+            if (status in RETRY_STATUSES or status < 400) and _should_retry(
+                url, netloc, attempt, config, response.headers.get("retry-after", None)
+            ):
+                continue
+
+        return _record(url, ArchivedResponse(status, text, response.headers.get("etag", None)))
+
+
+async def _get_cached_url_async(client: rnet.Client, request: Request, config: Config, limits: _Limits) -> str:
+    url, key, empty_is_error = request
+    cache = Cache.of(config.cache_dir)
+    entry = cache.entry(key)
+    etag = until = None
+
+    if entry is None:
+        status, text, etag = await _get_url_async(client, url, config, limits, empty_is_error=empty_is_error)
+    elif entry.until is not None and entry.until > time.time():
+        rich.print(INFO3 + f"Reading {url} from cache as {key}")
+        return cache.read(entry)
+    elif entry.etag is not None:
+        rich.print(INFO3 + f"Checking etag {entry.etag} for {url} and cache {key}")
+        status, text, etag = await _get_url_async(
+            client, url, config, limits, etag=entry.etag, empty_is_error=empty_is_error
+        )
+        if status == 304:
+            text, etag, until = cache.read(entry), entry.etag, entry.until
+            rich.print(INFO3 + f"No change to {url} at cache {key}")
+        elif not _is_error(status, text, empty_is_error=empty_is_error):
+            rich.print(INFO3 + f"Change detected at {url} at cache {key} with etag {etag}")
+    else:
+        status, text, etag = await _get_url_async(client, url, config, limits, empty_is_error=empty_is_error)
+
+    if _is_error(status, text, empty_is_error=empty_is_error):
+        return _keep_cached(url, key, config, entry, status)
+    _write_cache(url, key, config, text, etag, until)
     return text
 
 
-def get_json(url: str, key: str, config: Config) -> dict:
-    text = get_url(url, key, config, empty_is_error=True)
+async def _prefetch(requests: list[tuple[Request, Future[str]]], config: Config):
+    client = rnet.Client(redirect=Policy.limited(10), emulation=Emulation.Chrome145)
+    limits = _Limits(config)
+
+    async def fetch(request: Request, future: Future[str]):
+        try:
+            future.set_result(await _get_cached_url_async(client, request, config, limits))
+        except Exception as e:  # noqa: BLE001
+            rich.print(ERROR + f"Could not download {request.url} ahead of time, will try again later: {e}")
+            future.set_exception(e)
+
+    await asyncio.gather(*(fetch(request, future) for request, future in requests))
+    # failed rnet requests leave reference cycles behind, which crash the interpreter if they are only collected
+    # after the event loop is closed
+    gc.collect()
+
+
+def prefetch(requests: Iterable[Request], config: Config):
+    """Downloads all ``requests`` concurrently on one event loop, so that later calls to :py:func:`get_url` (and
+    functions using it) with the same cache keys return immediately.
+
+    At most ``config.max_connections`` requests are in flight at once, and at most ``config.max_connections_per_host``
+    to the same host. Requests for a key that is already downloaded, or being downloaded by another call, are not sent
+    again. Failed requests are retried by :py:func:`get_url` when their key is next needed.
+    """
+    own: dict[str, tuple[Request, Future[str]]] = {}
+    others: list[Future[str]] = []
+    with PREFETCHED_LOCK:
+        for request in requests:
+            if request.key in own:
+                continue
+            if (future := PREFETCHED.get(request.key)) is not None:
+                others.append(future)
+                continue
+            future = Future()
+            PREFETCHED[request.key] = future
+            own[request.key] = (request, future)
+
+    if len(own) != 0:
+        with progress_bar(INFO2, f"Downloading {len(own)} file(s)"):
+            asyncio.run(_prefetch(list(own.values()), config))
+    for future in others:
+        future.exception()
+
+
+def _cached_revision(cache: Cache, entry: CacheEntry) -> int | None:
     try:
-        return msgspec.json.decode(text)
-    except msgspec.DecodeError as e:
-        rich.print(ERROR + f"Received invalid JSON from {url}:\n{e}\n{text}")
-        with COOLDOWN_LOCK:
-            COOLDOWN[urlparse(url).netloc] = time.time() + DEFAULT_COOLDOWN
-        rich.print(ERROR + f"Will try {url} again in 15s")
-        return get_json(url, key, config)
+        return msgspec.json.decode(cache.read(entry))["parse"]["revid"]
+    except (msgspec.DecodeError, KeyError, TypeError):
+        return None
 
 
-def get_csv(url: str, key: str, config: Config, **pd_kwargs) -> pd.DataFrame:
-    get_url(url, key, config)
-    return pd.read_csv(config.cache_dir / key, **pd_kwargs)
+def revalidate_wiki_pages(config: Config) -> int:
+    """Checks expired cached wiki pages against their latest revision IDs, asking the wiki API about 50 pages at a time.
+    Pages that have not been edited since they were cached are kept for another ``config.cache_duration`` seconds,
+    so that only pages that actually changed are downloaded again
 
+    :return: Number of cached pages kept
+    """
+    cache = Cache.of(config.cache_dir)
+    expired: defaultdict[str, list[CacheEntry]] = defaultdict(list)
+    for entry in cache.expired():
+        if not entry.url.startswith(WIKI_API + "?"):
+            continue
+        query = parse_qs(urlparse(entry.url).query)
+        if query.get("action") == ["parse"] and "page" in query:
+            expired[query["page"][0]].append(entry)
 
-def get_wiki_text(page: str, config: Config, old_id: int | None = None) -> str:
+    kept = 0
+    until = time.time() + config.cache_duration
+    for titles in batched(expired, 50, strict=False):
+        quoted = quote("|".join(titles))
+        url = f"{WIKI_API}?action=query&prop=revisions&rvprop=ids&formatversion=2&format=json&titles={quoted}"
+        status, text, _ = _get_url(url, config, empty_is_error=True)
+        if status >= 400:
+            continue
+        try:
+            result = msgspec.json.decode(text)["query"]
+        except (msgspec.DecodeError, KeyError) as e:
+            rich.print(ERROR + f"Received invalid revisions from {url}:\n{e}\n{text}")
+            continue
+
+        original_titles = {n["to"]: n["from"] for n in result.get("normalized", [])}
+        for page in result.get("pages", []):
+            if len(page.get("revisions", [])) == 0:
+                continue
+            revision = page["revisions"][0]["revid"]
+            for entry in expired.get(original_titles.get(page["title"], page["title"]), []):
+                if _cached_revision(cache, entry) == revision:
+                    cache.extend(entry.key, until)
+                    kept += 1
+
+    rich.print(RESULT + f"{kept} of {sum(len(a) for a in expired.values())} expired wiki page(s) unchanged")
+    return kept
+
+
+def wiki_text_request(page: str, old_id: int | None = None) -> Request:
     key = "wiki-text/" + (page.replace("/", "") if old_id is None else str(old_id))
     if old_id is None:
-        url = f"https://wiki.minecartrapidtransit.net/api.php?action=parse&prop=wikitext&formatversion=2&format=json&page={page}"
+        url = f"{WIKI_API}?action=parse&prop=wikitext%7Crevid&formatversion=2&format=json&page={page}"
+    else:
+        url = f"{WIKI_API}?action=parse&prop=wikitext&formatversion=2&format=json&oldid={old_id}"
+    return Request(url, key)
+
+
+def wiki_html_request(page: str, old_id: int | None = None) -> Request:
+    key = "wiki-html/" + (page.replace("/", "") if old_id is None else str(old_id))
+    if old_id is None:
+        url = f"{WIKI_API}?action=parse&formatversion=2&format=json&page={page}"
     else:
-        url = f"https://wiki.minecartrapidtransit.net/api.php?action=parse&prop=wikitext&formatversion=2&format=json&oldid={old_id}"
-    response = get_url(url, key, config)
+        url = f"{WIKI_API}?action=parse&formatversion=2&format=json&oldid={old_id}"
+    return Request(url, key)
+
+
+def get_json(url: str, key: str, config: Config) -> dict:
+    """Gets the JSON at ``url`` like :py:func:`get_url`. Failed requests are already retried by :py:func:`get_url`,
+    so this only asks again if the response is not valid JSON"""
+    netloc = urlparse(url).netloc
+    attempt = 0
+    while True:
+        attempt += 1
+        text = get_url(url, key, config, empty_is_error=True)
+        try:
+            return msgspec.json.decode(text)
+        except msgspec.DecodeError as e:
+            rich.print(ERROR + f"Received invalid JSON from {url}:\n{e}\n{text}")
+            _discard_prefetched(key)
+            Cache.of(config.cache_dir).remove(key)
+            if not _should_retry(url, netloc, attempt, config):
+                raise ValueError(text) from e
+
+
+def get_csv(url: str, key: str, config: Config, **pd_kwargs) -> pd.DataFrame:
+    import pandas as pd  # noqa: PLC0415
+
+    return pd.read_csv(io.StringIO(get_url(url, key, config)), **pd_kwargs)
+
+
+def get_csv_rows(url: str, key: str, config: Config, *, skip: int = 0) -> Iterator[list[str]]:
+    """Reads a CSV file row by row without going through pandas. Every row is a list of its cells, with empty cells
+    as ``""``. Blank lines are left out.
+
+    :param skip: Number of rows to leave out at the start
+    """
+    reader = csv.reader(io.StringIO(get_url(url, key, config)))
+    return islice((row for row in reader if len(row) != 0), skip, None)
+
+
+def get_csv_structs[T](url: str, key: str, config: Config, ty: type[T], *, header: int = 0) -> Iterator[T]:
+    """Reads a CSV file row by row into ``ty``, usually a :py:class:`msgspec.Struct` whose fields are named after
+    the columns. Empty cells are left out so that their fields take their defaults,
+    and cells are converted to the types of their fields where possible.
+
+    :param header: Index of the row with the column names, after which the rows of data start
+    """
+    rows = get_csv_rows(url, key, config, skip=header)
+    columns = next(rows, [])
+    for row in rows:
+        yield msgspec.convert(
+            {column: cell for column, cell in zip(columns, row, strict=False) if column != "" and cell != ""},
+            ty,
+            strict=False,
+        )
+
+
+def _extractor_name(name: str, extract: Callable) -> str:
+    code = getattr(extract, "__func__", extract).__code__
+    return f"{name} {hashlib.sha256(marshal.dumps(code)).hexdigest()}"
+
+
+def get_derived[T](url: str, key: str, config: Config, ty: type[T], extract: Callable[[str], T], *, name: str) -> T:
+    """Gets the body at ``url`` like :py:func:`get_url`, and returns ``extract(body)``.
+    The result is cached against the hash of the body, so ``extract`` is only run again once the body changes
+    (or ``extract`` itself is edited). This lets sources skip parsing pages that have not changed since the last run.
+
+    Only the code of ``extract`` itself is hashed, so editing a function that it calls does not invalidate the cache.
+    Include a version in ``name`` for such functions and bump it whenever they change what they return.
+
+    :param ty: Type of what ``extract`` returns, which must be encodable with msgspec
+    :param name: Identifies ``extract``, including anything it depends on other than its own code,
+        such as the regex it uses
+    """
+    return _get_derived(url, key, config, ty, extract, _extractor_name(name, extract))
+
+
+def _get_derived[T](url: str, key: str, config: Config, ty: type[T], extract: Callable[[str], T], name: str) -> T:
+    text = get_url(url, key, config)
+    cache = Cache.of(config.cache_dir)
+    hash_ = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    if (data := cache.derived(hash_, name)) is not None:
+        try:
+            return msgspec.msgpack.decode(data, type=ty)
+        except msgspec.DecodeError as e:
+            rich.print(ERROR + f"Could not read {name} of {key} from cache, extracting again: {e}")
+    result = extract(text)
+    cache.put_derived(hash_, name, msgspec.msgpack.encode(result))
+    return result
+
+
+def _wiki_text(response: str) -> str:
     try:
         return msgspec.json.decode(response)["parse"]["wikitext"]
     except Exception as e:
         raise ValueError(response) from e
 
 
-def get_wiki_html(page: str, config: Config, old_id: int | None = None) -> BeautifulSoup:
-    key = "wiki-html/" + (page.replace("/", "") if old_id is None else str(old_id))
-    if old_id is None:
-        url = f"https://wiki.minecartrapidtransit.net/api.php?action=parse&formatversion=2&format=json&page={page}"
-    else:
-        url = f"https://wiki.minecartrapidtransit.net/api.php?action=parse&formatversion=2&format=json&oldid={old_id}"
-    response = get_url(url, key, config)
+def _wiki_html(response: str, config: Config) -> BeautifulSoup:
+    from bs4 import BeautifulSoup  # noqa: PLC0415
+
     try:
-        return BeautifulSoup(msgspec.json.decode(response)["parse"]["text"], features="html.parser")
+        return BeautifulSoup(msgspec.json.decode(response)["parse"]["text"], features=config.html_parser)
     except Exception as e:
         raise ValueError(response) from e
 
 
+def get_wiki_text(page: str, config: Config, old_id: int | None = None) -> str:
+    url, key, _ = wiki_text_request(page, old_id)
+    return _wiki_text(get_url(url, key, config))
+
+
+def get_wiki_text_derived[T](page: str, config: Config, ty: type[T], extract: Callable[[str], T], *, name: str) -> T:
+    """:py:func:`get_derived` on the wikitext of ``page``"""
+    url, key, _ = wiki_text_request(page)
+    name = _extractor_name(name, extract)
+    return _get_derived(url, key, config, ty, lambda response: extract(_wiki_text(response)), name)
+
+
+def get_wiki_texts(pages: Iterable[str], config: Config) -> dict[str, str]:
+    """Gets the wikitext of many pages at once, asking the wiki API for up to 50 pages per request instead of one.
+    The pages are cached as if downloaded with :py:func:`get_wiki_text`, so later calls to it for them return immediately.
+
+    :return: Wikitext of every page that was found, by the page names given
+    """
+    cache = Cache.of(config.cache_dir)
+    texts: dict[str, str] = {}
+    to_download: list[str] = []
+    for page in dict.fromkeys(pages):
+        _, key, _ = wiki_text_request(page)
+        if (text := _prefetched(key)) is None:
+            entry = cache.entry(key)
+            if entry is None or entry.until is None or entry.until <= time.time():
+                to_download.append(page)
+                continue
+            text = cache.read(entry)
+        try:
+            texts[page] = msgspec.json.decode(text)["parse"]["wikitext"]
+        except (msgspec.DecodeError, KeyError, TypeError):
+            to_download.append(page)
+
+    for titles in batched(to_download, 50, strict=False):
+        url = (
+            f"{WIKI_API}?action=query&prop=revisions&rvprop=ids%7Ccontent&rvslots=main&formatversion=2&format=json"
+            "&titles=" + quote("|".join(titles))
+        )
+        status, text, _ = _get_url(url, config, empty_is_error=True)
+        if status >= 400:
+            continue
+        try:
+            result = msgspec.json.decode(text)["query"]
+        except (msgspec.DecodeError, KeyError) as e:
+            rich.print(ERROR + f"Received invalid pages from {url}:\n{e}\n{text}")
+            continue
+
+        original_titles = {n["to"]: n["from"] for n in result.get("normalized", [])}
+        for page in result.get("pages", []):
+            if len(page.get("revisions", [])) == 0:
+                continue
+            revision = page["revisions"][0]
+            wikitext = revision["slots"]["main"]["content"]
+            name = original_titles.get(page["title"], page["title"])
+            page_url, key, _ = wiki_text_request(name)
+            body = {"title": page["title"], "pageid": page["pageid"], "revid": revision["revid"], "wikitext": wikitext}
+            _write_cache(page_url, key, config, msgspec.json.encode({"parse": body}).decode(), None, None)
+            texts[name] = wikitext
+
+    if len(missing := [page for page in to_download if page not in texts]) != 0:
+        rich.print(ERROR + f"Could not get wikitext of {', '.join(missing)} in bulk")
+    return texts
+
+
+def get_wiki_html(page: str, config: Config, old_id: int | None = None) -> BeautifulSoup:
+    url, key, _ = wiki_html_request(page, old_id)
+    return _wiki_html(get_url(url, key, config), config)
+
+
+def get_wiki_html_derived[T](
+    page: str, config: Config, ty: type[T], extract: Callable[[BeautifulSoup], T], *, name: str
+) -> T:
+    """:py:func:`get_derived` on the parsed HTML of ``page``, so that unchanged pages are not parsed at all"""
+    url, key, _ = wiki_html_request(page)
+    name = f"{_extractor_name(name, extract)} {config.html_parser}"
+    return _get_derived(url, key, config, ty, lambda response: extract(_wiki_html(response, config)), name)
+
+
+def table_cells(rows: Iterable[bs4.Tag]) -> Iterator[list[bs4.Tag]]:
+    """The cells (``td``) of each of ``rows``, searching every row for them only once"""
+    for tr in rows:
+        yield tr("td")
+
+
 def get_wiki_link(page: str) -> str:
     return f"https://wiki.minecartrapidtransit.net/index.php/{page}"
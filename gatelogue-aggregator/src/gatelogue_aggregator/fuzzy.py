@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import difflib
+import re
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def trigrams(name: str) -> set[str]:
+    """Trigrams of ``name`` after case-folding, dropping punctuation and collapsing whitespace"""
+    name = " " + " ".join(re.sub(r"[^\w\s]", " ", name.casefold()).split()) + " "
+    return {name[i : i + 3] for i in range(len(name) - 2)}
+
+
+def _ratio(matches: int, length: int) -> float:
+    return 2.0 * matches / length if length else 1.0
+
+
+class FuzzyIndex[T]:
+    """Index of names to values for finding the name most similar to another.
+
+    :py:meth:`best` returns the same name as ``difflib.get_close_matches(query, names, 1, 0.0)``.
+    Names sharing the most trigrams with the query are scored first, so that most other names can then be ruled out
+    by an upper bound of their similarity without scoring them with :py:class:`difflib.SequenceMatcher`"""
+
+    SEEDS = 8
+    """How many names sharing the most trigrams with the query are scored before the rest are pruned"""
+
+    def __init__(self, items: Iterable[tuple[str, T]]):
+        self.values: dict[str, T] = dict(items)
+        self.names = list(self.values)
+        self.counts = [Counter(name) for name in self.names]
+        self.postings: dict[str, list[int]] = defaultdict(list)
+        for j, name in enumerate(self.names):
+            for trigram in trigrams(name):
+                self.postings[trigram].append(j)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def best(self, query: str) -> tuple[str, T] | None:
+        """The name most similar to ``query`` and its value, or ``None`` if the index is empty"""
+        if len(self.names) == 0:
+            return None
+
+        shared: Counter[int] = Counter()
+        for trigram in trigrams(query):
+            shared.update(self.postings.get(trigram, ()))
+        seeds = [j for j, _ in shared.most_common(self.SEEDS)] or [0]
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(query)
+        query_counts = Counter(query)
+        best = (-1.0, "")
+
+        def consider(name: str):
+            nonlocal best
+            matcher.set_seq1(name)
+            best = max(best, (matcher.ratio(), name))
+
+        for j in seeds:
+            consider(self.names[j])
+        for j, (name, counts) in enumerate(zip(self.names, self.counts, strict=True)):
+            if j in seeds:
+                continue
+            length = len(name) + len(query)
+            # upper bounds of the score, as in SequenceMatcher.real_quick_ratio and SequenceMatcher.quick_ratio
+            if (bound := _ratio(min(len(name), len(query)), length)) < best[0]:
+                continue
+            if (bound := _ratio(sum((counts & query_counts).values()), length)) < best[0]:
+                continue
+            if (bound, name) <= best:
+                continue
+            consider(name)
+
+        _, name = best
+        return name, self.values[name]
@@ -1,24 +1,85 @@
 from __future__ import annotations
 
-import difflib
+import contextlib
 import re
+from collections import defaultdict
 from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal, cast
+from typing import TYPE_CHECKING, Literal
 
 import gatelogue_types as gt
 import msgspec
 import rich
 
-from gatelogue_aggregator.logging import ERROR, INFO1, INFO2, RESULT, report, track
+from gatelogue_aggregator.connectivity import DisjointSet, located_node_edges
+from gatelogue_aggregator.downloader import get_wiki_texts, prefetch, revalidate_wiki_pages
+from gatelogue_aggregator.fuzzy import FuzzyIndex
+from gatelogue_aggregator.logging import ERROR, INFO1, INFO2, RESULT, progress_bar, report, timed, track
 from gatelogue_aggregator.sources.dynmap_markers import DynmapMarkers
 from gatelogue_aggregator.sources.warp_api import WarpAPI
+from gatelogue_aggregator.spatial import NearestNeighbours, SpatialGrid, located_points, location_sources
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Container, Iterable
+    import sqlite3
+    from collections.abc import Callable, Iterable
 
     from gatelogue_aggregator.config import Config
     from gatelogue_aggregator.source import Source
+    from gatelogue_aggregator.spatial import LocatedPoint
+
+
+MERGE_ORDER: tuple[type[gt.Node], ...] = (
+    gt.AirAirline,
+    gt.AirAirport,
+    gt.AirGate,
+    gt.AirFlight,
+    gt.BusCompany,
+    gt.BusLine,
+    gt.BusStop,
+    gt.BusBerth,
+    gt.BusConnection,
+    gt.SeaCompany,
+    gt.SeaLine,
+    gt.SeaStop,
+    gt.SeaDock,
+    gt.SeaConnection,
+    gt.RailCompany,
+    gt.RailLine,
+    gt.RailStation,
+    gt.RailPlatform,
+    gt.RailConnection,
+    gt.Town,
+    gt.SpawnWarp,
+)
+"""Node types in the order their equivalent nodes are merged, such that nodes are merged after the nodes they refer to"""
+
+
+class StopLookup:
+    """IDs of the companies of one mode by name, and of their stops by name and by code,
+    loaded in two queries so that many stops can be looked up without a query each"""
+
+    def __init__(self, conn: sqlite3.Connection, company_type: type[gt.Node], stop_type: type[gt.Node]):
+        # table names come from the node types given, never from data, so formatting them into queries is safe
+        self.companies: dict[str, int] = {}
+        for i, name in conn.execute(f"SELECT i, name FROM {company_type.__name__} ORDER BY i"):  # noqa: S608
+            self.companies.setdefault(name, i)
+
+        stop = stop_type.__name__
+        self.stops_by_name: dict[tuple[int, str], int] = {}
+        self.stops_by_code: dict[tuple[int, str], int] = {}
+        for i, company, name, code in conn.execute(
+            f"SELECT {stop}.i, company, name, code FROM {stop} "  # noqa: S608
+            f"LEFT JOIN {stop}Codes ON {stop}.i = {stop}Codes.i ORDER BY {stop}.i"
+        ):
+            self.stops_by_name.setdefault((company, name), i)
+            if code is not None:
+                self.stops_by_code.setdefault((company, code), i)
+
+    def stop(self, company: int, name: str, code: str | None = None) -> int | None:
+        """The stop of ``company`` with ``code`` if given, otherwise with ``name``"""
+        if code is None:
+            return self.stops_by_name.get((company, name))
+        return self.stops_by_code.get((company, code))
 
 
 class GatelogueData:
@@ -28,28 +89,50 @@ class GatelogueData:
 
         prev_length: int | None = None
         for pass_ in range(1, 10):
-            self._merge_airports_with_unknown_code(pass_)
-            self._merge_equivalent_nodes(pass_)
-            self._merge_gates_without_code()
+            with timed(INFO1, f"Merge pass {pass_}"), self._batch(self.gd):
+                self._merge_airports_with_unknown_code(pass_)
+                self._merge_equivalent_nodes(pass_)
+                self._merge_gates_without_code()
 
             if len(self.gd) == prev_length:
                 break
             prev_length = len(self.gd)
-
-        self._dedup_airport_names()
-        self._update_gate_mode()
-        self._delete_empty_gates()
-        self._proximity()
-        self._shared_facility()
+        rich.print(RESULT + f"Merging settled after {pass_} pass(es)")
+
+        with timed(INFO1, "Post-processing"), self._batch(self.gd):
+            self._dedup_airport_names()
+            self._update_gate_mode()
+            self._delete_empty_gates()
+            self._proximity()
+            self._shared_facility()
         self.gd.conn.execute("VACUUM")
 
+    def _batch(self, gd: gt.GD) -> contextlib.AbstractContextManager:
+        return gd.batch() if self.config.batch else contextlib.nullcontext()
+
     def _build_sources(self, sources: Iterable[type[Source]], database=":memory:"):
         for i, source in enumerate(sources):
             source.priority = i
         self.gd = gt.GD.create([a.__name__ for a in sources], database)
+        if self.config.batch:
+            self.gd.tune_for_writes()
 
         self._prepare_aircraft()
 
+        with timed(INFO1, "Revalidating cached wiki pages"):
+            revalidate_wiki_pages(self.config)
+
+        with timed(INFO1, "Downloading ahead of time"):
+            get_wiki_texts((page for source in sources for page in source.wiki_pages()), self.config)
+            prefetch(
+                [*WarpAPI.requests(), *DynmapMarkers.requests(), *(r for source in sources for r in source.requests())],
+                self.config,
+            )
+
+        if self.config.staging:
+            self._build_sources_staged(sources)
+            return
+
         with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
             warp_api_thread: Future = executor.submit(WarpAPI.prepare, self.config)
             dynmap_markers_thread: Future = executor.submit(DynmapMarkers.prepare, self.config)
@@ -59,8 +142,39 @@ class GatelogueData:
 
         for source in track(source_instances, INFO1, description="Building sources"):
             rich.print(INFO1 + f"Building for {source.name}")
-            source.build(self.config)
-            source.report()
+            with timed(INFO2, f"Building for {source.name}"), self._batch(self.gd):
+                source.build(self.config)
+                source.report()
+
+    def _build_sources_staged(self, sources: Iterable[type[Source]]):
+        template = self.gd.conn.serialize()
+        stagings = [(source, gt.GD.from_bytes(template)) for source in sources]
+
+        def build(source: Source, staging: gt.GD):
+            rich.print(INFO1 + f"Building for {source.name}")
+            with timed(INFO2, f"Building for {source.name}"), self._batch(staging):
+                source.build(self.config)
+                source.report()
+
+        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
+            warp_api_thread: Future = executor.submit(WarpAPI.prepare, self.config)
+            dynmap_markers_thread: Future = executor.submit(DynmapMarkers.prepare, self.config)
+            source_instances: list[Source] = list(executor.map(lambda s: s[0](self.config, s[1].conn), stagings))
+            warp_api_thread.result()
+            dynmap_markers_thread.result()
+
+            for _ in track(
+                executor.map(build, source_instances, (staging for _, staging in stagings)),
+                INFO1,
+                description="Building sources",
+                total=len(source_instances),
+            ):
+                pass
+
+        with timed(INFO1, "Importing sources"):
+            for _, staging in track(stagings, INFO1, description="Importing sources"):
+                self.gd.extend(staging)
+                staging.conn.close()
 
     def _prepare_aircraft(self):
         class Yaml(msgspec.Struct):
@@ -74,33 +188,32 @@ class GatelogueData:
         with (Path(__file__).parent / "sources" / "air" / "aircraft.yaml").open() as f:
             file = msgspec.yaml.decode(f.read(), type=list[Yaml])
 
-        for aircraft in file:
-            gt.Aircraft.create(
-                self.gd.conn,
-                name=aircraft.name,
-                manufacturer=aircraft.manu,
-                width=aircraft.w,
-                height=aircraft.h,
-                length=aircraft.l,
-                mode=aircraft.mode,
-            )
+        with self._batch(self.gd):
+            for aircraft in file:
+                gt.Aircraft.create(
+                    self.gd.conn,
+                    name=aircraft.name,
+                    manufacturer=aircraft.manu,
+                    width=aircraft.w,
+                    height=aircraft.h,
+                    length=aircraft.l,
+                    mode=aircraft.mode,
+                )
 
     def _merge_equivalent_nodes(self, pass_: int):
-        merged: set[int] = set()
-        for n in track(
-            self.gd.nodes(), INFO2, description=f"Merging equivalent nodes (pass {pass_})", total=len(self.gd)
-        ):
-            if n.i in merged:
-                continue
-            for equiv in n.equivalent_nodes():
-                if n.i == equiv.i:
-                    continue
-                merged.add(equiv.i)
-                if (also_merged := n.merge(equiv, warn_fn=lambda msg: rich.print(ERROR + msg))) is not None:
-                    merged |= also_merged
+        merges = 0
+        for ty in track(MERGE_ORDER, INFO2, description=f"Merging equivalent nodes (pass {pass_})"):
+            pairs = [
+                (keep_i, other_i)
+                for keep_i, *other_is in ty.equivalent_node_groups(self.gd.conn)
+                for other_i in other_is
+            ]
+            ty.merge_many(self.gd.conn, pairs, warn_fn=lambda msg: rich.print(ERROR + msg))
+            merges += len(pairs)
+        rich.print(RESULT + f"Merged {merges} equivalent nodes in pass {pass_}")
 
     def _merge_airports_with_unknown_code(self, pass_: int):
-        name2i = dict(
+        name_index: FuzzyIndex[int] = FuzzyIndex(
             self.gd.conn.execute(
                 "SELECT name, AirAirport.i FROM AirAirport "
                 "INNER JOIN AirAirportNames on AirAirport.i = AirAirportNames.i "
@@ -116,14 +229,11 @@ class GatelogueData:
             INFO2,
             description=f"Merging airports (pass {pass_})",
         ):
-            best_name = next(
-                iter(difflib.get_close_matches(next(iter(n.names)), name2i.keys(), 1, 0.0)),
-                None,
-            )
-            if best_name is None:
+            best = name_index.best(next(iter(n.names)))
+            if best is None:
                 rich.print(ERROR + f"AirAirport of name(s) {n.names} cannot find code")
                 continue
-            equiv = gt.AirAirport(self.gd.conn, name2i[best_name])
+            equiv = gt.AirAirport(self.gd.conn, best[1])
             rich.print(
                 RESULT + f"AirAirport of name(s) {n.names} found code `{equiv.code}` with similar name(s) {equiv.names}"
             )
@@ -131,169 +241,133 @@ class GatelogueData:
             equiv.merge(n, warn_fn=lambda msg: rich.print(ERROR + msg))
 
     def _dedup_airport_names(self):
-        for n in track(self.gd.nodes(gt.AirAirport), INFO2, description="Deduplicating AirAirport `name` field"):
-            names: set[str] = n.names
-            ok_names = set()
-            for name in sorted(names, key=len, reverse=True):
-                if any(
-                    (
-                        name in existing
-                        or sorted(re.sub(r"[^\w\s]", "", name).split())
-                        == sorted(re.sub(r"[^\w\s]", "", existing).split())
-                    )
-                    for existing in ok_names
-                ):
-                    cur = self.gd.conn.cursor()
-                    cur.execute(
-                        "DELETE FROM AirAirportNamesSource WHERE i = :i AND name = :name", dict(i=n.i, name=name)
-                    )
-                    cur.execute("DELETE FROM AirAirportNames WHERE i = :i AND name = :name", dict(i=n.i, name=name))
+        airport_names: dict[int, list[str]] = defaultdict(list)
+        for i, name in self.gd.conn.execute("SELECT i, name FROM AirAirportNames"):
+            airport_names[i].append(name)
+
+        duplicates: list[tuple[int, str]] = []
+        for i, names in track(airport_names.items(), INFO2, description="Deduplicating AirAirport `name` field"):
+            ok_names: list[str] = []
+            ok_signatures: set[tuple[str, ...]] = set()
+            for name in sorted(names, key=lambda name: (-len(name), name)):
+                signature = tuple(sorted(re.sub(r"[^\w\s]", "", name).split()))
+                if signature in ok_signatures or any(name in existing for existing in ok_names):
+                    duplicates.append((i, name))
                 else:
-                    ok_names.add(name)
+                    ok_names.append(name)
+                    ok_signatures.add(signature)
+
+        cur = self.gd.conn.cursor()
+        cur.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS DuplicateName "
+            "(i INTEGER NOT NULL, name TEXT NOT NULL, PRIMARY KEY (i, name))"
+        )
+        cur.execute("DELETE FROM DuplicateName")
+        cur.executemany("INSERT INTO DuplicateName (i, name) VALUES (?, ?)", duplicates)
+        cur.execute("DELETE FROM AirAirportNamesSource WHERE (i, name) IN (SELECT i, name FROM DuplicateName)")
+        cur.execute("DELETE FROM AirAirportNames WHERE (i, name) IN (SELECT i, name FROM DuplicateName)")
 
     def _merge_gates_without_code(self):
-        for airport in track(self.gd.nodes(gt.AirAirport), INFO2, description="Merging AirGates without code"):
-            airline2gate = {
-                airline: gt.AirGate(self.gd.conn, gate)
-                for airline, gate in self.gd.conn.execute(
-                    "SELECT airline, max(i) FROM AirGate "
-                    "WHERE airport = :i AND code IS NOT NULL GROUP BY airline HAVING count(i) = 1",
-                    dict(i=airport.i),
-                ).fetchall()
-            }
-            for n in (
-                gt.AirGate(self.gd.conn, i)
-                for (i,) in self.gd.conn.execute(
-                    "SELECT i FROM AirGate WHERE airport = :i AND code IS NULL", dict(i=airport.i)
-                ).fetchall()
-            ):
-                if (airline := n.airline) is not None and airline.i in airline2gate:
-                    airline2gate[airline.i].merge(n, warn_fn=lambda msg: rich.print(ERROR + msg))
+        with timed(INFO2, "Merging AirGates without code"):
+            pairs = self.gd.conn.execute(
+                "SELECT keep.i, AirGate.i FROM AirGate INNER JOIN ("
+                "SELECT airport, airline, max(i) AS i FROM AirGate "
+                "WHERE code IS NOT NULL AND airline IS NOT NULL GROUP BY airport, airline HAVING count(i) = 1"
+                ") AS keep ON AirGate.airport = keep.airport AND AirGate.airline = keep.airline "
+                "WHERE AirGate.code IS NULL ORDER BY AirGate.airport, AirGate.i"
+            ).fetchall()
+            gt.AirGate.merge_many(self.gd.conn, pairs, warn_fn=lambda msg: rich.print(ERROR + msg))
 
     def _update_gate_mode(self):
-        for n in track(self.gd.nodes(gt.AirAirport), INFO2, description="Updating AirGate `mode` field"):
-            if (modes := n.modes) is None or len(modes) != 1:
-                continue
-            sources = lambda: {  # noqa: E731
-                s
-                for (s,) in self.gd.conn.execute(
-                    "SELECT DISTINCT source FROM AirAirportModesSource WHERE i = :i",
-                    dict(i=n.i),  # noqa: B023
-                ).fetchall()
-            }
-            for gate in n.gates:
-                gate.mode = sources(), next(iter(modes))
+        with timed(INFO2, "Updating AirGate `mode` field"):
+            cur = self.gd.conn.cursor()
+            cur.execute("CREATE TEMP TABLE IF NOT EXISTS GateMode (i INTEGER PRIMARY KEY, mode TEXT NOT NULL)")
+            cur.execute("DELETE FROM GateMode")
+            cur.execute(
+                "INSERT INTO GateMode (i, mode) "
+                "SELECT AirGate.i, AirAirportModes.mode FROM AirGate "
+                "INNER JOIN AirAirportModes ON AirGate.airport = AirAirportModes.i "
+                "WHERE AirGate.airport IN (SELECT i FROM AirAirportModes GROUP BY i HAVING count(mode) = 1)"
+            )
+            cur.execute(
+                "UPDATE AirGateSource SET mode = false WHERE i IN ("
+                "SELECT GateMode.i FROM GateMode INNER JOIN AirGate ON GateMode.i = AirGate.i "
+                "WHERE AirGate.mode IS NOT GateMode.mode)"
+            )
+            cur.execute("UPDATE AirGate SET mode = GateMode.mode FROM GateMode WHERE AirGate.i = GateMode.i")
+            cur.execute(
+                "INSERT INTO AirGateSource (i, source, mode) "
+                "SELECT DISTINCT GateMode.i, AirAirportModesSource.source, true FROM GateMode "
+                "INNER JOIN AirGate ON GateMode.i = AirGate.i "
+                "INNER JOIN AirAirportModesSource ON AirGate.airport = AirAirportModesSource.i "
+                "WHERE true ON CONFLICT (i, source) DO UPDATE SET mode = true"
+            )
 
     def _delete_empty_gates(self):
-        empty_gates = (
-            gt.AirGate(self.gd.conn, a)
-            for (a,) in self.gd.conn.execute(
-                "SELECT AirGate.i FROM AirGate "
-                'LEFT JOIN AirFlight on AirGate.i = AirFlight."to" OR AirGate.i = AirFlight."from" '
-                "WHERE AirFlight.i IS NULL AND AirGate.code IS NULL"
-            )
-        )
-        for gate in track(empty_gates, INFO2, description="Removing empty gates"):
-            gate.delete()
-
-    def _isolated_nodes(self, nodes: set[int]) -> list[set[int]]:
-        components: list[set] = []
-        queue = set()
-        while len(nodes) != 0:
-            if len(queue) == 0:
-                components.append(set())
-                ni = next(iter(nodes))
-            else:
-                ni = next(iter(queue))
-                queue.remove(ni)
-            components[-1].add(ni)
-            nodes.remove(ni)
-
-            n = gt.LocatedNode.auto_type(self.gd.conn, ni)
-            queue |= set(n._nodes_in_proximity) & nodes
-            if isinstance(n, gt.AirAirport):
-                gates = list(n.gates)
-                queue |= {f.to.airport.i for g in gates for f in g.flights_from_here} & nodes
-                queue |= {f.from_.airport.i for g in gates for f in g.flights_to_here} & nodes
-            elif isinstance(n, (gt.BusStop, gt.SeaStop)):
-                queue |= {c.to.stop.i for c in n.connections_from_here} & nodes
-                queue |= {c.from_.stop.i for c in n.connections_to_here} & nodes
-            elif isinstance(n, gt.RailStation):
-                queue |= {c.to.station.i for c in n.connections_from_here} & nodes
-                queue |= {c.from_.station.i for c in n.connections_to_here} & nodes
-        if len(components) > 0:
-            components.remove(max(components, key=len))
-        return components
+        with timed(INFO2, "Removing empty gates"):
+            empty_gates = [
+                i
+                for (i,) in self.gd.conn.execute(
+                    "SELECT i FROM AirGate WHERE code IS NULL "
+                    'AND i NOT IN (SELECT "from" FROM AirFlight UNION SELECT "to" FROM AirFlight)'
+                )
+            ]
+            gt.AirGate.delete_many(self.gd.conn, empty_gates)
+        rich.print(RESULT + f"Removed {len(empty_gates)} empty gates")
 
     def _proximity(self):
-        nodes = {
-            gt.LocatedNode(self.gd.conn, i)
-            for (i,) in self.gd.conn.execute(
-                "SELECT i FROM NodeLocation WHERE world IS NOT NULL AND world != 'Space' AND x IS NOT NULL and y IS NOT NULL"
+        points = located_points(self.gd.conn)
+        sources = location_sources(self.gd.conn)
+
+        def insert_proximities(pairs: Iterable[tuple[int, int, float]]):
+            pairs = list(pairs)
+            cur = self.gd.conn.cursor()
+            cur.executemany(
+                "INSERT INTO Proximity (node1, node2, distance, explicit) VALUES (?, ?, ?, false) "
+                "ON CONFLICT DO NOTHING",
+                pairs,
             )
-        }
-        processed = []
-        for n in track(nodes, INFO2, description="Linking close nodes", nonlinear=True):
-            for existing in processed:
-                if existing.world != n.world:
-                    continue
-                x1, y1 = existing.coordinates
-                x2, y2 = cast("tuple[int, int]", n.coordinates)
-                dist_sq = (x1 - x2) ** 2 + (y1 - y2) ** 2
-                threshold = 500**2 if isinstance(existing, gt.AirAirport) or isinstance(n, gt.AirAirport) else 250**2
-                if dist_sq < threshold:
-                    srcs = {
-                        s
-                        for (s,) in self.gd.conn.execute(
-                            "SELECT DISTINCT source FROM NodeLocationSource "
-                            "WHERE (i = :i1 OR i = :i2) AND (world IS true OR coordinates IS TRUE)",
-                            dict(i1=n.i, i2=existing.i),
-                        )
-                    }
-                    gt.Proximity.create(self.gd.conn, srcs, node1=n, node2=existing, distance=dist_sq**0.5)
-            processed.append(n)
-
-        def dist_sq_fn(n_: gt.LocatedNode, this_: gt.LocatedNode, others: Container[int]):
-            if n_.world != this_.world or n_.i in others:
-                return float("inf")
-            nx, ny = cast("tuple[int, int]", n_.coordinates)
-            tx, ty = cast("tuple[int, int]", this_.coordinates)
-            return (nx - tx) ** 2 + (ny - ty) ** 2
+            cur.executemany(
+                "INSERT INTO ProximitySource (node1, node2, source) VALUES (?, ?, ?) ON CONFLICT DO NOTHING",
+                [(i1, i2, s) for i1, i2, _ in pairs for s in sources[i1] | sources[i2]],
+            )
+
+        def threshold(p1: LocatedPoint, p2: LocatedPoint) -> int:
+            return 500 if p1.type == "AirAirport" or p2.type == "AirAirport" else 250
+
+        with progress_bar(INFO2, "Linking close nodes"):
+            grid = SpatialGrid(points, cell_size=500)
+            insert_proximities((p1.i, p2.i, dist_sq**0.5) for p1, p2, dist_sq in grid.close_pairs(threshold))
+
+        index = NearestNeighbours(points)
+        i2point = {p.i: p for p in points}
+        in_proximity: set[tuple[int, int]] = set(self.gd.conn.execute("SELECT node1, node2 FROM Proximity"))
+        connectivity = DisjointSet(i2point)
+        connectivity.union_all(located_node_edges(self.gd.conn))
 
         prev_length: int | None = None
         for pass_ in range(1, 10):
-            isolated = self._isolated_nodes({n.i for n in nodes})
+            isolated = connectivity.isolated()
             if len(isolated) == 0:
                 break
 
+            new_pairs: list[tuple[int, int, float]] = []
             for component in track(
                 isolated,
                 INFO2,
                 description=f"Ensuring all located nodes are connected (pass {pass_})",
             ):
                 for this_i in component:
-                    this = gt.LocatedNode(self.gd.conn, this_i)
-                    nearest = min(nodes, key=lambda nr: dist_sq_fn(nr, this, component))
-                    if nearest.i in this._nodes_in_proximity:
+                    if (result := index.nearest(i2point[this_i], exclude=component)) is None:
                         continue
-                    distance = dist_sq_fn(nearest, this, component) ** 0.5
-                    if distance == float("inf"):
+                    nearest, dist_sq = result
+                    pair = (this_i, nearest.i) if this_i < nearest.i else (nearest.i, this_i)
+                    if pair in in_proximity:
                         continue
-                    srcs = {
-                        s
-                        for (s,) in self.gd.conn.execute(
-                            "SELECT DISTINCT source FROM NodeLocationSource "
-                            "WHERE (i = :i1 OR i = :i2) AND (world IS true OR coordinates IS TRUE)",
-                            dict(i1=this.i, i2=nearest.i),
-                        )
-                    }
-                    gt.Proximity.create(
-                        self.gd.conn,
-                        srcs,
-                        node1=this,
-                        node2=nearest,
-                        distance=distance,
-                    )
+                    in_proximity.add(pair)
+                    new_pairs.append((*pair, dist_sq**0.5))
+            insert_proximities(new_pairs)
+            connectivity.union_all((i1, i2) for i1, i2, _ in new_pairs)
 
             length = sum(len(a) for a in isolated)
             if length == prev_length:
@@ -311,112 +385,47 @@ class GatelogueData:
             m1: Literal["Bus", "Rail", "Sea"] = "Rail"
             m2: Literal["Bus", "Rail", "Sea"] = "Rail"
 
+        lookups = {
+            "Bus": StopLookup(self.gd.conn, gt.BusCompany, gt.BusStop),
+            "Rail": StopLookup(self.gd.conn, gt.RailCompany, gt.RailStation),
+            "Sea": StopLookup(self.gd.conn, gt.SeaCompany, gt.SeaStop),
+        }
         nonexistent_companies = set()
 
-        def get_company(mode: str, name: str) -> gt.BusCompany | gt.RailCompany | gt.SeaCompany | None:
+        def get_company(mode: str, name: str) -> int | None:
             if name in nonexistent_companies:
                 return None
-            company = None
-            match mode:
-                case "Bus":
-                    if (
-                        result := self.gd.conn.execute(
-                            "SELECT i FROM BusCompany WHERE name = :name", dict(name=name)
-                        ).fetchone()
-                    ) is not None:
-                        company = gt.BusCompany(self.gd.conn, result[0])
-                case "Rail":
-                    if (
-                        result := self.gd.conn.execute(
-                            "SELECT i FROM RailCompany WHERE name = :name", dict(name=name)
-                        ).fetchone()
-                    ) is not None:
-                        company = gt.RailCompany(self.gd.conn, result[0])
-                case "Sea":
-                    if (
-                        result := self.gd.conn.execute(
-                            "SELECT i FROM SeaCompany WHERE name = :name", dict(name=name)
-                        ).fetchone()
-                    ) is not None:
-                        company = gt.SeaCompany(self.gd.conn, result[0])
-                case _:
-                    raise ValueError(mode)
-            if company is None:
+            if (company := lookups[mode].companies.get(name)) is None:
                 rich.print(ERROR + f"Company {name} does not exist")
                 nonexistent_companies.add(name)
             return company
 
-        def get_stop(
-            mode: str, company: gt.BusCompany | gt.RailCompany | gt.SeaCompany, name: str, code: str | None = None
-        ) -> gt.BusStop | gt.RailStation | gt.SeaStop | None:
-            stop = None
-            match mode:
-                case "Bus":
-                    if code is None:
-                        result = self.gd.conn.execute(
-                            "SELECT i FROM BusStop WHERE name = :name AND company = :ci", dict(name=name, ci=company.i)
-                        ).fetchone()
-                    else:
-                        result = self.gd.conn.execute(
-                            "SELECT BusStop.i from BusStop "
-                            "LEFT JOIN BusStopCodes on BusStop.i = BusStopCodes.i "
-                            "WHERE code = :code AND company = :ci",
-                            dict(code=code, ci=company.i),
-                        ).fetchone()
-                    if result is not None:
-                        stop = gt.BusStop(self.gd.conn, result[0])
-                case "Rail":
-                    if code is None:
-                        result = self.gd.conn.execute(
-                            "SELECT i FROM RailStation WHERE name = :name AND company = :ci",
-                            dict(name=name, ci=company.i),
-                        ).fetchone()
-                    else:
-                        result = self.gd.conn.execute(
-                            "SELECT RailStation.i from RailStation "
-                            "LEFT JOIN RailStationCodes on RailStation.i = RailStationCodes.i "
-                            "WHERE code = :code AND company = :ci",
-                            dict(code=code, ci=company.i),
-                        ).fetchone()
-                    if result is not None:
-                        stop = gt.RailStation(self.gd.conn, result[0])
-                case "Sea":
-                    if code is None:
-                        result = self.gd.conn.execute(
-                            "SELECT i FROM SeaStop WHERE name = :name AND company = :ci", dict(name=name, ci=company.i)
-                        ).fetchone()
-                    else:
-                        result = self.gd.conn.execute(
-                            "SELECT SeaStop.i from SeaStop "
-                            "LEFT JOIN SeaStopCodes on SeaStop.i = SeaStopCodes.i "
-                            "WHERE code = :code AND company = :ci",
-                            dict(code=code, ci=company.i),
-                        ).fetchone()
-                    if result is not None:
-                        stop = gt.SeaStop(self.gd.conn, result[0])
-                case _:
-                    raise ValueError(mode)
-            if stop is None:
-                rich.print(ERROR + f"{company.name} {name} does not exist")
+        def get_stop(mode: str, company: int, company_name: str, name: str, code: str | None = None) -> int | None:
+            if (stop := lookups[mode].stop(company, name, code)) is None:
+                rich.print(ERROR + f"{company_name} {name} does not exist")
             return stop
 
         with (Path(__file__).parent / "sources" / "shared_facilities.yaml").open() as f:
             file = msgspec.yaml.decode(f.read(), type=list[Yaml])
 
+        pairs: list[tuple[gt.LocatedNode, gt.LocatedNode]] = []
         for entry in file:
             if (company1 := get_company(entry.m1, entry.c1)) is None:
                 continue
             if (company2 := get_company(entry.m2, entry.c2)) is None:
                 continue
-            if (stop1 := get_stop(entry.m1, company1, entry.s1, entry.code1)) is None:
+            if (stop1 := get_stop(entry.m1, company1, entry.c1, entry.s1, entry.code1)) is None:
                 continue
-            if (stop2 := get_stop(entry.m2, company2, entry.s2, entry.code2)) is None:
+            if (stop2 := get_stop(entry.m2, company2, entry.c2, entry.s2, entry.code2)) is None:
                 continue
+            pairs.append((gt.LocatedNode(self.gd.conn, stop1), gt.LocatedNode(self.gd.conn, stop2)))
 
-            gt.SharedFacility.create(self.gd.conn, node1=stop1, node2=stop2)
+        gt.SharedFacility.create_many(self.gd.conn, pairs)
 
     def report(self, out_fn: Callable[[str, str], object] | None = None):
         rich.print(INFO1 + "Below is a final report of all nodes collected")
+        self.gd.enable_row_cache()
         for node in self.gd.nodes():
             report(node, out_fn=out_fn)
+        self.gd.disable_row_cache()
         rich.print(INFO1 + "End of report")
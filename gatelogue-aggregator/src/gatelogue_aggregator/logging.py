@@ -1,16 +1,16 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import os
+import time
 from collections.abc import Callable, Container, Iterable, Sized
+from typing import TYPE_CHECKING
 
-import gatelogue_types as gt
 import rich
-import rich.progress
 
-PROGRESS: rich.progress.Progress = rich.progress.Progress()
-if not os.getenv("NO_PROGRESS_BAR"):
-    PROGRESS.start()
+if TYPE_CHECKING:
+    import gatelogue_types as gt
 
 INFO1 = "[yellow]"
 INFO2 = "[green]  "
@@ -19,6 +19,16 @@ RESULT = "[cyan]  "
 ERROR = "[bold red]!!! "
 
 
+@functools.cache
+def progress() -> rich.progress.Progress:
+    """The progress display shared by all progress bars, started the first time one is shown"""
+    import rich.progress  # noqa: PLC0415
+
+    p = rich.progress.Progress()
+    p.start()
+    return p
+
+
 def track[T](
     it: Iterable[T], level: str, *, description: str, nonlinear: bool = False, total: int | None = None
 ) -> Iterable[T]:
@@ -27,11 +37,11 @@ def track[T](
         yield from it
     else:
         total = total or (((len(it) ** 2) // 2 if nonlinear else len(it)) if isinstance(it, Sized) else None)
-        t = PROGRESS.add_task(level + description, total=total)
+        t = progress().add_task(level + description, total=total)
         for i, o in enumerate(it):
             yield o
-            PROGRESS.advance(t, i + 1 if nonlinear else 1)
-        PROGRESS.remove_task(t)
+            progress().advance(t, i + 1 if nonlinear else 1)
+        progress().remove_task(t)
 
     rich.print(level + description + " done")
 
@@ -42,18 +52,27 @@ def progress_bar(level: str, description: str):
         rich.print(level + description)
         yield
     else:
-        t = PROGRESS.add_task(level + description, total=None)
+        t = progress().add_task(level + description, total=None)
         yield t
-        PROGRESS.remove_task(t)
+        progress().remove_task(t)
     rich.print(level + description + " done")
 
 
+@contextlib.contextmanager
+def timed(level: str, description: str):
+    start = time.perf_counter()
+    yield
+    rich.print(level + description + f" took {time.perf_counter() - start:.2f}s")
+
+
 def report(
     node: gt.Node,
     prefix: str | None = None,
     ignore: Container[type[gt.Node]] | None = None,
     out_fn: Callable[[str, str], object] | None = None,
 ):
+    import gatelogue_types as gt  # noqa: PLC0415
+
     out_fn = out_fn or (lambda c, text: rich.print(c + text))
     ignore = ignore or ()
     if type(node) in ignore:
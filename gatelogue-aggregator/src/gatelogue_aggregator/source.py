@@ -11,8 +11,10 @@ from gatelogue_aggregator.sources.line_builder import BusLineBuilder, RailLineBu
 
 if TYPE_CHECKING:
     import sqlite3
+    from collections.abc import Iterable
 
     from gatelogue_aggregator.config import Config
+    from gatelogue_aggregator.downloader import Request
 
 
 class Source:
@@ -27,6 +29,16 @@ class Source:
 
         self.prepare(config)
 
+    @classmethod
+    def requests(cls) -> list[Request]:
+        """URLs that :py:meth:`prepare` downloads, so that they can be downloaded ahead of time along with those of other sources"""
+        return []
+
+    @classmethod
+    def wiki_pages(cls) -> list[str]:
+        """Wiki pages whose wikitext :py:meth:`prepare` gets, so that they can be downloaded in bulk along with those of other sources"""
+        return []
+
     def prepare(self, config: Config):
         pass
 
@@ -51,36 +63,56 @@ class Source:
 
 class AirSource(Source):
     def airline(self, **kwargs: Unpack[gt.AirAirline.CreateParams]) -> gt.AirAirline:
-        kwargs["name"] = kwargs["name"].strip()
-        kwargs["name"] = hardcode.AIRLINE_ALIASES.get(kwargs["name"], kwargs["name"])
-        return gt.AirAirline.create(self.conn, self.priority, **kwargs)
+        return self.airline_many([kwargs])[0]
+
+    def airline_many(self, rows: Iterable[gt.AirAirline.CreateParams]) -> list[gt.AirAirline]:
+        rows = [kwargs.copy() for kwargs in rows]
+        for kwargs in rows:
+            kwargs["name"] = kwargs["name"].strip()
+            kwargs["name"] = hardcode.AIRLINE_ALIASES.get(kwargs["name"], kwargs["name"])
+        return gt.AirAirline.create_many(self.conn, self.priority, rows)
 
     def airport(self, **kwargs: Unpack[gt.AirAirport.CreateParams]) -> gt.AirAirport:
-        kwargs["code"] = kwargs["code"].strip()
-        kwargs["code"] = hardcode.AIRPORT_ALIASES.get(kwargs["code"], kwargs["code"])
-        return gt.AirAirport.create(self.conn, self.priority, **kwargs)
+        return self.airport_many([kwargs])[0]
 
-    def gate(self, **kwargs: Unpack[gt.AirGate.CreateParams]) -> gt.AirGate:
-        if kwargs["code"] is not None:
+    def airport_many(self, rows: Iterable[gt.AirAirport.CreateParams]) -> list[gt.AirAirport]:
+        rows = [kwargs.copy() for kwargs in rows]
+        for kwargs in rows:
             kwargs["code"] = kwargs["code"].strip()
-        kwargs["code"] = (
-            d.get(kwargs["code"], kwargs["code"])  # pyrefly: ignore [no-matching-overload]
-            if (d := hardcode.GATE_ALIASES.get(kwargs["airport"].code)) is not None
-            else kwargs["code"]
-        )
-        if (
-            kwargs["airport"].code in hardcode.DUPLICATE_GATE_NUM
-            and kwargs["code"] is not None
-            and not kwargs["code"].startswith("T")
-        ):
-            rich.print(
-                ERROR + self.name + f": Received gate code without terminal `{kwargs['airport'].code} {kwargs['code']}`"
+            kwargs["code"] = hardcode.AIRPORT_ALIASES.get(kwargs["code"], kwargs["code"])
+        return gt.AirAirport.create_many(self.conn, self.priority, rows)
+
+    def gate(self, **kwargs: Unpack[gt.AirGate.CreateParams]) -> gt.AirGate:
+        return self.gate_many([kwargs])[0]
+
+    def gate_many(self, rows: Iterable[gt.AirGate.CreateParams]) -> list[gt.AirGate]:
+        rows = [kwargs.copy() for kwargs in rows]
+        for kwargs in rows:
+            if kwargs["code"] is not None:
+                kwargs["code"] = kwargs["code"].strip()
+            kwargs["code"] = (
+                d.get(kwargs["code"], kwargs["code"])  # pyrefly: ignore [no-matching-overload]
+                if (d := hardcode.GATE_ALIASES.get(kwargs["airport"].code)) is not None
+                else kwargs["code"]
             )
-        return gt.AirGate.create(self.conn, self.priority, **kwargs)
+            if (
+                kwargs["airport"].code in hardcode.DUPLICATE_GATE_NUM
+                and kwargs["code"] is not None
+                and not kwargs["code"].startswith("T")
+            ):
+                rich.print(
+                    ERROR
+                    + self.name
+                    + f": Received gate code without terminal `{kwargs['airport'].code} {kwargs['code']}`"
+                )
+        return gt.AirGate.create_many(self.conn, self.priority, rows)
 
     def flight(self, **kwargs: Unpack[gt.AirFlight.CreateParams]) -> gt.AirFlight:
         return gt.AirFlight.create(self.conn, self.priority, **kwargs)
 
+    def flight_many(self, rows: Iterable[gt.AirFlight.CreateParams]) -> list[gt.AirFlight]:
+        return gt.AirFlight.create_many(self.conn, self.priority, rows)
+
     def connect(
         self,
         *,
@@ -116,18 +148,33 @@ class BusSource(Source):
     def company(self, **kwargs: Unpack[gt.BusCompany.CreateParams]) -> gt.BusCompany:
         return gt.BusCompany.create(self.conn, self.priority, **kwargs)
 
+    def company_many(self, rows: Iterable[gt.BusCompany.CreateParams]) -> list[gt.BusCompany]:
+        return gt.BusCompany.create_many(self.conn, self.priority, rows)
+
     def line(self, **kwargs: Unpack[gt.BusLine.CreateParams]) -> gt.BusLine:
         return gt.BusLine.create(self.conn, self.priority, **kwargs)
 
+    def line_many(self, rows: Iterable[gt.BusLine.CreateParams]) -> list[gt.BusLine]:
+        return gt.BusLine.create_many(self.conn, self.priority, rows)
+
     def stop(self, **kwargs: Unpack[gt.BusStop.CreateParams]) -> gt.BusStop:
         return gt.BusStop.create(self.conn, self.priority, **kwargs)
 
+    def stop_many(self, rows: Iterable[gt.BusStop.CreateParams]) -> list[gt.BusStop]:
+        return gt.BusStop.create_many(self.conn, self.priority, rows)
+
     def berth(self, **kwargs: Unpack[gt.BusBerth.CreateParams]) -> gt.BusBerth:
         return gt.BusBerth.create(self.conn, self.priority, **kwargs)
 
+    def berth_many(self, rows: Iterable[gt.BusBerth.CreateParams]) -> list[gt.BusBerth]:
+        return gt.BusBerth.create_many(self.conn, self.priority, rows)
+
     def connection(self, **kwargs: Unpack[gt.BusConnection.CreateParams]) -> gt.BusConnection:
         return gt.BusConnection.create(self.conn, self.priority, **kwargs)
 
+    def connection_many(self, rows: Iterable[gt.BusConnection.CreateParams]) -> list[gt.BusConnection]:
+        return gt.BusConnection.create_many(self.conn, self.priority, rows)
+
     def builder(self, line: gt.BusLine) -> BusLineBuilder:
         return BusLineBuilder(self.priority, line)
 
@@ -136,18 +183,33 @@ class SeaSource(Source):
     def company(self, **kwargs: Unpack[gt.SeaCompany.CreateParams]) -> gt.SeaCompany:
         return gt.SeaCompany.create(self.conn, self.priority, **kwargs)
 
+    def company_many(self, rows: Iterable[gt.SeaCompany.CreateParams]) -> list[gt.SeaCompany]:
+        return gt.SeaCompany.create_many(self.conn, self.priority, rows)
+
     def line(self, **kwargs: Unpack[gt.SeaLine.CreateParams]) -> gt.SeaLine:
         return gt.SeaLine.create(self.conn, self.priority, **kwargs)
 
+    def line_many(self, rows: Iterable[gt.SeaLine.CreateParams]) -> list[gt.SeaLine]:
+        return gt.SeaLine.create_many(self.conn, self.priority, rows)
+
     def stop(self, **kwargs: Unpack[gt.SeaStop.CreateParams]) -> gt.SeaStop:
         return gt.SeaStop.create(self.conn, self.priority, **kwargs)
 
+    def stop_many(self, rows: Iterable[gt.SeaStop.CreateParams]) -> list[gt.SeaStop]:
+        return gt.SeaStop.create_many(self.conn, self.priority, rows)
+
     def dock(self, **kwargs: Unpack[gt.SeaDock.CreateParams]) -> gt.SeaDock:
         return gt.SeaDock.create(self.conn, self.priority, **kwargs)
 
+    def dock_many(self, rows: Iterable[gt.SeaDock.CreateParams]) -> list[gt.SeaDock]:
+        return gt.SeaDock.create_many(self.conn, self.priority, rows)
+
     def connection(self, **kwargs: Unpack[gt.SeaConnection.CreateParams]) -> gt.SeaConnection:
         return gt.SeaConnection.create(self.conn, self.priority, **kwargs)
 
+    def connection_many(self, rows: Iterable[gt.SeaConnection.CreateParams]) -> list[gt.SeaConnection]:
+        return gt.SeaConnection.create_many(self.conn, self.priority, rows)
+
     def builder(self, line: gt.SeaLine) -> SeaLineBuilder:
         return SeaLineBuilder(self.priority, line)
 
@@ -156,17 +218,32 @@ class RailSource(Source):
     def company(self, **kwargs: Unpack[gt.RailCompany.CreateParams]) -> gt.RailCompany:
         return gt.RailCompany.create(self.conn, self.priority, **kwargs)
 
+    def company_many(self, rows: Iterable[gt.RailCompany.CreateParams]) -> list[gt.RailCompany]:
+        return gt.RailCompany.create_many(self.conn, self.priority, rows)
+
     def line(self, **kwargs: Unpack[gt.RailLine.CreateParams]) -> gt.RailLine:
         return gt.RailLine.create(self.conn, self.priority, **kwargs)
 
+    def line_many(self, rows: Iterable[gt.RailLine.CreateParams]) -> list[gt.RailLine]:
+        return gt.RailLine.create_many(self.conn, self.priority, rows)
+
     def station(self, **kwargs: Unpack[gt.RailStation.CreateParams]) -> gt.RailStation:
         return gt.RailStation.create(self.conn, self.priority, **kwargs)
 
+    def station_many(self, rows: Iterable[gt.RailStation.CreateParams]) -> list[gt.RailStation]:
+        return gt.RailStation.create_many(self.conn, self.priority, rows)
+
     def platform(self, **kwargs: Unpack[gt.RailPlatform.CreateParams]) -> gt.RailPlatform:
         return gt.RailPlatform.create(self.conn, self.priority, **kwargs)
 
+    def platform_many(self, rows: Iterable[gt.RailPlatform.CreateParams]) -> list[gt.RailPlatform]:
+        return gt.RailPlatform.create_many(self.conn, self.priority, rows)
+
     def connection(self, **kwargs: Unpack[gt.RailConnection.CreateParams]) -> gt.RailConnection:
         return gt.RailConnection.create(self.conn, self.priority, **kwargs)
 
+    def connection_many(self, rows: Iterable[gt.RailConnection.CreateParams]) -> list[gt.RailConnection]:
+        return gt.RailConnection.create_many(self.conn, self.priority, rows)
+
     def builder(self, line: gt.RailLine) -> RailLineBuilder:
         return RailLineBuilder(self.priority, line)
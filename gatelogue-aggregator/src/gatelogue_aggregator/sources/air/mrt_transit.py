@@ -1,11 +1,9 @@
 from __future__ import annotations
 
 import re
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar, NamedTuple, cast
 
-import pandas as pd
-
-from gatelogue_aggregator.downloader import get_csv
+from gatelogue_aggregator.downloader import get_csv_rows
 from gatelogue_aggregator.logging import INFO3, track
 from gatelogue_aggregator.source import AirSource
 
@@ -15,88 +13,91 @@ if TYPE_CHECKING:
     from gatelogue_aggregator.config import Config
 
 
+class _Airport(NamedTuple):
+    name: str
+    code: str
+    world: gt.World | None
+    mode: gt.AirMode
+
+
 class MRTTransit(AirSource):
     name = "MRT Transit (Air)"
-    df: pd.DataFrame
+    flights: dict[str, list[tuple[_Airport, str]]]
+    """Airports served by every airline, and the flight codes of the airline at each airport"""
+
+    SHEETS: ClassVar[tuple[tuple[str, str, gt.AirMode, int, int], ...]] = (
+        ("379342597", "mrt-transit1", "seaplane", 1, 66),
+        ("1714326420", "mrt-transit2", "helicopter", 0, 4),
+        ("248317803", "mrt-transit3", "warp plane", 1, 6),
+    )
+    """Sheet ID, cache key, mode, index of the header row, and number of rows to ignore at the end of every sheet"""
 
     def prepare(self, config: Config):
-        df1 = get_csv(
-            "https://docs.google.com/spreadsheets/d/1wzvmXHQZ7ee7roIvIrJhkP6oCegnB8-nefWpd8ckqps/export?format=csv&gid=379342597",
-            "mrt-transit1",
-            config,
-            header=1,
-        )
-        df1.rename(
-            columns={
-                "Unnamed: 0": "Name",
-                "Unnamed: 1": "Code",
-                "Unnamed: 2": "World",
-                "Unnamed: 3": "Operator",
-            },
-            inplace=True,
-        )
-        df1.drop(df1.tail(66).index, inplace=True)
-        df1["Mode"] = "seaplane"
-
-        df2 = get_csv(
-            "https://docs.google.com/spreadsheets/d/1wzvmXHQZ7ee7roIvIrJhkP6oCegnB8-nefWpd8ckqps/export?format=csv&gid=1714326420",
-            "mrt-transit2",
-            config,
-            header=0,
-        )
-        df2["Mode"] = "helicopter"
-        df2.rename(columns={"Airport Name": "Name"}, inplace=True)
-        df2.drop(df2.tail(4).index, inplace=True)
-
-        df3 = get_csv(
-            "https://docs.google.com/spreadsheets/d/1wzvmXHQZ7ee7roIvIrJhkP6oCegnB8-nefWpd8ckqps/export?format=csv&gid=248317803",
-            "mrt-transit3",
-            config,
-            header=1,
-        )
-        df3["Mode"] = "warp plane"
-        df3.rename(
-            columns={
-                "Unnamed: 0": "Name",
-                "Unnamed: 1": "Code",
-                "Unnamed: 2": "World",
-                "Unnamed: 3": "Operator",
-            },
-            inplace=True,
-        )
-        df3.drop(df3.tail(6).index, inplace=True)
-
-        self.df = pd.concat((df1, df2, df3))
+        self.flights = {}
+        for gid, key, mode, header, footer in self.SHEETS:
+            rows = list(
+                get_csv_rows(
+                    f"https://docs.google.com/spreadsheets/d/1wzvmXHQZ7ee7roIvIrJhkP6oCegnB8-nefWpd8ckqps/export?format=csv&gid={gid}",
+                    key,
+                    config,
+                    skip=header,
+                )
+            )
+            if len(rows) == 0:
+                continue
+            columns = [
+                ("Name", "Code", "World", "Operator")[i] if i < 4 and column == "" else column
+                for i, column in enumerate(rows[0])
+            ]
+            columns = ["Name" if column == "Airport Name" else column for column in columns]
+            name_i, code_i, world_i = (columns.index(c) if c in columns else None for c in ("Name", "Code", "World"))
+            airlines = [
+                (i, column)
+                for i, column in enumerate(columns)
+                if column not in ("", "Name", "Code", "World", "Operator", "Owner", "Mode")
+            ]
+            for airline_name in (column for _, column in airlines):
+                self.flights.setdefault(airline_name, [])
+
+            for row in rows[1 : len(rows) - footer]:
+                cells = row + [""] * (len(columns) - len(row))
+                airport = _Airport(
+                    name="" if name_i is None else cells[name_i],
+                    code="" if code_i is None else cells[code_i],
+                    world=None if world_i is None or cells[world_i] == "" else cast("gt.World", cells[world_i]),
+                    mode=mode,
+                )
+                for i, airline_name in airlines:
+                    if cells[i] != "":
+                        self.flights[airline_name].append((airport, cells[i]))
 
     def build(self, config: Config):
-        for airline_name in track(self.df.columns, INFO3, description="Extracting data from CSV", nonlinear=True):
-            if airline_name in ("Name", "Code", "World", "Operator", "Owner", "Mode"):
-                continue
+        for airline_name, airports in track(
+            self.flights.items(), INFO3, description="Extracting data from CSV", nonlinear=True
+        ):
             airline = self.airline(name=airline_name)
             code2dest: dict[str, list[gt.AirAirport]] = {}
 
-            for airport_name, airport_code, airport_world, mode, flights in zip(
-                self.df["Name"], self.df["Code"], self.df["World"], self.df["Mode"], self.df[airline_name], strict=False
-            ):
-                if airport_code == "" or pd.isna(flights):
+            for (airport_name, airport_code, airport_world, mode), flights in airports:
+                if airport_code == "":
                     continue
                 airport = self.airport(code=airport_code, modes={mode})
 
-                if pd.notna(airport_name):
-                    if (matches := re.search(r"(.*?) \((.*?)\)", str(airport_name))) is not None:
+                if airport_name != "":
+                    if (matches := re.search(r"(.*?) \((.*?)\)", airport_name)) is not None:
                         names = {matches.group(2) + " " + matches.group(1), airport_name}
                     else:
                         names = {airport_name}
                     if airport_code == "CWI":
                         names.update({"UCWT International Airport", "UCWTIA"})
                     airport.names = names
-                if pd.notna(airport_world):
+                if airport_world is not None:
                     airport.world = airport_world
 
                 if mode == "helicopter":
                     continue
 
-                for flight_code in str(flights).split(", "):
+                for flight_code in flights.split(", "):
                     gate = self.gate(
                         code=None,
                         airport=airport,
@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING, ClassVar
 
 import gatelogue_types as gt
 
-from gatelogue_aggregator.downloader import get_wiki_link, get_wiki_text
+from gatelogue_aggregator.downloader import get_wiki_link, get_wiki_text_derived
 from gatelogue_aggregator.source import AirSource
 
 if TYPE_CHECKING:
@@ -19,19 +19,28 @@ class _NameDescriptor:
 
 class RegexWikiAirline(AirSource):
     name = _NameDescriptor()  # pyrefly: ignore [bad-assignment]
-    text: str
+    matches: list[dict[str, str | None]]
     airline_name: ClassVar[str]
     page_name: ClassVar[str]
     regex: ClassVar[re.Pattern[str]]
 
+    @classmethod
+    def wiki_pages(cls) -> list[str]:
+        return [cls.page_name]
+
     def prepare(self, config: Config):
-        self.text = get_wiki_text(self.page_name, config)
+        self.matches = get_wiki_text_derived(
+            self.page_name,
+            config,
+            list[dict[str, str | None]],
+            lambda text: [match.groupdict() for match in re.finditer(self.regex, text)],
+            name=f"regex {self.regex.flags} {self.regex.pattern}",
+        )
 
     def build(self, config: Config):
         airline = self.airline(name=self.airline_name, link=get_wiki_link(self.page_name))
-        for match in re.finditer(self.regex, self.text):
-            matches: dict[str, str] = match.groupdict()
-            flight_code = matches["code"]
+        for matches in self.matches:
+            flight_code: str = matches["code"]  # pyrefly: ignore [bad-assignment]
             aircraft_name = matches.get("ac") or self.aircraft(matches)
             aircraft = None if aircraft_name is None else gt.Aircraft(self.conn, aircraft_name)
             mode = self.mode(matches) or (aircraft.mode if aircraft is not None else "warp plane")
@@ -99,11 +108,11 @@ class RegexWikiAirline(AirSource):
             self.flight(airline=airline, code=flight_code, from_=gate3, to=gate2, aircraft=aircraft_name)
 
     @staticmethod
-    def aircraft(_matches: dict[str, str]) -> str | None:
+    def aircraft(_matches: dict[str, str | None]) -> str | None:
         return None
 
     @staticmethod
-    def mode(_matches: dict[str, str]) -> gt.AirMode | None:
+    def mode(_matches: dict[str, str | None]) -> gt.AirMode | None:
         return None
 
     @staticmethod
@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from typing import TYPE_CHECKING, ClassVar
 
-from gatelogue_aggregator.downloader import get_wiki_link, get_wiki_text
+from gatelogue_aggregator.downloader import get_wiki_link, get_wiki_text_derived
 from gatelogue_aggregator.source import AirSource
 
 if TYPE_CHECKING:
@@ -19,22 +19,31 @@ class _NameDescriptor:
 
 class RegexWikiAirport(AirSource):
     name = _NameDescriptor()  # pyrefly: ignore [bad-assignment]
-    text: str
+    matches: list[dict[str, str | None]]
     airport_code: ClassVar[str]
     page_name: ClassVar[str]
     regex: ClassVar[re.Pattern[str]]
     additional_names: ClassVar[set[str]] = set()
 
+    @classmethod
+    def wiki_pages(cls) -> list[str]:
+        return [cls.page_name]
+
     def prepare(self, config: Config):
-        self.text = get_wiki_text(self.page_name, config)
+        self.matches = get_wiki_text_derived(
+            self.page_name,
+            config,
+            list[dict[str, str | None]],
+            lambda text: [match.groupdict() for match in re.finditer(self.regex, text)],
+            name=f"regex {self.regex.flags} {self.regex.pattern}",
+        )
 
     def build(self, config: Config):
         airport = self.airport(
             code=self.airport_code, link=get_wiki_link(self.page_name), names={self.page_name, *self.additional_names}
         )
-        for match in re.finditer(self.regex, self.text):
-            matches: dict[str, str] = match.groupdict()
-            gate_code = self.process_gate_code(matches["code"])
+        for matches in self.matches:
+            gate_code = self.process_gate_code(matches["code"])  # pyrefly: ignore [bad-argument-type]
             width = int(matches.get("width")) if matches.get("width") else self.width(matches)
             if (airline_name := (matches.get("airline", matches.get("airline2")))) is not None:
                 airline = self.airline(name=self.process_airline_name(airline_name))
@@ -44,11 +53,11 @@ class RegexWikiAirport(AirSource):
             self.gate(code=gate_code, airport=airport, width=width, airline=airline, mode=mode)
 
     @staticmethod
-    def width(_matches: dict[str, str]) -> int | None:
+    def width(_matches: dict[str, str | None]) -> int | None:
         return None
 
     @staticmethod
-    def mode(_matches: dict[str, str]) -> gt.AirMode | None:
+    def mode(_matches: dict[str, str | None]) -> gt.AirMode | None:
         return "warp plane"
 
     @staticmethod
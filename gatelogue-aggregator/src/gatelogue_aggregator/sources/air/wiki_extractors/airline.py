@@ -12,6 +12,7 @@ from gatelogue_aggregator.downloader import (
     get_wiki_html,
     get_wiki_link,
     get_wiki_text,
+    table_cells,
 )
 from gatelogue_aggregator.source import AirSource
 from gatelogue_aggregator.sources.air import hardcode
@@ -36,7 +37,7 @@ class Astrella(RegexWikiAirline):
     )
 
     @staticmethod
-    def aircraft(matches: dict[str, str]) -> str | None:
+    def aircraft(matches: dict[str, str | None]) -> str | None:
         match matches["s"]:
             case "XS":
                 return "ITP1100 ELE"
@@ -74,7 +75,7 @@ class BluAir(RegexWikiAirline):
     )
 
     @staticmethod
-    def aircraft(matches: dict[str, str]) -> str | None:
+    def aircraft(matches: dict[str, str | None]) -> str | None:
         match matches["acc"]:
             case "s4n":
                 return "BluJet S4-N"
@@ -102,16 +103,16 @@ class IntraAir(AirSource):
         airline = self.airline(name="IntraAir", link=get_wiki_link("IntraAir/Flight List"))
 
         for table in self.html("table"):
-            for tr in table("tr")[1:]:
-                if len(tr("td")) < 9:
+            for tds in table_cells(table("tr")[1:]):
+                if len(tds) < 9:
                     continue
-                if tr("td")[8].find("a", href="/index.php/File:CaelusAirlines_Boarding.png") is None:
+                if tds[8].find("a", href="/index.php/File:CaelusAirlines_Boarding.png") is None:
                     continue
-                flight_code: str = tr("td")[1].span.string  # pyrefly: ignore[missing-attribute]
-                airport1_code: str = tr("td")[2].span.string  # pyrefly: ignore[missing-attribute]
-                airport2_code: str = tr("td")[4].span.string  # pyrefly: ignore[missing-attribute]
+                flight_code: str = tds[1].span.string  # pyrefly: ignore[missing-attribute]
+                airport1_code: str = tds[2].span.string  # pyrefly: ignore[missing-attribute]
+                airport2_code: str = tds[4].span.string  # pyrefly: ignore[missing-attribute]
 
-                g1 = tr("td")[3]("b")[1:]
+                g1 = tds[3]("b")[1:]
                 gate1_code = (
                     None
                     if len(g1) == 0
@@ -122,7 +123,7 @@ class IntraAir(AirSource):
                     else g1[1].string
                 )
 
-                g2 = tr("td")[5]("b")[1:]
+                g2 = tds[5]("b")[1:]
                 gate2_code = (
                     None
                     if len(g2) == 0
@@ -133,7 +134,7 @@ class IntraAir(AirSource):
                     else g2[1].string
                 )
 
-                aircraft_name: str = tr("td")[6].span.string  # pyrefly: ignore[missing-attribute]
+                aircraft_name: str = tds[6].span.string  # pyrefly: ignore[missing-attribute]
 
                 self.connect(
                     airline=airline,
@@ -161,20 +162,20 @@ class FliHigh(AirSource):
         for table in self.html("table"):
             if table.find(string="Flight #") is None:
                 continue
-            for tr in table("tr")[1:]:
-                if tr("td")[7].find("a", href="/index.php/File:Open.png") is None:
+            for tds in table_cells(table("tr")[1:]):
+                if tds[7].find("a", href="/index.php/File:Open.png") is None:
                     continue
                 # pyrefly: ignore[missing-attribute]
-                flight_code: str = tr("td")[0].find("span").string.removeprefix("FH")
-                airport1_code: str = tr("td")[1].b.string  # pyrefly: ignore[missing-attribute]
-                airport2_code: str = tr("td")[2].b.string  # pyrefly: ignore[missing-attribute]
-                gate1_code: str | None = tr("td")[5].b.string  # pyrefly: ignore[missing-attribute]
-                gate2_code: str | None = tr("td")[6].b.string  # pyrefly: ignore[missing-attribute]
+                flight_code: str = tds[0].find("span").string.removeprefix("FH")
+                airport1_code: str = tds[1].b.string  # pyrefly: ignore[missing-attribute]
+                airport2_code: str = tds[2].b.string  # pyrefly: ignore[missing-attribute]
+                gate1_code: str | None = tds[5].b.string  # pyrefly: ignore[missing-attribute]
+                gate2_code: str | None = tds[6].b.string  # pyrefly: ignore[missing-attribute]
                 if "idk" in gate1_code or "CHECK WIKI" in gate1_code:  # pyrefly: ignore[not-iterable]
                     gate1_code = None
                 if "idk" in gate2_code or "CHECK WIKI" in gate2_code:  # pyrefly: ignore[not-iterable]
                     gate2_code = None
-                aircraft_name: str = tr("td")[8].string.strip()  # pyrefly: ignore[missing-attribute]
+                aircraft_name: str = tds[8].string.strip()  # pyrefly: ignore[missing-attribute]
 
                 self.connect(
                     airline=airline,
@@ -197,7 +198,7 @@ class AirMesa(RegexWikiAirline):
     )
 
     @staticmethod
-    def aircraft(matches: dict[str, str]) -> str | None:
+    def aircraft(matches: dict[str, str | None]) -> str | None:
         match matches["acc"]:
             case "p1":
                 return "Moj Manufacturing P-1MJ"
@@ -214,7 +215,7 @@ class Air(RegexWikiAirline):
     )
 
     @staticmethod
-    def aircraft(matches: dict[str, str]) -> str | None:
+    def aircraft(matches: dict[str, str | None]) -> str | None:
         match matches["acc"]:
             case "frs":
                 return "\"Fred Rail Air' Compact Surveillance Aircraft"
@@ -231,7 +232,7 @@ class Berryessa(RegexWikiAirline):
     )
 
     @staticmethod
-    def aircraft(matches: dict[str, str]) -> str | None:
+    def aircraft(matches: dict[str, str | None]) -> str | None:
         match matches["acc"]:
             case "747":
                 return "SkyTransit 747-8"
@@ -262,12 +263,12 @@ class AirNet(AirSource):
 
         table = next(a for a in self.html("table") if "Number" in str(a))
         # pyrefly: ignore [not-callable]
-        for tr in table.tbody("tr")[1:]:
-            if "Boarding" not in str(tr("td")[3]):
+        for tds in table_cells(table.tbody("tr")[1:]):
+            if "Boarding" not in str(tds[3]):
                 continue
-            flight_code = next(tr("td")[0].strings).removeprefix("AN")
-            ng1 = "".join(tr("td")[1].strings)
-            ng2 = "".join(tr("td")[2].strings)
+            flight_code = next(tds[0].strings).removeprefix("AN")
+            ng1 = "".join(tds[1].strings)
+            ng2 = "".join(tds[2].strings)
             airport1_name, gate1_code = ng1.split("|")
             airport2_name, gate2_code = ng2.split("|")
 
@@ -296,18 +297,18 @@ class FlyCreeper(AirSource):
         for table in self.html("table"):
             if "Flight No" not in str(table):
                 continue
-            for tr in table.tbody("tr")[1:]:  # pyrefly: ignore [not-callable]
-                if "Active" not in tr("td")[2].string:  # pyrefly: ignore [not-iterable]
+            for tds in table_cells(table.tbody("tr")[1:]):  # pyrefly: ignore [not-callable]
+                if "Active" not in tds[2].string:  # pyrefly: ignore [not-iterable]
                     continue
-                flight_code: str = tr("td")[0].string.removeprefix("FC").strip()  # pyrefly: ignore [missing-attribute]
-                if (airport1_code := re.search(r"\((...)\)", str(tr("td")[3]("b")[0]))) is None:
+                flight_code: str = tds[0].string.removeprefix("FC").strip()  # pyrefly: ignore [missing-attribute]
+                if (airport1_code := re.search(r"\((...)\)", str(tds[3]("b")[0]))) is None:
                     continue
                 airport1_code = airport1_code.group(1)
-                if (airport2_code := re.search(r"\((...)\)", str(tr("td")[3]("b")[1]))) is None:
+                if (airport2_code := re.search(r"\((...)\)", str(tds[3]("b")[1]))) is None:
                     continue
                 airport2_code = airport2_code.group(1)
-                gate1_code, gate2_code = list(tr("td")[4].strings)[:2]
-                aircraft_name: str = tr("td")[6].string.strip()  # pyrefly: ignore [missing-attribute]
+                gate1_code, gate2_code = list(tds[4].strings)[:2]
+                aircraft_name: str = tds[6].string.strip()  # pyrefly: ignore [missing-attribute]
                 self.connect(
                     airline=airline,
                     flight_code1=flight_code,
@@ -330,10 +331,10 @@ class Continental(RegexWikiAirline):
     )
 
     @staticmethod
-    def aircraft(matches: dict[str, str]) -> str | None:
-        if matches["ac2"].strip() == "IntraJet-EAM X-10":
+    def aircraft(matches: dict[str, str | None]) -> str | None:
+        if matches["ac2"].strip() == "IntraJet-EAM X-10":  # pyrefly: ignore [missing-attribute]
             return "EAM X-10"
-        return matches["ac2"].strip()
+        return matches["ac2"].strip()  # pyrefly: ignore [missing-attribute]
 
 
 @AIRLINE_SOURCES.append
@@ -345,8 +346,8 @@ class AirKanata(RegexWikiAirline):
     )
 
     @staticmethod
-    def aircraft(matches: dict[str, str]) -> str | None:
-        name = matches["ac2"].strip()
+    def aircraft(matches: dict[str, str | None]) -> str | None:
+        name = matches["ac2"].strip()  # pyrefly: ignore [missing-attribute]
         if name == "Dash Two Mini":
             return "UDAC Dash Two Mini"
         return name
@@ -361,8 +362,8 @@ class JiffyAir(RegexWikiAirline):
     )
 
     @staticmethod
-    def aircraft(matches: dict[str, str]) -> str | None:
-        return matches["ac1"] + " " + matches["ac2"]
+    def aircraft(matches: dict[str, str | None]) -> str | None:
+        return matches["ac1"] + " " + matches["ac2"]  # pyrefly: ignore [unsupported-operation]
 
 
 @AIRLINE_SOURCES.append
@@ -374,15 +375,15 @@ class Tennoji(RegexWikiAirline):
     )
 
     @staticmethod
-    def aircraft(matches: dict[str, str]) -> str | None:
-        name = (matches["ac1"] + " " + matches["ac2"]).strip()
+    def aircraft(matches: dict[str, str | None]) -> str | None:
+        name = (matches["ac1"] + " " + matches["ac2"]).strip()  # pyrefly: ignore [unsupported-operation]
         if name == "SI-A 1A":
             name += " (Tennoji)"
         return name
 
     @staticmethod
-    def mode(matches: dict[str, str]) -> str | None:
-        return "helicopter" if matches["code"].startswith("H") else "warp plane"
+    def mode(matches: dict[str, str | None]) -> str | None:
+        return "helicopter" if matches["code"].startswith("H") else "warp plane"  # pyrefly: ignore [missing-attribute]
 
 
 @AIRLINE_SOURCES.append
@@ -394,11 +395,11 @@ class Yousoro(RegexWikiAirline):
     )
 
     @staticmethod
-    def aircraft(matches: dict[str, str]) -> str | None:
-        return matches["ac1"] + " " + matches["ac2"]
+    def aircraft(matches: dict[str, str | None]) -> str | None:
+        return matches["ac1"] + " " + matches["ac2"]  # pyrefly: ignore [unsupported-operation]
 
     @staticmethod
-    def mode(_matches: dict[str, str]) -> gt.AirMode | None:
+    def mode(_matches: dict[str, str | None]) -> gt.AirMode | None:
         return "seaplane"
 
 
@@ -417,12 +418,12 @@ class RainerAirways(RegexWikiAirline):
     )
 
     @staticmethod
-    def mode(matches: dict[str, str]) -> gt.AirMode | None:
+    def mode(matches: dict[str, str | None]) -> gt.AirMode | None:
         return (
             "seaplane"
-            if matches["code"].startswith("S")
+            if matches["code"].startswith("S")  # pyrefly: ignore [missing-attribute]
             else "helicopter"
-            if matches["code"].startswith("H")
+            if matches["code"].startswith("H")  # pyrefly: ignore [missing-attribute]
             else "warp plane"
         )
 
@@ -605,7 +606,7 @@ class RodBla(RegexWikiAirline):
     regex = re.compile(r"\|RB(?P<code>.*?)\n\|Active\n\|(?P<a1>.*?)-(?P<a2>.*?)\n\|(?P<ac>.*?)\n")
 
     @staticmethod
-    def mode(_matches: dict[str, str]) -> gt.AirMode | None:
+    def mode(_matches: dict[str, str | None]) -> gt.AirMode | None:
         return "helicopter"
 
 
@@ -616,7 +617,7 @@ class MylesHeli(RegexWikiAirline):
     regex = re.compile(r"{{mylesh\|MY(?P<code>.*?)\|t\|(?P<a1>.*?)\|.*?\|.*?\|(?P<a2>.*?)\|.*?\|.*?}}")
 
     @staticmethod
-    def mode(matches: dict[str, str]) -> gt.AirMode | None:
+    def mode(matches: dict[str, str | None]) -> gt.AirMode | None:
         if matches["a1"] == "GSA":
             matches["a1"] = "GSAH"
         if matches["a2"] == "GSA":
@@ -648,12 +649,12 @@ class SouthWeast(AirSource):
     def build(self, config: Config):
         airline = self.airline(name="South Weast Airlines", link=get_wiki_link("South Weast Airlines"))
         table = next(a for a in self.html("table") if "Flight Number" in str(a))
-        for tr in table.tbody("tr")[1:]:  # pyrefly: ignore [not-callable]
-            if "ON TIME" not in str(tr("td")[4]):
+        for tds in table_cells(table.tbody("tr")[1:]):  # pyrefly: ignore [not-callable]
+            if "ON TIME" not in str(tds[4]):
                 continue
-            flight_code: str = tr("td")[0].string  # pyrefly: ignore [bad-assignment]
-            airport1_name = "".join(tr("td")[2].strings)
-            airport2_name = "".join(tr("td")[3].strings)
+            flight_code: str = tds[0].string  # pyrefly: ignore [bad-assignment]
+            airport1_name = "".join(tds[2].strings)
+            airport2_name = "".join(tds[3].strings)
 
             self.connect(
                 airline=airline,
@@ -677,12 +678,12 @@ class UtopiAir(AirSource):
         airline = self.airline(name="UtopiAir", link=get_wiki_link("UtopiAir"))
 
         for table in (a for a in self.html("table") if "Flight" in str(a)):
-            for tr in table.tbody("tr")[1:]:  # pyrefly: ignore [not-callable]
-                if len(tr("td")) > 3 and "ON TIME" not in str(tr("td")[3]):
+            for tds in table_cells(table.tbody("tr")[1:]):  # pyrefly: ignore [not-callable]
+                if len(tds) > 3 and "ON TIME" not in str(tds[3]):
                     continue
-                flight_code: str = tr("td")[0].string  # pyrefly: ignore [bad-assignment]
-                airport1_name = "".join(tr("td")[1].strings)
-                airport2_name = "".join(tr("td")[2].strings)
+                flight_code: str = tds[0].string  # pyrefly: ignore [bad-assignment]
+                airport1_name = "".join(tds[1].strings)
+                airport2_name = "".join(tds[2].strings)
                 if airport1_name == "Porton":
                     airport1_name = "Porton Seaplane Dock"
                 if airport2_name == "Porton":
@@ -726,6 +727,15 @@ class Caelus(AirSource):
 ! .*?\| (?P<ac>.*?)
 ! .*?CaelusAirlines_Boarding\.png""")
 
+    @classmethod
+    def wiki_pages(cls) -> list[str]:
+        return [
+            "Template:ICAG 000 Series Flights",
+            "Template:ICAG 100 Series Flights",
+            "Template:ICAG 200 Series Flights",
+            "Template:ICAG 700 Series Flights",
+        ]
+
     def prepare(self, config: Config):
         self.text0 = get_wiki_text("Template:ICAG 000 Series Flights", config)
         self.text1 = get_wiki_text("Template:ICAG 100 Series Flights", config)
@@ -749,12 +759,12 @@ class Caelus(AirSource):
                 )
 
         table = next(a for a in self.html3("table") if "Operated by" in str(a))
-        for tr in table.tbody("tr")[1:]:  # pyrefly: ignore [not-callable]
-            if "CaelusAirlines_Boarding.png" not in str(tr("td")[4]):
+        for tds in table_cells(table.tbody("tr")[1:]):  # pyrefly: ignore [not-callable]
+            if "CaelusAirlines_Boarding.png" not in str(tds[4]):
                 continue
-            code1, code2 = tr("td")[1].string.removeprefix("Flight ").split("/")  # pyrefly: ignore [missing-attribute]
-            a1, a2 = (b.string for b in tr("td")[2]("b"))
-            aircraft_name = tr("td")[3].string
+            code1, code2 = tds[1].string.removeprefix("Flight ").split("/")  # pyrefly: ignore [missing-attribute]
+            a1, a2 = (b.string for b in tds[2]("b"))
+            aircraft_name = tds[3].string
             self.connect(
                 airline=airline,
                 flight_code1=code1,
@@ -765,11 +775,11 @@ class Caelus(AirSource):
             )
 
         table = next(a for a in self.html4("table") if "Operated by" in str(a))
-        for tr in table.tbody("tr")[1:]:  # pyrefly: ignore [not-callable]
-            if "CaelusAirlines_Boarding.png" not in str(tr("td")[4]):
+        for tds in table_cells(table.tbody("tr")[1:]):  # pyrefly: ignore [not-callable]
+            if "CaelusAirlines_Boarding.png" not in str(tds[4]):
                 continue
-            code1, code2 = tr("td")[1].string.removeprefix("Flight ").split("/")  # pyrefly: ignore [missing-attribute]
-            n1, n2 = tr("td")[2].strings
+            code1, code2 = tds[1].string.removeprefix("Flight ").split("/")  # pyrefly: ignore [missing-attribute]
+            n1, n2 = tds[2].strings
             if n1 == "Deadbush Northeast Airfield":
                 n1 = "West Mesa International Airport"
             if n2 == "Deadbush Northeast Airfield":
@@ -791,7 +801,7 @@ class CBC(RegexWikiAirline):
     regex = re.compile(r"""(?P<code>.*?)\. (?P<a1>.*?) --- (?P<a2>.*?) /""")
 
     @staticmethod
-    def aircraft(_matches: dict[str, str]) -> str | None:
+    def aircraft(_matches: dict[str, str | None]) -> str | None:
         return "Caravacan Biplane"
 
 
@@ -810,9 +820,9 @@ class Cascadia(RegexWikiAirline):
 \|\| \[\[File:Eastern Active1\.png""")
 
     @staticmethod
-    def aircraft(matches: dict[str, str]) -> str | None:
+    def aircraft(matches: dict[str, str | None]) -> str | None:
         return (
-            matches["ac2"]
+            matches["ac2"]  # pyrefly: ignore [missing-attribute]
             .strip()
             .replace("P1315", "P 1315")
             .replace("<br>", " ")
@@ -826,6 +836,10 @@ class Waviation(AirSource):
     name = "MRT Wiki (Airline Waviation)"
     text: wtp.WikiText
 
+    @classmethod
+    def wiki_pages(cls) -> list[str]:
+        return ["Waviation"]
+
     def prepare(self, config: Config):
         self.text = wtp.parse(get_wiki_text("Waviation", config))
 
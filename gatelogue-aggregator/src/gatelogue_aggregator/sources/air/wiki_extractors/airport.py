@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING, ClassVar
 
 import pandas as pd
 
-from gatelogue_aggregator.downloader import get_csv, get_wiki_html, get_wiki_link
+from gatelogue_aggregator.downloader import get_csv, get_wiki_html, get_wiki_link, table_cells
 from gatelogue_aggregator.source import AirSource
 from gatelogue_aggregator.sources.air.wiki_airport import RegexWikiAirport
 
@@ -27,8 +27,8 @@ class PCE(RegexWikiAirport):
     )
 
     @staticmethod
-    def width(matches: dict[str, str]) -> int | None:
-        code = matches["code"]
+    def width(matches: dict[str, str | None]) -> int | None:
+        code: str = matches["code"]  # pyrefly: ignore [bad-assignment]
         return 39 if code.startswith(("D", "E", "F")) else 15
 
 
@@ -41,8 +41,8 @@ class MWT(RegexWikiAirport):
     )
 
     @staticmethod
-    def width(matches: dict[str, str]) -> int | None:
-        code = matches["code"].removesuffix("A")
+    def width(matches: dict[str, str | None]) -> int | None:
+        code = matches["code"].removesuffix("A")  # pyrefly: ignore [missing-attribute]
         return (
             None
             if code.startswith("D")
@@ -58,8 +58,8 @@ class MWT(RegexWikiAirport):
         )
 
     @staticmethod
-    def mode(matches: dict[str, str]) -> gt.AirMode | None:
-        code = matches["code"]
+    def mode(matches: dict[str, str | None]) -> gt.AirMode | None:
+        code: str = matches["code"]  # pyrefly: ignore [bad-assignment]
         if code.isdigit() and 83 <= int(code) <= 103:
             return "helicopter"
         return "warp plane"
@@ -72,12 +72,12 @@ class KEK(RegexWikiAirport):
     regex = re.compile(r"\|(?P<code>[^|}]*?)\|\|(?:\[\[(?:[^|\]]*?\|)?(?P<airline>[^|]*?)]]|[^|]*?)\|\|")
 
     @staticmethod
-    def width(matches: dict[str, str]) -> int | None:
-        return 11 if int(matches["code"]) > 100 else None
+    def width(matches: dict[str, str | None]) -> int | None:
+        return 11 if int(matches["code"]) > 100 else None  # pyrefly: ignore [bad-argument-type]
 
     @staticmethod
-    def mode(matches: dict[str, str]) -> gt.AirMode | None:
-        return "warp plane" if int(matches["code"]) > 100 else "seaplane"
+    def mode(matches: dict[str, str | None]) -> gt.AirMode | None:
+        return "warp plane" if int(matches["code"]) > 100 else "seaplane"  # pyrefly: ignore [bad-argument-type]
 
 
 @AIRPORT_SOURCES.append
@@ -89,8 +89,8 @@ class ABG(RegexWikiAirport):
     )
 
     @staticmethod
-    def width(matches: dict[str, str]) -> int | None:
-        return 43 if matches["code"].startswith(("I", "J")) else 15
+    def width(matches: dict[str, str | None]) -> int | None:
+        return 43 if matches["code"].startswith(("I", "J")) else 15  # pyrefly: ignore [missing-attribute]
 
 
 @AIRPORT_SOURCES.append
@@ -102,8 +102,8 @@ class OPA(RegexWikiAirport):
     )
 
     @staticmethod
-    def width(matches: dict[str, str]) -> int | None:
-        code = matches["code"]
+    def width(matches: dict[str, str | None]) -> int | None:
+        code: str = matches["code"]  # pyrefly: ignore [bad-assignment]
         return 39 if code.startswith("C") and 1 <= int(code.removeprefix("C")) <= 4 else 15
 
 
@@ -116,12 +116,13 @@ class CHB(RegexWikiAirport):
     )
 
     @staticmethod
-    def width(matches: dict[str, str]) -> int | None:
-        return 33 if matches["code"].isdigit() and int(matches["code"]) >= 25 else 15
+    def width(matches: dict[str, str | None]) -> int | None:
+        code: str = matches["code"]  # pyrefly: ignore [bad-assignment]
+        return 33 if code.isdigit() and int(code) >= 25 else 15
 
     @staticmethod
-    def mode(matches: dict[str, str]) -> gt.AirMode | None:
-        return "helicopter" if matches["code"].startswith("H") else "warp plane"
+    def mode(matches: dict[str, str | None]) -> gt.AirMode | None:
+        return "helicopter" if matches["code"].startswith("H") else "warp plane"  # pyrefly: ignore [missing-attribute]
 
 
 @AIRPORT_SOURCES.append
@@ -131,7 +132,7 @@ class CBZ(RegexWikiAirport):
     regex = re.compile(r"\|(?P<code>[AB]\d*?)\n\|(?:\[\[(?:[^|\]]*?\|)?(?P<airline>[^|]*?)]]|[^|]*?)")
 
     @staticmethod
-    def width(_matches: dict[str, str]) -> int | None:
+    def width(_matches: dict[str, str | None]) -> int | None:
         return 15
 
 
@@ -142,8 +143,8 @@ class CBI(RegexWikiAirport):
     regex = re.compile(r"\|(?P<code>\d+?)\n\|(?:\[\[(?:[^|\]]*?\|)?(?P<airline>[^|]*?)]]|[^|]*?)")
 
     @staticmethod
-    def width(matches: dict[str, str]) -> int | None:
-        return 41 if int(matches["code"]) >= 18 else 15
+    def width(matches: dict[str, str | None]) -> int | None:
+        return 41 if int(matches["code"]) >= 18 else 15  # pyrefly: ignore [bad-argument-type]
 
 
 @AIRPORT_SOURCES.append
@@ -166,10 +167,10 @@ class DJE(AirSource):
             if (caption := table.caption.string.strip() if table.caption is not None else None) is None:
                 continue
             if caption == "Terminal 1":
-                for tr in table("tr")[1:]:
-                    code: str = tr("td")[0].string  # pyrefly: ignore [bad-assignment]
+                for tds in table_cells(table("tr")[1:]):
+                    code: str = tds[0].string  # pyrefly: ignore [bad-assignment]
                     width = 31 if 1 <= int(code) <= 10 else 15
-                    airline = tr("td")[1]
+                    airline = tds[1]
                     airline = airline.a.string if airline.a is not None else airline.string
                     airline = airline if airline is not None and airline.strip() != "" else None
                     self.gate(
@@ -182,11 +183,12 @@ class DJE(AirSource):
             elif caption == "Terminal 2":
                 concourse = ""
                 for tr in table("tr")[1:]:
-                    if len(tr("td")) == 1:
+                    tds = tr("td")
+                    if len(tds) == 1:
                         concourse = tr.find("b").string.strip(" ")[0]  # pyrefly: ignore [missing-attribute]
                         continue
-                    code = concourse + tr("td")[0].string  # pyrefly: ignore [unsupported-operation]
-                    airline = tr("td")[1]
+                    code = concourse + tds[0].string  # pyrefly: ignore [unsupported-operation]
+                    airline = tds[1]
                     airline = airline.a.string if airline.a is not None else airline.string
                     airline = airline if airline is not None and airline.strip() != "" else None
                     self.gate(
@@ -205,7 +207,7 @@ class VDA(RegexWikiAirport):
     regex = re.compile(r"\|(?P<code>\d+?)\|\|(?:\[\[(?:[^|\]]*?\|)?(?P<airline>[^|]*?)]]|(?P<airline2>\S[^|]*)|[^|]*?)")
 
     @staticmethod
-    def width(_matches: dict[str, str]) -> int | None:
+    def width(_matches: dict[str, str | None]) -> int | None:
         return 15
 
 
@@ -216,7 +218,8 @@ class WMI(RegexWikiAirport):
     regex = re.compile(r"\|Gate (?P<code>.*?)\n\| (?:\[\[(?:[^|\]]*?\|)?(?P<airline>[^|]*?)]]|[^|]*?)")
 
     @staticmethod
-    def width(matches: dict[str, str]) -> int | None:
+    def width(matches: dict[str, str | None]) -> int | None:
+        # pyrefly: ignore [missing-attribute]
         return 39 if matches["code"].startswith("I") and matches["code"] not in ("I14", "I15", "I16") else 15
 
 
@@ -229,8 +232,8 @@ class DFM(RegexWikiAirport):
     )
 
     @staticmethod
-    def width(matches: dict[str, str]) -> int | None:
-        code = int(matches["code"])
+    def width(matches: dict[str, str | None]) -> int | None:
+        code = int(matches["code"])  # pyrefly: ignore [bad-argument-type]
         return (
             35
             if code in (1, 2, 3, 13, 14, 15)
@@ -242,8 +245,8 @@ class DFM(RegexWikiAirport):
         )
 
     @staticmethod
-    def mode(matches: dict[str, str]) -> gt.AirMode | None:
-        code = int(matches["code"])
+    def mode(matches: dict[str, str | None]) -> gt.AirMode | None:
+        code = int(matches["code"])  # pyrefly: ignore [bad-argument-type]
         return "helicopter" if code in (72, 73, 35, 36, 37, 62, 63, 64) else "warp plane"
 
 
@@ -272,11 +275,11 @@ class DBI(AirSource):
                 else None
             ) is None:
                 continue
-            for tr in table("tr")[1:]:
-                code = concourse + tr("td")[0].string  # pyrefly: ignore [unsupported-operation]
-                size = tr("td")[1].string
+            for tds in table_cells(table("tr")[1:]):
+                code = concourse + tds[0].string  # pyrefly: ignore [unsupported-operation]
+                size = tds[1].string
                 width = 39 if size == "M" else 17 if size == "S" else None
-                airline = tr("td")[2]
+                airline = tds[2]
                 airline = airline.a.string if airline.a is not None else airline.string
                 self.gate(
                     code=code,
@@ -296,12 +299,12 @@ class GSM(RegexWikiAirport):
     )
 
     @staticmethod
-    def width(_matches: dict[str, str]) -> int | None:
+    def width(_matches: dict[str, str | None]) -> int | None:
         return 13
 
     @staticmethod
-    def mode(matches: dict[str, str]) -> gt.AirMode | None:
-        return "helicopter" if matches["code"].startswith("H") else "warp plane"
+    def mode(matches: dict[str, str | None]) -> gt.AirMode | None:
+        return "helicopter" if matches["code"].startswith("H") else "warp plane"  # pyrefly: ignore [missing-attribute]
 
 
 @AIRPORT_SOURCES.append
@@ -322,7 +325,7 @@ class SDZ(RegexWikiAirport):
     )
 
     @staticmethod
-    def width(_matches: dict[str, str]) -> int | None:
+    def width(_matches: dict[str, str | None]) -> int | None:
         return 15
 
 
@@ -335,13 +338,13 @@ class CIA(RegexWikiAirport):
     )
 
     @staticmethod
-    def mode(matches: dict[str, str]) -> gt.AirMode | None:
-        code = matches["code"]
+    def mode(matches: dict[str, str | None]) -> gt.AirMode | None:
+        code: str = matches["code"]  # pyrefly: ignore [bad-assignment]
         return "helicopter" if code.startswith("H") else "warp plane"
 
     @staticmethod
-    def width(matches: dict[str, str]) -> int | None:
-        code = matches["code"]
+    def width(matches: dict[str, str | None]) -> int | None:
+        code: str = matches["code"]  # pyrefly: ignore [bad-assignment]
         return 43 if code.startswith(("A", "B")) else 59 if code.startswith("E") else 15
 
 
@@ -354,13 +357,13 @@ class ERZ(RegexWikiAirport):
     )
 
     @staticmethod
-    def width(matches: dict[str, str]) -> int | None:
-        code = matches["code"]
+    def width(matches: dict[str, str | None]) -> int | None:
+        code: str = matches["code"]  # pyrefly: ignore [bad-assignment]
         return 39 if code in ("A10", "A11", "A12", "B11", "B12") else 15
 
     @staticmethod
-    def mode(matches: dict[str, str]) -> gt.AirMode | None:
-        return "helicopter" if matches["code"].startswith("H") else "warp plane"
+    def mode(matches: dict[str, str | None]) -> gt.AirMode | None:
+        return "helicopter" if matches["code"].startswith("H") else "warp plane"  # pyrefly: ignore [missing-attribute]
 
 
 @AIRPORT_SOURCES.append
@@ -372,7 +375,7 @@ class ERZ2(RegexWikiAirport):
     )
 
     @staticmethod
-    def mode(_matches: dict[str, str]) -> gt.AirMode | None:
+    def mode(_matches: dict[str, str | None]) -> gt.AirMode | None:
         return "seaplane"
 
 
@@ -385,8 +388,8 @@ class ATC(RegexWikiAirport):
     )
 
     @staticmethod
-    def width(matches: dict[str, str]) -> int | None:
-        code = matches["code"]
+    def width(matches: dict[str, str | None]) -> int | None:
+        code: str = matches["code"]  # pyrefly: ignore [bad-assignment]
         return (
             67
             if code in ("W9", "W10", "E9", "E10")
@@ -398,8 +401,8 @@ class ATC(RegexWikiAirport):
         )
 
     @staticmethod
-    def mode(matches: dict[str, str]) -> gt.AirMode | None:
-        code = matches["code"]
+    def mode(matches: dict[str, str | None]) -> gt.AirMode | None:
+        code: str = matches["code"]  # pyrefly: ignore [bad-assignment]
         return "helicopter" if code.startswith("H") else "warp plane"
 
 
@@ -508,7 +511,7 @@ class KWT(RegexWikiAirport):
     additional_names: ClassVar = {"Kwai Tin Airfield"}
 
     @staticmethod
-    def width(_matches: dict[str, str]) -> int | None:
+    def width(_matches: dict[str, str | None]) -> int | None:
         return 15
 
 
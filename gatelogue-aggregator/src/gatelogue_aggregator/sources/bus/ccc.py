@@ -11,6 +11,10 @@ class CCC(BusSource):
     name = "MRT Wiki (Bus, Caravacan Caravan Company)"
     text: str
 
+    @classmethod
+    def wiki_pages(cls) -> list[str]:
+        return ["Caravacan Caravan Company"]
+
     def prepare(self, config: Config):
         self.text = get_wiki_text("Caravacan Caravan Company", config)
 
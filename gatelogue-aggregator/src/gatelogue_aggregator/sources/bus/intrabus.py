@@ -1,7 +1,7 @@
 import bs4
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link
+from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link, table_cells
 from gatelogue_aggregator.source import BusSource
 
 
@@ -19,12 +19,12 @@ class IntraBus(BusSource):
             if not table("th") or "Route Number" not in table.strings:
                 continue
             shift = 1 if "Replacement For" in table.strings else 0
-            for tr in table("tr")[1::2]:
-                line_code: str = tr("td")[0].find("span").string  # pyrefly: ignore [missing-attribute]
+            for tds in table_cells(table("tr")[1::2]):
+                line_code: str = tds[0].find("span").string  # pyrefly: ignore [missing-attribute]
                 line = self.line(code=line_code, company=company)
 
                 builder = self.builder(line)
-                for li in tr("td")[1 + shift]("li"):
+                for li in tds[1 + shift]("li"):
                     if li.find("s") is not None:
                         continue
                     if (name_tag := li.find("b")) is None:
@@ -11,6 +11,10 @@ class SeabeastBuses(BusSource):
     name = "MRT Wiki (Bus, Seabeast Buses)"
     text: str
 
+    @classmethod
+    def wiki_pages(cls) -> list[str]:
+        return ["Seabeast Buses"]
+
     def prepare(self, config: Config):
         self.text = get_wiki_text("Seabeast Buses", config)
 
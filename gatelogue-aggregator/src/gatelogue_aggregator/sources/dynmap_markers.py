@@ -1,5 +1,7 @@
+from typing import ClassVar
+
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_json
+from gatelogue_aggregator.downloader import Request, get_json
 from gatelogue_aggregator.logging import INFO1, progress_bar
 
 
@@ -7,16 +9,23 @@ class DynmapMarkers:
     old: dict
     new: dict
 
+    NEW: ClassVar[Request] = Request(
+        "https://dynmap.minecartrapidtransit.net/main/tiles/_markers_/marker_new.json",
+        "dynmap-markers-new",
+        empty_is_error=True,
+    )
+    OLD: ClassVar[Request] = Request(
+        "https://dynmap.minecartrapidtransit.net/main/tiles/_markers_/marker_old.json",
+        "dynmap-markers-old",
+        empty_is_error=True,
+    )
+
+    @classmethod
+    def requests(cls) -> list[Request]:
+        return [cls.NEW, cls.OLD]
+
     @classmethod
     def prepare(cls, config: Config):
         with progress_bar(INFO1, "Downloading markers from MRT Dynmap"):
-            cls.new = get_json(
-                "https://dynmap.minecartrapidtransit.net/main/tiles/_markers_/marker_new.json",
-                "dynmap-markers-new",
-                config,
-            )["sets"]
-            cls.old = get_json(
-                "https://dynmap.minecartrapidtransit.net/main/tiles/_markers_/marker_old.json",
-                "dynmap-markers-old",
-                config,
-            )["sets"]
+            cls.new = get_json(cls.NEW.url, cls.NEW.key, config)["sets"]
+            cls.old = get_json(cls.OLD.url, cls.OLD.key, config)["sets"]
@@ -1,8 +1,8 @@
 import re
-from concurrent.futures import ThreadPoolExecutor
+from typing import ClassVar
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_json, get_wiki_link, get_wiki_text
+from gatelogue_aggregator.downloader import Request, get_json, get_wiki_link, get_wiki_text, get_wiki_texts
 from gatelogue_aggregator.source import RailSource
 
 
@@ -10,14 +10,18 @@ class BluRail(RailSource):
     name = "MRT Wiki (Rail, BluRail)"
     line_wikis: dict[str, str]
 
+    LINE_LIST: ClassVar[Request] = Request(
+        "https://wiki.minecartrapidtransit.net/api.php?action=query&list=categorymembers&cmtitle=Category%3ABluRail+lines&cmlimit=5000&format=json",
+        "blurail_line_list",
+        empty_is_error=True,
+    )
+
+    @classmethod
+    def requests(cls) -> list[Request]:
+        return [cls.LINE_LIST]
+
     def prepare(self, config: Config):
-        line_list = (
-            get_json(
-                "https://wiki.minecartrapidtransit.net/api.php?action=query&list=categorymembers&cmtitle=Category%3ABluRail+lines&cmlimit=5000&format=json",
-                "blurail_line_list",
-                config,
-            )
-        )["query"]["categorymembers"]
+        line_list = get_json(self.LINE_LIST.url, self.LINE_LIST.key, config)["query"]["categorymembers"]
 
         line_codes = [result["title"].removesuffix(" (BluRail line)") for result in line_list]
 
@@ -27,10 +31,8 @@ class BluRail(RailSource):
                 return None
             return wiki
 
-        with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
-            self.line_wikis = {
-                k: v for k, v in zip(line_codes, executor.map(retrieve_line, line_codes), strict=False) if v is not None
-            }
+        get_wiki_texts((f"{line_code} (BluRail line)" for line_code in line_codes), config)
+        self.line_wikis = {k: v for k in line_codes if (v := retrieve_line(k)) is not None}
 
     def build(self, config: Config):
         company = self.company(name="BluRail", link=get_wiki_link("BluRail"))
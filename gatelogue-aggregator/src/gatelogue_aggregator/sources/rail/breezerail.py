@@ -1,7 +1,7 @@
 import bs4
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link
+from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link, table_cells
 from gatelogue_aggregator.source import RailSource
 
 
@@ -22,11 +22,12 @@ class BreezeRail(RailSource):
             line = self.line(code=line_code, name=line_name, company=company, colour="#00c3ff")
 
             builder = self.builder(line)
-            for tr in h3.next_sibling.next_sibling.find_all("tr")[1:]:  # pyrefly: ignore [missing-attribute]
-                if tr("td")[0].find("a", href="/index.php/File:Dynmap_Green_Flag.png") is None:
+            rows = h3.next_sibling.next_sibling.find_all("tr")[1:]  # pyrefly: ignore [missing-attribute]
+            for tds in table_cells(rows):
+                if tds[0].find("a", href="/index.php/File:Dynmap_Green_Flag.png") is None:
                     continue
-                name = next(tr("td")[2].strings)
-                code = tr("td")[1].span.string
+                name = next(tds[2].strings)
+                code = tds[1].span.string  # pyrefly: ignore [missing-attribute]
                 code = {"SP", "SPC"} if code == "SP" else {code}
 
                 builder.add(self.station(codes=code, name=name, company=company))
@@ -1,27 +1,43 @@
 import bs4
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link
+from gatelogue_aggregator.downloader import get_wiki_html_derived, get_wiki_link
 from gatelogue_aggregator.source import RailSource
 
 
 class IntraRail(RailSource):
     name = "MRT Wiki (Rail, IntraRail)"
-    html: bs4.BeautifulSoup
+    lines: list[tuple[str, str, list[str]]]
+    """Code, name and names of the open stations of every line"""
 
     def prepare(self, config: Config):
-        self.html = get_wiki_html("IntraRail", config)
+        self.lines = get_wiki_html_derived(
+            "IntraRail", config, list[tuple[str, str, list[str]]], self.extract, name="IntraRail lines"
+        )
 
-    def build(self, config: Config):
-        company = self.company(name="IntraRail", link=get_wiki_link("IntraRail"))
-
-        for h4 in self.html.find_all("h4"):
+    @staticmethod
+    def extract(html: bs4.BeautifulSoup) -> list[tuple[str, str, list[str]]]:
+        lines = []
+        for h4 in html.find_all("h4"):
             line_code_name: str = h4.find("span", class_="mw-headline").string  # pyrefly: ignore [missing-attribute]
             if line_code_name.startswith("("):
                 continue
             line_code = line_code_name.split(" ")[0]
             line_name = line_code_name.removeprefix(line_code)
 
+            station_names = []
+            for big in h4.find_next("p").find_all("big", recursive=False):  # pyrefly: ignore [missing-attribute]
+                if (big2 := big.find("big")) is None or big.find("s") is not None:
+                    continue
+                name = " ".join(big2.stripped_strings)
+                station_names.append({"Plage Rouge Seki City": "Plage Rouge-Seki City"}.get(name, name))
+            lines.append((line_code, line_name, station_names))
+        return lines
+
+    def build(self, config: Config):
+        company = self.company(name="IntraRail", link=get_wiki_link("IntraRail"))
+
+        for line_code, line_name, station_names in self.lines:
             line_code_base = int(line_code.removesuffix("X").removesuffix("A").removesuffix("W").removesuffix("E"))
             line_colour = (
                 "#f083a6"
@@ -42,12 +58,7 @@ class IntraRail(RailSource):
             line = self.line(company=company, code=line_code, name=line_name, mode="warp", colour=line_colour)
 
             builder = self.builder(line)
-            for big in h4.find_next("p").find_all("big", recursive=False):  # pyrefly: ignore [missing-attribute]
-                if (big2 := big.find("big")) is None or big.find("s") is not None:
-                    continue
-                name = " ".join(big2.stripped_strings)
-                name = {"Plage Rouge Seki City": "Plage Rouge-Seki City"}.get(name, name)
-
+            for name in station_names:
                 builder.add(self.station(company=company, codes={name}, name=name))
 
             if line_code == "2X":
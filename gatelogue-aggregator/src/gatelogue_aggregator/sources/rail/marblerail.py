@@ -1,7 +1,7 @@
 import bs4
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link
+from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link, table_cells
 from gatelogue_aggregator.source import RailSource
 
 
@@ -24,13 +24,13 @@ class MarbleRail(RailSource):
             line = self.line(code=line_name, name=line_name, company=company, mode="traincarts", colour="#cc00cc")
 
             builder = self.builder(line)
-            for tr in line_table.find_all("tr"):
-                if len(tr("td")) != 5:
+            for tds in table_cells(line_table.find_all("tr")):
+                if len(tds) != 5:
                     continue
-                if tr("td")[4].string.strip() != "Opened":  # pyrefly: ignore [missing-attribute]
+                if tds[4].string.strip() != "Opened":  # pyrefly: ignore [missing-attribute]
                     continue
-                code: str = tr("td")[0].string  # pyrefly: ignore [bad-assignment]
-                name = tr("td")[1].string
+                code: str = tds[0].string  # pyrefly: ignore [bad-assignment]
+                name = tds[1].string
 
                 builder.add(self.station(codes={code}, name=name, company=company))
 
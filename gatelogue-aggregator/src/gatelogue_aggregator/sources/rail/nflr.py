@@ -1,11 +1,10 @@
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import NamedTuple
+from typing import ClassVar, NamedTuple
 
 import pandas as pd
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_csv, get_wiki_link
+from gatelogue_aggregator.downloader import Request, get_csv, get_wiki_link, prefetch
 from gatelogue_aggregator.source import RailSource
 
 
@@ -21,29 +20,27 @@ class NFLR(RailSource):
     cache: Path
     lines: list[_Line]
 
+    LINK: ClassVar[str] = (
+        "https://docs.google.com/spreadsheets/d/1ohIRZrcLZByL5feqDqgA0QeC3uwAlBKOMKxWMRTSxRw/export?format=csv&gid="
+    )
+
+    @classmethod
+    def requests(cls) -> list[Request]:
+        return [Request(cls.LINK + "1540849896", "nflr/lines")]
+
     def prepare(self, config: Config):
-        df = get_csv(
-            "https://docs.google.com/spreadsheets/d/1ohIRZrcLZByL5feqDqgA0QeC3uwAlBKOMKxWMRTSxRw/export?format=csv&gid=1540849896",
-            "nflr/lines",
-            config,
-        )
+        df = get_csv(self.LINK + "1540849896", "nflr/lines", config)
         lines = [
             (str(line_name), str(back), bool(w), int(gid))
             for line_name, back, w, gid in zip(df["line"], df["back"], df["w"], df["gid"], strict=False)
             if pd.notna(gid)
         ]
 
-        def retrieve_urls(line_name: str, line_colour: str, w: bool, gid: int) -> _Line:  # noqa: FBT001
-            dfl = get_csv(
-                "https://docs.google.com/spreadsheets/d/1ohIRZrcLZByL5feqDqgA0QeC3uwAlBKOMKxWMRTSxRw/export?format=csv&gid="
-                + str(gid),
-                "nflr/" + line_name,
-                config,
-            )
-            return _Line(line_name, line_colour, w, dfl)
-
-        with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
-            self.lines = list(executor.map(lambda s: retrieve_urls(*s), lines))
+        prefetch((Request(self.LINK + str(gid), "nflr/" + line_name) for line_name, _, _, gid in lines), config)
+        self.lines = [
+            _Line(line_name, line_colour, w, get_csv(self.LINK + str(gid), "nflr/" + line_name, config))
+            for line_name, line_colour, w, gid in lines
+        ]
 
     def build(self, config: Config):
         company = self.company(name="nFLR", link=get_wiki_link("NewRail FLR"))
@@ -9,6 +9,10 @@ class Pacifica(RailSource):
     name = "MRT Wiki (Rail, Pacifica)"
     text: str
 
+    @classmethod
+    def wiki_pages(cls) -> list[str]:
+        return ["Pacifica"]
+
     def prepare(self, config: Config):
         self.text = get_wiki_text("Pacifica", config)
 
@@ -1,7 +1,7 @@
 import bs4
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link
+from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link, table_cells
 from gatelogue_aggregator.source import RailSource
 
 
@@ -23,13 +23,13 @@ class RailNorth(RailSource):
             line = self.line(code=line_name, name=line_name, company=company, colour="#000080")
 
             builder = self.builder(line)
-            for tr in table.find_all("tr"):
-                if len(tr("td")) != 4:
+            for tds in table_cells(table.find_all("tr")):
+                if len(tds) != 4:
                     continue
-                if tr("td")[0].find("a", href="/index.php/File:Dynmap_Green_Flag.png") is None:
+                if tds[0].find("a", href="/index.php/File:Dynmap_Green_Flag.png") is None:
                     continue
-                name = " ".join(tr("td")[2].strings).strip()
-                code = next(tr("td")[1].strings)
+                name = " ".join(tds[2].strings).strip()
+                code = next(tds[1].strings)
                 builder.add(self.station(codes={code}, name=name, company=company))
 
             builder.connect()
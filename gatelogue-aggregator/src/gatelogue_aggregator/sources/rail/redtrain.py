@@ -1,35 +1,48 @@
 import bs4
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link
+from gatelogue_aggregator.downloader import get_wiki_html_derived, get_wiki_link, table_cells
 from gatelogue_aggregator.source import RailSource
 
 
 class RedTrain(RailSource):
     name = "MRT Wiki (Rail, RedTrain)"
-    html: bs4.BeautifulSoup
+    tables: list[list[tuple[str, str]]]
+    """Codes and names of the open stations in every table of stations"""
 
     def prepare(self, config: Config):
-        self.html = get_wiki_html("RedTrain", config)
+        self.tables = get_wiki_html_derived(
+            "RedTrain", config, list[list[tuple[str, str]]], self.extract, name="RedTrain stations"
+        )
+
+    @staticmethod
+    def extract(html: bs4.BeautifulSoup) -> list[list[tuple[str, str]]]:
+        tables = []
+        for table in html.find_all("table"):
+            if "Code" not in table("th")[1].string:  # pyrefly: ignore [not-iterable]
+                continue
+            stations = []
+            for tds in table_cells(table.find_all("tr")):
+                if len(tds) != 4:
+                    continue
+                if tds[0].find("a", href="/index.php/File:Dynmap_Green_Flag.png") is None:
+                    continue
+                name = " ".join(tds[2].strings).strip().removesuffix(" £")
+                code = str(next(tds[1].strings))
+                stations.append((code, name))
+            tables.append(stations)
+        return tables
 
     def build(self, config: Config):
         company = self.company(name="RedTrain", link=get_wiki_link("RedTrain"))
 
-        for table in self.html.find_all("table"):
-            if "Code" not in table("th")[1].string:  # pyrefly: ignore [not-iterable]
-                continue
+        for stations in self.tables:
             line = self.line(
                 code="Time Zones High Speed", name="Time Zones High Speed", company=company, colour="#ff0000"
             )
 
             builder = self.builder(line)
-            for tr in table.find_all("tr"):
-                if len(tr("td")) != 4:
-                    continue
-                if tr("td")[0].find("a", href="/index.php/File:Dynmap_Green_Flag.png") is None:
-                    continue
-                name = " ".join(tr("td")[2].strings).strip().removesuffix(" £")
-                code = next(tr("td")[1].strings)
+            for code, name in stations:
                 builder.add(self.station(codes={code}, name=name, company=company))
 
             builder.connect()
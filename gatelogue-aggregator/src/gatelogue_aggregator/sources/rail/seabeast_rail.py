@@ -11,6 +11,10 @@ class SeabeastRail(RailSource):
     name = "MRT Wiki (Rail, Seabeast Rail)"
     text: str
 
+    @classmethod
+    def wiki_pages(cls) -> list[str]:
+        return ["Seabeast Rail"]
+
     def prepare(self, config: Config):
         self.text = get_wiki_text("Seabeast Rail", config)
 
@@ -1,7 +1,7 @@
 import bs4
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link
+from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link, table_cells
 from gatelogue_aggregator.source import RailSource
 
 
@@ -32,10 +32,10 @@ class SEAT(RailSource):
                 continue
 
             builder = self.builder(line)
-            for tr in line_table("tr")[1:]:
-                if all("Open" not in a for a in tr("td")[3].strings):
+            for tds in table_cells(line_table("tr")[1:]):
+                if all("Open" not in a for a in tds[3].strings):
                     continue
-                name: str = tr("td")[1].string.strip().removesuffix(" Station")  # pyrefly: ignore [missing-attribute]
+                name: str = tds[1].string.strip().removesuffix(" Station")  # pyrefly: ignore [missing-attribute]
 
                 builder.add(self.station(codes={name}, name=name, company=company))
 
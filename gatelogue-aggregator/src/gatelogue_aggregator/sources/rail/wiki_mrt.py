@@ -1,4 +1,5 @@
 import re
+from typing import ClassVar
 
 from gatelogue_aggregator.config import Config
 from gatelogue_aggregator.downloader import get_wiki_text
@@ -9,42 +10,49 @@ class WikiMRT(RailSource):
     name = "MRT Wiki (Rail, MRT)"
     lines: list[tuple[str, str, str, str]]
 
+    LINES: ClassVar[tuple[tuple[str, str, str], ...]] = (
+        ("A", "MRT Arctic Line", "#00FFFF"),
+        ("B", "MRT Beach Line", "#EEDB95"),
+        ("C", "MRT Circle Line", "#5E5E5E"),
+        ("D", "MRT Desert Line", "#9437FF"),
+        ("E", "MRT Eastern Line", "#10D20F"),
+        ("F", "MRT Forest Line", "#0096FF"),
+        ("G", "MRT Garden Line", "#8A9A5B"),
+        ("H", "MRT Savannah Line", "#5B7F00"),
+        ("I", "MRT Island Line", "#FF40FF"),
+        ("J", "MRT Jungle Line", "#4C250D"),
+        ("K", "MRT Knight Line", "#74A181"),
+        ("L", "MRT Lakeshore Line", "#9B95BC"),
+        ("M", "MRT Mesa Line", "#FF8000"),
+        ("N", "MRT Northern Line", "#0433FF"),
+        ("O", "MRT Oasis Line", "#021987"),
+        ("P", "MRT Plains Line", "#008E00"),
+        ("R", "MRT Rose Line", "#FE2E9A"),
+        ("S", "MRT Southern Line", "#FFFA28"),
+        ("T", "MRT Taiga Line", "#915001"),
+        ("U", "MRT Union Line", "#2B2C35"),
+        ("V", "MRT Valley Line", "#FF8AD8"),
+        ("W", "MRT Western Line", "#FF0000"),
+        ("X", "MRT Expo Line", "#000000"),
+        ("XM", "MRT Marina Shuttle", "#000000"),
+        ("Y", "MRT Yeti Line", "#ADD8E6"),
+        ("Z", "MRT Zephyr Line", "#EEEEEE"),
+        ("Old-R", "MRT Red Line", "#FF0000"),
+        ("Old-B", "MRT Blue Line", "#0000FF"),
+        ("Old-Y", "MRT Yellow Line", "#FFFF00"),
+        ("Old-G", "MRT Green Line", "#00FF00"),
+        ("Old-O", "MRT Orange Line", "#FF8000"),
+    )
+
+    @classmethod
+    def wiki_pages(cls) -> list[str]:
+        return [line_name for _, line_name, _ in cls.LINES]
+
     def prepare(self, config: Config):
-        self.lines = []
-        for line_code, line_name, line_colour in (
-            ("A", "MRT Arctic Line", "#00FFFF"),
-            ("B", "MRT Beach Line", "#EEDB95"),
-            ("C", "MRT Circle Line", "#5E5E5E"),
-            ("D", "MRT Desert Line", "#9437FF"),
-            ("E", "MRT Eastern Line", "#10D20F"),
-            ("F", "MRT Forest Line", "#0096FF"),
-            ("G", "MRT Garden Line", "#8A9A5B"),
-            ("H", "MRT Savannah Line", "#5B7F00"),
-            ("I", "MRT Island Line", "#FF40FF"),
-            ("J", "MRT Jungle Line", "#4C250D"),
-            ("K", "MRT Knight Line", "#74A181"),
-            ("L", "MRT Lakeshore Line", "#9B95BC"),
-            ("M", "MRT Mesa Line", "#FF8000"),
-            ("N", "MRT Northern Line", "#0433FF"),
-            ("O", "MRT Oasis Line", "#021987"),
-            ("P", "MRT Plains Line", "#008E00"),
-            ("R", "MRT Rose Line", "#FE2E9A"),
-            ("S", "MRT Southern Line", "#FFFA28"),
-            ("T", "MRT Taiga Line", "#915001"),
-            ("U", "MRT Union Line", "#2B2C35"),
-            ("V", "MRT Valley Line", "#FF8AD8"),
-            ("W", "MRT Western Line", "#FF0000"),
-            ("X", "MRT Expo Line", "#000000"),
-            ("XM", "MRT Marina Shuttle", "#000000"),
-            ("Y", "MRT Yeti Line", "#ADD8E6"),
-            ("Z", "MRT Zephyr Line", "#EEEEEE"),
-            ("Old-R", "MRT Red Line", "#FF0000"),
-            ("Old-B", "MRT Blue Line", "#0000FF"),
-            ("Old-Y", "MRT Yellow Line", "#FFFF00"),
-            ("Old-G", "MRT Green Line", "#00FF00"),
-            ("Old-O", "MRT Orange Line", "#FF8000"),
-        ):
-            self.lines.append((line_code, line_name, line_colour, get_wiki_text(line_name, config)))
+        self.lines = [
+            (line_code, line_name, line_colour, get_wiki_text(line_name, config))
+            for line_code, line_name, line_colour in self.LINES
+        ]
 
     def build(self, config: Config):
         company = self.company(name="MRT")
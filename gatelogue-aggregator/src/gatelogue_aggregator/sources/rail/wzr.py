@@ -3,7 +3,7 @@ import re
 import bs4
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link, get_wiki_text
+from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link, get_wiki_text, table_cells
 from gatelogue_aggregator.source import RailSource
 
 
@@ -35,13 +35,13 @@ class WZR(RailSource):
             line = self.line(code=line_code, name=line_name, company=company, mode="warp", colour="#aa0000")
 
             builder = self.builder(line)
-            for tr in table.find_all("tr"):
-                if len(tr("td")) != 4:
+            for tds in table_cells(table.find_all("tr")):
+                if len(tds) != 4:
                     continue
-                if tr("td")[3].string.strip() == "Planned":  # pyrefly: ignore [missing-attribute]
+                if tds[3].string.strip() == "Planned":  # pyrefly: ignore [missing-attribute]
                     continue
-                code: str = tr("td")[0].string  # pyrefly: ignore [bad-assignment]
-                name = "".join(tr("td")[1].strings).strip().rstrip("*")
+                code: str = tds[0].string  # pyrefly: ignore [bad-assignment]
+                name = "".join(tds[1].strings).strip().rstrip("*")
                 builder.add(self.station(codes={code}, name=name, company=company))
 
             builder.connect()
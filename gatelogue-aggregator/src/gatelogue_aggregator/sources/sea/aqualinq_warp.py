@@ -1,7 +1,7 @@
 import pandas as pd
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_url
+from gatelogue_aggregator.downloader import get_csv
 from gatelogue_aggregator.source import SeaSource
 from gatelogue_aggregator.sources.warp_api import WarpAPI
 
@@ -11,12 +11,12 @@ class AquaLinQWarp(SeaSource):
     d: dict[str, str]
 
     def prepare(self, config: Config):
-        get_url(
+        df = get_csv(
             "https://docs.google.com/spreadsheets/d/18VPaErIgb0zOS7t8Sb4x_QwV09zFkeCM6WXL1uvIb1s/export?format=csv&gid=1793169664",
             "aqualinq",
             config,
+            header=None,
         )
-        df = pd.read_csv(config.cache_dir / "aqualinq", header=None)
         df.rename(
             columns={
                 0: "Name",
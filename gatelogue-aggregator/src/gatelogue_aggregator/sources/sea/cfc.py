@@ -10,6 +10,10 @@ class CFC(SeaSource):
     name = "MRT Wiki (Sea, Caravacan Floaty Company)"
     text: str
 
+    @classmethod
+    def wiki_pages(cls) -> list[str]:
+        return ["Caravacan Floaty Company"]
+
     def prepare(self, config: Config):
         self.text = get_wiki_text("Caravacan Floaty Company", config)
 
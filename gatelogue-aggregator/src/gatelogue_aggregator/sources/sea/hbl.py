@@ -4,38 +4,52 @@ import re
 import bs4
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link
+from gatelogue_aggregator.downloader import get_wiki_html_derived, get_wiki_link
 from gatelogue_aggregator.source import SeaSource
 
 
 class HBL(SeaSource):
     name = "MRT Wiki (Sea, Hummingbird Boat Lines)"
-    html: bs4.BeautifulSoup
+    lines: list[tuple[str | None, str | None, str, list[str]]]
+    """Code, name, colour and names of the open stops of every line"""
 
     def prepare(self, config: Config):
-        self.html = get_wiki_html("Hummingbird Boat Lines", config)
+        self.lines = get_wiki_html_derived(
+            "Hummingbird Boat Lines",
+            config,
+            list[tuple[str | None, str | None, str, list[str]]],
+            self.extract,
+            name="HBL lines",
+        )
+
+    @staticmethod
+    def extract(html: bs4.BeautifulSoup) -> list[tuple[str | None, str | None, str, list[str]]]:
+        lines = []
+        for td in html.find("table", class_="multicol").find_all("td"):  # pyrefly: ignore [missing-attribute]
+            for p, ul in zip(td.find_all("p"), td.find_all("ul"), strict=False):
+                line_code = None if (code := p.span.string or p.span.span.string) is None else str(code)
+                line_name = None if (name := p.b.string) is None else str(name)
+
+                # pyrefly: ignore [missing-attribute]
+                line_colour: str = re.match(r"background-color:\s*([^;]*)", p.span.attrs["style"]).group(1)
+
+                stop_names = ["".join(li.strings) for li in ul.find_all("li") if "Planned" not in li.strings]
+                lines.append((line_code, line_name, line_colour, stop_names))
+        return lines
 
     def build(self, config: Config):
         company = self.company(name="Hummingbird Boat Lines", link=get_wiki_link("Hummingbird Boat Lines"))
 
-        for td in self.html.find("table", class_="multicol").find_all("td"):  # pyrefly: ignore [missing-attribute]
-            for p, ul in zip(td.find_all("p"), td.find_all("ul"), strict=False):
-                line_code = p.span.string or p.span.span.string
-                line_name = p.b.string
+        for line_code, line_name, line_colour, stop_names in self.lines:
+            # pyrefly: ignore [bad-argument-type]
+            line = self.line(code=line_code, company=company, name=line_name, colour=line_colour, mode="warp ferry")
 
-                # pyrefly: ignore [missing-attribute]
-                line_colour: str = re.match(r"background-color:\s*([^;]*)", p.span.attrs["style"]).group(1)
-                line = self.line(code=line_code, company=company, name=line_name, colour=line_colour, mode="warp ferry")
-
-                docks = []
-                for li in ul.find_all("li"):
-                    if "Planned" in li.strings:
-                        continue
-                    stop_name = "".join(li.strings)
-                    stop = self.stop(codes={stop_name}, name=stop_name, company=company)
-                    docks.append(self.dock(code=line.code, stop=stop))
-
-                if len(docks) == 0:
-                    continue
-                for d1, d2 in itertools.permutations(docks, 2):
-                    self.connection(line=line, from_=d1, to=d2)
+            docks = []
+            for stop_name in stop_names:
+                stop = self.stop(codes={stop_name}, name=stop_name, company=company)
+                docks.append(self.dock(code=line.code, stop=stop))
+
+            if len(docks) == 0:
+                continue
+            for d1, d2 in itertools.permutations(docks, 2):
+                self.connection(line=line, from_=d1, to=d2)
@@ -3,7 +3,7 @@ import re
 import bs4
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link
+from gatelogue_aggregator.downloader import get_wiki_html, get_wiki_link, table_cells
 from gatelogue_aggregator.source import SeaSource
 
 
@@ -35,16 +35,16 @@ class WZF(SeaSource):
             line = self.line(code=line_code, name=line_name, company=company)
 
             builder = self.builder(line)
-            for tr in table.find_all("tr"):
-                if len(tr("td")) != 4:
+            for tds in table_cells(table.find_all("tr")):
+                if len(tds) != 4:
                     continue
-                code = next(tr("td")[1].strings)
-                name = "".join(tr("td")[2].strings)
+                code = next(tds[1].strings)
+                name = "".join(tds[2].strings)
                 if "planned" in name:
                     continue
                 builder.add(self.stop(codes={code}, name=name, company=company))
 
-                colour = tr("td")[1].attrs["style"].split(":")[1]  # pyrefly: ignore [missing-attribute]
+                colour = tds[1].attrs["style"].split(":")[1]  # pyrefly: ignore [missing-attribute]
                 line.colour = colour
 
             builder.connect()
@@ -1,49 +1,67 @@
 import gatelogue_types as gt
-import pandas as pd
+import msgspec
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_csv
+from gatelogue_aggregator.downloader import get_csv_structs
 from gatelogue_aggregator.source import Source
 
 
+class _Town(msgspec.Struct):
+    # the sheets are edited by hand, so cells are read as text to be tidied up in `TownList.build`
+    name: str | None = msgspec.field(name="Town Name", default=None)
+    rank: str | None = msgspec.field(name="Town Rank", default=None)
+    mayor: str | None = msgspec.field(name="Mayor", default=None)
+    deputy_mayor: str | None = msgspec.field(name="Deputy Mayor", default=None)
+    x: str | None = msgspec.field(name="X", default=None)
+    z: str | None = msgspec.field(name="Z", default=None)
+
+
+def _coordinate(cell: str | None) -> int | None:
+    try:
+        return None if cell is None else int(float(cell))
+    except ValueError:
+        return None
+
+
 class TownList(Source):
     name = "MRT Town List"
-    df: pd.DataFrame
+    towns: list[tuple[gt.World, _Town]]
 
     def prepare(self, config: Config):
-        df1 = get_csv(
-            "https://docs.google.com/spreadsheets/d/1JSmJtYkYrEx6Am5drhSet17qwJzOKDI7tE7FxPx4YNI/export?format=csv&gid=0",
-            "town-list1",
-            config,
-        )
-        df1["World"] = "New"
-
-        df2 = get_csv(
+        self.towns = [
+            ("New", town)
+            for town in get_csv_structs(
+                "https://docs.google.com/spreadsheets/d/1JSmJtYkYrEx6Am5drhSet17qwJzOKDI7tE7FxPx4YNI/export?format=csv&gid=0",
+                "town-list1",
+                config,
+                _Town,
+            )
+        ]
+        for town in get_csv_structs(
             "https://docs.google.com/spreadsheets/d/1JSmJtYkYrEx6Am5drhSet17qwJzOKDI7tE7FxPx4YNI/export?format=csv&gid=1533469138",
             "town-list2",
             config,
-        )
-        df2["World"] = "Old"
-        df2["Town Rank"] = "Unranked"
-        self.df = pd.concat((df1, df2))
+            _Town,
+        ):
+            town.rank = "Unranked"
+            self.towns.append(("Old", town))
 
     def build(self, config: Config):
-        for _, row in self.df.iterrows():
-            if pd.isna(row["Town Name"]):
+        for world, town in self.towns:
+            if town.name is None:
                 continue
+            # `gt.Town` strips the text cells itself
+            x, z = _coordinate(town.x), _coordinate(town.z)
             gt.Town.create(
                 self.conn,
                 self.priority,
-                name=row["Town Name"],
-                rank=row["Town Rank"]
-                if row["Town Name"] != "Arisa"
-                else "Unranked"
-                if pd.isna(row["Town Rank"])
-                else "Premier",
-                mayor=row["Mayor"] if pd.notna(row["Mayor"]) else "MRT Staff",
-                deputy_mayor=None if not row["Deputy Mayor"] or pd.isna(row["Deputy Mayor"]) else row["Deputy Mayor"],
-                world=row["World"],
-                coordinates=None if pd.isna(row["X"]) else (row["X"], row["Z"]),
+                name=town.name,
+                # pyrefly: ignore [bad-argument-type]
+                rank="Unranked" if town.rank is None else "Premier" if town.name.strip() == "Arisa" else town.rank,
+                mayor=town.mayor if town.mayor is not None else "MRT Staff",
+                deputy_mayor=town.deputy_mayor,
+                world=world,
+                coordinates=None if x is None or z is None else (x, z),
             )
 
         gt.Town.create(
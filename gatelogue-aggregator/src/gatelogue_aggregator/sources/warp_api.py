@@ -1,7 +1,5 @@
 import datetime
 from collections.abc import Iterator
-from concurrent.futures import ThreadPoolExecutor
-from math import ceil
 from typing import ClassVar
 from uuid import UUID
 
@@ -9,7 +7,7 @@ import gatelogue_types as gt
 import msgspec
 
 from gatelogue_aggregator.config import Config
-from gatelogue_aggregator.downloader import get_url
+from gatelogue_aggregator.downloader import Request, get_url, prefetch
 from gatelogue_aggregator.logging import INFO1, progress_bar
 
 
@@ -60,24 +58,31 @@ class WarpAPI:
 
     LINK: ClassVar[str] = "https://api.minecartrapidtransit.net/api/v2/warps"
 
+    @classmethod
+    def request(cls, offset: int) -> Request:
+        return Request(cls.LINK if offset == 0 else cls.LINK + f"?offset={offset}", "mrt-api/" + str(offset))
+
+    @classmethod
+    def requests(cls) -> list[Request]:
+        return [cls.request(0)]
+
     @classmethod
     def prepare(cls, config: Config):
         if len(cls.warps) != 0:
             return
 
         with progress_bar(INFO1, "Downloading warps from MRT Warp API"):
-            init_result = msgspec.json.decode(get_url(cls.LINK, "mrt-api/0", config), type=WarpAPIResult)
+            request = cls.request(0)
+            init_result = msgspec.json.decode(get_url(request.url, request.key, config), type=WarpAPIResult)
             cls.warps.extend(init_result.result)
-            with ThreadPoolExecutor(max_workers=ceil(config.max_workers / 4)) as executor:
-                for result in executor.map(
-                    lambda offset: msgspec.json.decode(
-                        get_url(cls.LINK + f"?offset={offset}", "mrt-api/" + str(offset), config), type=WarpAPIResult
-                    ),
-                    range(
-                        init_result.pagination.limit, init_result.pagination.total_hits, init_result.pagination.limit
-                    ),
-                ):
-                    cls.warps.extend(result.result)
+            offsets = range(
+                init_result.pagination.limit, init_result.pagination.total_hits, init_result.pagination.limit
+            )
+            prefetch((cls.request(offset) for offset in offsets), config)
+            for offset in offsets:
+                request = cls.request(offset)
+                result = msgspec.json.decode(get_url(request.url, request.key, config), type=WarpAPIResult)
+                cls.warps.extend(result.result)
 
     @classmethod
     def from_user(cls, uuid: str | UUID) -> Iterator[Warp]:
@@ -77,13 +77,8 @@ class Yaml2Source(Source):
             link=None if file.company_link is None else get_wiki_link(file.company_link),
         )
 
-        for codes in file.merge_codes:
-            self.S.create(
-                self.conn,
-                self.priority,
-                codes=codes,
-                company=company,  # pyrefly: ignore [bad-argument-type]
-            )
+        # pyrefly: ignore [bad-argument-type]
+        self.S.create_many(self.conn, self.priority, [dict(codes=codes, company=company) for codes in file.merge_codes])
 
         for line in file.lines:
             line_node = self.L.create(
@@ -102,6 +97,7 @@ class Yaml2Source(Source):
                 builder = self.B(self.priority, line_node)  # pyrefly: ignore [bad-argument-type]
                 one_way: dict[str, Literal["forwards", "backwards"]] = {}
                 platform_codes: dict[str, tuple[str | None, str | None]] = {}
+                stations = []
 
                 for station in route.stations:
                     if (
@@ -125,15 +121,9 @@ class Yaml2Source(Source):
                         forward_code = None if forward_code == "-" else forward_code
                         backward_code = None if backward_code == "-" else backward_code
                         platform_codes[name] = forward_code, backward_code
-                    builder.add(
-                        self.S.create(  # pyrefly: ignore [bad-argument-type]
-                            self.conn,
-                            self.priority,
-                            codes={code},
-                            name=name,
-                            company=company,  # pyrefly: ignore [bad-argument-type]
-                        )
-                    )
+                    stations.append(dict(codes={code}, name=name, company=company))
+                # pyrefly: ignore [bad-argument-type]
+                builder.add(*self.S.create_many(self.conn, self.priority, stations))
                 self.routing(
                     line_node,
                     builder,
@@ -147,15 +137,15 @@ class Yaml2Source(Source):
                     ),
                 )
 
-        for code, (x, z) in file.coords.items():
-            self.S.create(
-                self.conn,
-                self.priority,
-                codes={code},
-                company=company,  # pyrefly: ignore [bad-argument-type]
-                world=file.world,
-                coordinates=(x, z),
-            )
+        self.S.create_many(
+            self.conn,
+            self.priority,
+            # pyrefly: ignore [bad-argument-type]
+            [
+                dict(codes={code}, company=company, world=file.world, coordinates=(x, z))
+                for code, (x, z) in file.coords.items()
+            ],
+        )
 
         for set_ in file.proximity:
             for code1, code2 in itertools.combinations(set_, 2):
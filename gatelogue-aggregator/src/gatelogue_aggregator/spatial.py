@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Callable, Container, Iterable, Iterator
+
+
+class LocatedPoint(NamedTuple):
+    i: int
+    world: str
+    x: int
+    y: int
+    type: str
+
+
+def located_points(conn: sqlite3.Connection) -> list[LocatedPoint]:
+    """All located nodes with a known world (other than ``Space``) and coordinates, in one query"""
+    return [
+        LocatedPoint(*row)
+        for row in conn.execute(
+            "SELECT NodeLocation.i, world, x, y, type FROM NodeLocation "
+            "INNER JOIN Node ON NodeLocation.i = Node.i "
+            "WHERE world IS NOT NULL AND world != 'Space' AND x IS NOT NULL AND y IS NOT NULL "
+            "ORDER BY NodeLocation.i"
+        )
+    ]
+
+
+def location_sources(conn: sqlite3.Connection) -> dict[int, set[int]]:
+    """The sources of the ``world`` or ``coordinates`` of every located node, in one query"""
+    out: dict[int, set[int]] = defaultdict(set)
+    for i, source in conn.execute(
+        "SELECT DISTINCT i, source FROM NodeLocationSource WHERE world IS TRUE OR coordinates IS TRUE"
+    ):
+        out[i].add(source)
+    return out
+
+
+class SpatialGrid:
+    """Uniform grid of :py:class:`LocatedPoint` s, bucketed per world into square cells of side ``cell_size``"""
+
+    def __init__(self, points: Iterable[LocatedPoint], cell_size: int):
+        self.cell_size = cell_size
+        self.cells: dict[tuple[str, int, int], list[LocatedPoint]] = defaultdict(list)
+        for point in points:
+            self.cells[self._cell(point)].append(point)
+
+    def _cell(self, point: LocatedPoint) -> tuple[str, int, int]:
+        return point.world, point.x // self.cell_size, point.y // self.cell_size
+
+    def near(self, point: LocatedPoint, radius: float) -> Iterator[tuple[LocatedPoint, int]]:
+        """Yields every other point in the same world strictly closer than ``radius``, with its squared distance"""
+        world, cx, cy = self._cell(point)
+        reach = math.ceil(radius / self.cell_size)
+        radius_sq = radius**2
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                for other in self.cells.get((world, cx + dx, cy + dy), ()):
+                    if other.i == point.i:
+                        continue
+                    dist_sq = (point.x - other.x) ** 2 + (point.y - other.y) ** 2
+                    if dist_sq < radius_sq:
+                        yield other, dist_sq
+
+    def close_pairs(
+        self, threshold_fn: Callable[[LocatedPoint, LocatedPoint], float]
+    ) -> Iterator[tuple[LocatedPoint, LocatedPoint, int]]:
+        """Yields every pair of points closer than ``threshold_fn(point1, point2)`` exactly once, as ``(point1, point2, squared distance)`` with ``point1.i < point2.i``
+
+        ``threshold_fn`` must never return more than ``cell_size``
+        """
+        for cell_points in self.cells.values():
+            for point in cell_points:
+                for other, dist_sq in self.near(point, self.cell_size):
+                    if point.i < other.i and dist_sq < threshold_fn(point, other) ** 2:
+                        yield point, other, dist_sq
+
+
+type _KDNode = tuple[LocatedPoint, int, _KDNode | None, _KDNode | None]
+
+
+class NearestNeighbours:
+    """k-d trees of :py:class:`LocatedPoint` s per world, for nearest-neighbour queries"""
+
+    def __init__(self, points: Iterable[LocatedPoint]):
+        by_world: dict[str, list[LocatedPoint]] = defaultdict(list)
+        for point in points:
+            by_world[point.world].append(point)
+        self.trees: dict[str, _KDNode | None] = {world: self._build(pts, 0) for world, pts in by_world.items()}
+
+    @classmethod
+    def _build(cls, points: list[LocatedPoint], axis: int) -> _KDNode | None:
+        if len(points) == 0:
+            return None
+        points = sorted(points, key=lambda p: (p.x, p.y)[axis])
+        mid = len(points) // 2
+        return points[mid], axis, cls._build(points[:mid], 1 - axis), cls._build(points[mid + 1 :], 1 - axis)
+
+    def nearest(self, point: LocatedPoint, exclude: Container[int] = ()) -> tuple[LocatedPoint, int] | None:
+        """The closest other point in the same world whose ID is not in ``exclude``, with its squared distance
+
+        :return: ``None`` if there is no such point
+        """
+        best: LocatedPoint | None = None
+        best_dist_sq = math.inf
+
+        def search(node: _KDNode | None):
+            nonlocal best, best_dist_sq
+            if node is None:
+                return
+            other, axis, left, right = node
+            if other.i != point.i and other.i not in exclude:
+                dist_sq = (point.x - other.x) ** 2 + (point.y - other.y) ** 2
+                if dist_sq < best_dist_sq:
+                    best, best_dist_sq = other, dist_sq
+            diff = (point.x, point.y)[axis] - (other.x, other.y)[axis]
+            search(left if diff < 0 else right)
+            if diff**2 < best_dist_sq:
+                search(right if diff < 0 else left)
+
+        search(self.trees.get(point.world))
+        return None if best is None else (best, int(best_dist_sq))
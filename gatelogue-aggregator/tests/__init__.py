@@ -1,3 +1,435 @@
 # SPDX-FileCopyrightText: 2024-present 7d <61975820+iiiii7d@users.noreply.github.com>
 #
 # SPDX-License-Identifier: MIT
+import difflib
+import email.utils
+import random
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import gatelogue_types as gt
+import msgspec.json
+import pytest
+
+from gatelogue_aggregator import downloader
+from gatelogue_aggregator.archive import Archive, ArchivedResponse
+from gatelogue_aggregator.cache import Cache
+from gatelogue_aggregator.config import Config
+from gatelogue_aggregator.connectivity import DisjointSet
+from gatelogue_aggregator.downloader import (
+    MAX_BACKOFF,
+    WIKI_API,
+    RateLimiter,
+    _backoff,
+    archive,
+    get_csv_rows,
+    get_csv_structs,
+    get_json,
+    get_url,
+    get_wiki_text,
+    get_wiki_texts,
+    revalidate_wiki_pages,
+    wiki_text_request,
+)
+from gatelogue_aggregator.fuzzy import FuzzyIndex
+from gatelogue_aggregator.sources.town import TownList
+from gatelogue_aggregator.spatial import LocatedPoint, NearestNeighbours, SpatialGrid
+
+
+def _import_times(module: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_lazy_imports():
+    times = _import_times("gatelogue_aggregator.cli")
+    for heavy in ("pandas", "bs4", "wikitextparser", "PIL", "yaml", "gatelogue_types", "rich.progress", "asyncio"):
+        assert heavy not in times, f"{heavy} is imported with the CLI"
+
+
+def test_fuzzy_index_matches_difflib():
+    names = [
+        "Miu Wan Tseng Tsz Leng International Airport",
+        "Miu Wan Heliport",
+        "Deadbush Pioneer-Howard Airport",
+        "Hendon Coach Station",
+        "Caravaca-Juan Carlos I Airfield",
+        "Carnoustie",
+        "Bay Point",
+        "ab",
+        "ba",
+        "",
+    ]
+    index = FuzzyIndex((name, i) for i, name in enumerate(names))
+    for query in (*names, "Miu Wan Intl", "deadbush airport", "Caravaca Juan Carlos I", "aB", "zzz", "Point Bay"):
+        expected = difflib.get_close_matches(query, names, 1, 0.0)[0]
+        assert index.best(query) == (expected, names.index(expected))
+    assert FuzzyIndex([]).best("anything") is None
+
+
+def _random_points(seed: int, count: int) -> list[LocatedPoint]:
+    rng = random.Random(seed)
+    return [
+        LocatedPoint(
+            i,
+            rng.choice(("New", "Old")),
+            rng.randint(-5000, 5000),
+            rng.randint(-5000, 5000),
+            rng.choice(("AirAirport", "BusStop", "BusStop")),
+        )
+        for i in range(count)
+    ]
+
+
+def _dist_sq(point1: LocatedPoint, point2: LocatedPoint) -> int:
+    return (point1.x - point2.x) ** 2 + (point1.y - point2.y) ** 2
+
+
+def test_spatial_grid_matches_brute_force():
+    points = _random_points(3, 1000)
+
+    def threshold(point1: LocatedPoint, point2: LocatedPoint) -> float:
+        return 500 if "AirAirport" in (point1.type, point2.type) else 250
+
+    grid = SpatialGrid(points, 500)
+    expected = {
+        (point1.i, point2.i, _dist_sq(point1, point2))
+        for point1 in points
+        for point2 in points
+        if point1.i < point2.i
+        and point1.world == point2.world
+        and _dist_sq(point1, point2) < threshold(point1, point2) ** 2
+    }
+    assert {(point1.i, point2.i, dist_sq) for point1, point2, dist_sq in grid.close_pairs(threshold)} == expected
+
+    for point in points[:100]:
+        expected_near = {
+            (other.i, _dist_sq(point, other))
+            for other in points
+            if other.i != point.i and other.world == point.world and _dist_sq(point, other) < 300**2
+        }
+        assert {(other.i, dist_sq) for other, dist_sq in grid.near(point, 300)} == expected_near
+
+
+def test_nearest_neighbours_matches_brute_force():
+    points = _random_points(5, 1000)
+    rng = random.Random(5)
+    nearest = NearestNeighbours(points)
+    for point in points[:200]:
+        exclude = set(rng.sample(range(len(points)), 250))
+        candidates = [
+            _dist_sq(point, other)
+            for other in points
+            if other.i != point.i and other.world == point.world and other.i not in exclude
+        ]
+        result = nearest.nearest(point, exclude)
+        assert (None if result is None else result[1]) == min(candidates, default=None)
+        if result is not None:
+            assert result[0].world == point.world
+            assert result[0].i not in exclude
+            assert _dist_sq(point, result[0]) == result[1]
+    assert nearest.nearest(LocatedPoint(-1, "Space", 0, 0, "BusStop")) is None
+
+
+def test_disjoint_set_matches_brute_force():
+    rng = random.Random(7)
+    items = list(range(300))
+    edges = [(rng.choice(items), rng.choice(items)) for _ in range(200)]
+    edges += [(0, 1000), (1000, 1001)]
+
+    disjoint_set = DisjointSet(items)
+    disjoint_set.union_all(edges)
+
+    adjacent: dict[int, set[int]] = {item: set() for item in items}
+    for item1, item2 in edges:
+        if item1 in adjacent and item2 in adjacent:
+            adjacent[item1].add(item2)
+            adjacent[item2].add(item1)
+    expected = []
+    unvisited = set(items)
+    while unvisited:
+        component = set()
+        stack = [unvisited.pop()]
+        while stack:
+            item = stack.pop()
+            component.add(item)
+            stack.extend(adjacent[item] - component)
+        unvisited -= component
+        expected.append(component)
+
+    assert sorted(map(sorted, disjoint_set.components())) == sorted(map(sorted, expected))
+    for component in expected:
+        assert len({disjoint_set.find(item) for item in component}) == 1
+    largest = max(expected, key=len)
+    assert sorted(map(sorted, disjoint_set.isolated())) == sorted(sorted(c) for c in expected if c is not largest)
+    assert not disjoint_set.union(0, 1000)
+
+
+def test_rate_limiter():
+    limiter = RateLimiter()
+    assert limiter.reserve("a", 2) == 0
+    assert limiter.reserve("a", 2) == 0
+    assert 0.4 < limiter.reserve("a", 2) <= 0.5
+    assert 0.9 < limiter.reserve("a", 2) <= 1
+    assert limiter.reserve("b", 2) == 0
+
+    limiter.pause("b", 10)
+    limiter.pause("b", 5)
+    assert 9 < limiter.reserve("b", 2) <= 10
+    assert 9 < limiter.reserve("b", 0) <= 10
+    assert limiter.reserve("c", 0) == 0
+    assert limiter.reserve("c", 0) == 0
+
+
+def test_backoff():
+    config = Config(cooldown=10)
+    assert _backoff(1, config, b"120") == 120
+    assert _backoff(1, config, b" 7 ") == 7
+    assert _backoff(1, config, str(MAX_BACKOFF * 2).encode()) == MAX_BACKOFF
+
+    in_a_minute = email.utils.format_datetime(datetime.now(UTC) + timedelta(seconds=60), usegmt=True)
+    assert 55 < _backoff(1, config, in_a_minute.encode()) <= 60
+    in_a_day = email.utils.format_datetime(datetime.now(UTC) + timedelta(days=1), usegmt=True)
+    assert _backoff(1, config, in_a_day.encode()) == MAX_BACKOFF
+    a_minute_ago = email.utils.format_datetime(datetime.now(UTC) - timedelta(seconds=60), usegmt=True)
+    assert _backoff(1, config, a_minute_ago.encode()) == 0
+
+    for attempt, delay in ((1, 10), (2, 20), (3, 40), (10, MAX_BACKOFF)):
+        for retry_after in (None, b"soon"):
+            assert delay / 2 <= _backoff(attempt, config, retry_after) <= delay
+
+
+def _stub_session(monkeypatch, *responses: tuple[int, str]) -> list[dict[str, str]]:
+    """Answers every request with the next of ``responses`` instead of the network,
+    and returns the headers of the requests made"""
+    requests = []
+    remaining = iter(responses)
+
+    def get(_url, *, timeout, headers):  # noqa: ARG001
+        requests.append(headers)
+        status, text = next(remaining)
+        return SimpleNamespace(status=SimpleNamespace(as_int=lambda: status), text=lambda _: text, headers={})
+
+    monkeypatch.setattr(downloader, "SESSION", SimpleNamespace(get=get))
+    return requests
+
+
+def test_get_json_revalidates_etag(tmp_path, monkeypatch):
+    config = Config(cache_dir=tmp_path / "cache", cooldown=0, rate_limit=0)
+    cache = Cache.of(config.cache_dir)
+    cache.put("a", "https://example.com/a", '{"a": 1}', b'"v1"', time.time() - 1)
+
+    requests = _stub_session(monkeypatch, (304, ""))
+    assert get_json("https://example.com/a", "a", config) == {"a": 1}
+    assert requests == [{"If-None-Match": '"v1"'}]
+    entry = cache.entry("a")
+    assert entry is not None
+    assert entry.until is not None
+    assert entry.until > time.time()
+
+    requests = _stub_session(monkeypatch, (200, "not json"), (200, '{"a": 2}'))
+    cache.put("a", "https://example.com/a", '{"a": 1}', None, time.time() - 1)
+    assert get_json("https://example.com/a", "a", config) == {"a": 2}
+    assert len(requests) == 2
+
+
+def test_error_responses_are_not_cached(tmp_path, monkeypatch):
+    config = Config(cache_dir=tmp_path / "cache", cooldown=0, rate_limit=0, max_attempts=2)
+    cache = Cache.of(config.cache_dir)
+    cache.put("a", "https://example.com/a", '{"a": 1}', None, time.time() - 1)
+
+    requests = _stub_session(monkeypatch, (503, ""), (200, ""))
+    assert get_json("https://example.com/a", "a", config) == {"a": 1}
+    assert len(requests) == 2
+    entry = cache.entry("a")
+    assert entry is not None
+    assert cache.read(entry) == '{"a": 1}'
+
+    requests = _stub_session(monkeypatch, (404, "not found"))
+    with pytest.raises(ValueError, match="404"):
+        get_url("https://example.com/b", "b", config)
+    assert len(requests) == 1
+    assert cache.entry("b") is None
+
+
+def test_cache_prune(tmp_path):
+    cache = Cache(tmp_path)
+    cache.put("a", "https://example.com/a", "body", None, None)
+    cache.put("b", "https://example.com/b", "body", None, None)
+    cache.put("c", "https://example.com/c", "other body", None, None)
+    a, b, c = cache.entry("a"), cache.entry("b"), cache.entry("c")
+    assert a is not None
+    assert b is not None
+    assert c is not None
+    assert a.hash == b.hash
+    assert cache.stats()[:3] == (3, 2, 18)
+    cache.put_derived(c.hash, "name", b"data")
+
+    now = time.time()
+    for key, age in (("a", 300), ("b", 200), ("c", 100)):
+        cache.conn.execute("UPDATE Entry SET accessed = ? WHERE key = ?", (now - age, key))
+    assert cache.prune(max_age=250) == 1
+    assert cache.entry("a") is None
+    assert cache.read(b) == "body"
+    assert cache.stats()[:2] == (2, 2)
+
+    assert cache.prune(max_size=len("other body")) == 1
+    assert cache.entry("c") is None
+    assert cache.stats()[:3] == (1, 1, 4)
+    assert cache.conn.execute("SELECT count(*) FROM Derived").fetchone()[0] == 0
+
+    assert cache.prune(max_size=0) == 1
+    assert cache.stats()[:2] == (0, 0)
+
+
+def test_revalidate_wiki_pages(tmp_path):
+    config = Config(cache_dir=tmp_path / "cache")
+    cache = Cache.of(config.cache_dir)
+    for page, revision in (("Main_Page", 10), ("Changed", 5), ("Missing", 3)):
+        url, key, _ = wiki_text_request(page)
+        text = msgspec.json.encode({"parse": {"title": page, "revid": revision, "wikitext": ""}}).decode()
+        cache.put(key, url, text, None, time.time() - 1)
+
+    url = (
+        f"{WIKI_API}?action=query&prop=revisions&rvprop=ids&formatversion=2&format=json"
+        "&titles=Main_Page%7CChanged%7CMissing"
+    )
+    revisions = {
+        "query": {
+            "normalized": [{"from": "Main_Page", "to": "Main Page"}],
+            "pages": [
+                {"title": "Main Page", "revisions": [{"revid": 10}]},
+                {"title": "Changed", "revisions": [{"revid": 6}]},
+                {"title": "Missing", "missing": True},
+            ],
+        }
+    }
+    with Archive(tmp_path / "archive.zip", recording=True) as a:
+        a.put(url, ArchivedResponse(200, msgspec.json.encode(revisions).decode(), None))
+
+    with archive(tmp_path / "archive.zip", recording=False):
+        assert revalidate_wiki_pages(config) == 1
+    assert {entry.key for entry in cache.expired()} == {"wiki-text/Changed", "wiki-text/Missing"}
+
+
+def test_get_wiki_texts(tmp_path):
+    config = Config(cache_dir=tmp_path / "cache")
+    url, key, _ = wiki_text_request("Cached")
+    text = msgspec.json.encode({"parse": {"title": "Cached", "revid": 1, "wikitext": "cached text"}}).decode()
+    Cache.of(config.cache_dir).put(key, url, text, None, time.time() + 60)
+
+    url = (
+        f"{WIKI_API}?action=query&prop=revisions&rvprop=ids%7Ccontent&rvslots=main&formatversion=2&format=json"
+        "&titles=Main_Page%7COther%7CMissing"
+    )
+    pages = {
+        "query": {
+            "normalized": [{"from": "Main_Page", "to": "Main Page"}],
+            "pages": [
+                {
+                    "title": "Main Page",
+                    "pageid": 1,
+                    "revisions": [{"revid": 10, "slots": {"main": {"content": "main"}}}],
+                },
+                {"title": "Other", "pageid": 2, "revisions": [{"revid": 20, "slots": {"main": {"content": "other"}}}]},
+                {"title": "Missing", "missing": True},
+            ],
+        }
+    }
+    with Archive(tmp_path / "archive.zip", recording=True) as a:
+        a.put(url, ArchivedResponse(200, msgspec.json.encode(pages).decode(), None))
+
+    with archive(tmp_path / "archive.zip", recording=False):
+        texts = get_wiki_texts(["Main_Page", "Cached", "Other", "Missing", "Other"], config)
+        assert texts == {"Main_Page": "main", "Cached": "cached text", "Other": "other"}
+        # cached as if downloaded one by one, so these are not requested again
+        assert get_wiki_text("Main_Page", config) == "main"
+        assert get_wiki_text("Other", config) == "other"
+
+
+def test_archive_round_trip(tmp_path):
+    responses = {
+        "https://example.com/a": ArchivedResponse(200, "a", b'"etag"'),
+        "https://example.com/b": ArchivedResponse(404, "not found", None),
+    }
+    with Archive(tmp_path / "archive.zip", recording=True) as a:
+        for url, response in responses.items():
+            a.put(url, response)
+        a.put("https://example.com/a", ArchivedResponse(200, "changed", None))
+        assert len(a) == 2
+
+    with Archive(tmp_path / "archive.zip", recording=False) as a:
+        assert len(a) == 2
+        assert dict(a.responses()) == responses
+        assert a.get("https://example.com/b") == responses["https://example.com/b"]
+        with pytest.raises(LookupError):
+            a.get("https://example.com/c")
+
+    config = Config(cache_dir=tmp_path / "cache")
+    with archive(tmp_path / "archive.zip", recording=False):
+        assert get_url("https://example.com/a", "a", config) == "a"
+
+
+class _CSVRow(msgspec.Struct):
+    name: str | None = msgspec.field(name="Name", default=None)
+    count: int = msgspec.field(name="Count", default=0)
+    note: str | None = msgspec.field(name="Note", default=None)
+
+
+def test_get_csv(tmp_path):
+    config = Config(cache_dir=tmp_path / "cache")
+    text = "Title,,\n\nName,Count,Note\nA,1,x\n\nB,,\nC,3\n,,\n"
+    Cache.of(config.cache_dir).put("csv", "https://example.com/csv", text, None, time.time() + 60)
+
+    assert list(get_csv_rows("https://example.com/csv", "csv", config)) == [
+        ["Title", "", ""],
+        ["Name", "Count", "Note"],
+        ["A", "1", "x"],
+        ["B", "", ""],
+        ["C", "3"],
+        ["", "", ""],
+    ]
+    assert list(get_csv_rows("https://example.com/csv", "csv", config, skip=3)) == [
+        ["B", "", ""],
+        ["C", "3"],
+        ["", "", ""],
+    ]
+    assert list(get_csv_structs("https://example.com/csv", "csv", config, _CSVRow, header=1)) == [
+        _CSVRow("A", 1, "x"),
+        _CSVRow("B"),
+        _CSVRow("C", 3),
+        _CSVRow(),
+    ]
+
+
+def test_town_list_tidies_cells(tmp_path, monkeypatch):
+    config = Config(cache_dir=tmp_path / "cache")
+    cache = Cache.of(config.cache_dir)
+    text = "Town Name,Town Rank,Mayor,Deputy Mayor,X,Z\n Padded ,Mayor , Someone ,, 12,-3.0\nNowhere,,,,?,\n"
+    cache.put("town-list1", "https://example.com/town-list1", text, None, time.time() + 60)
+    cache.put("town-list2", "https://example.com/town-list2", "Town Name,X,Z\n", None, time.time() + 60)
+
+    gd = gt.GD.create([TownList.name])
+    monkeypatch.setattr(TownList, "priority", 0)
+    TownList(config, gd.conn).build(config)
+    towns = {town.name: town for town in gd.nodes(gt.Town)}
+    assert towns["Padded"].rank == "Mayor"
+    assert towns["Padded"].mayor == "Someone"
+    assert towns["Padded"].coordinates == (12, -3)
+    assert towns["Nowhere"].rank == "Unranked"
+    assert towns["Nowhere"].mayor == "MRT Staff"
+    assert towns["Nowhere"].coordinates is None
@@ -30,8 +30,12 @@ To retrieve the data:
 
    # for both .get() and .get_async(), you can make it retrieve a version with sources.
    gd = gt.GD.get(sources=True)
+   # or build indices for faster queries after loading, at the cost of a slower load.
+   gd = gt.GD.get(indices=True)
+   # or cache rows read via the ORM, so that each node's attributes are loaded once.
+   gd = gt.GD.get(row_cache=True)
 
-Using the ORM does not require SQL and makes for generally clean code. However, doing this is very inefficient as each attribute access is one SQL query.
+Using the ORM does not require SQL and makes for generally clean code. However, doing this is very inefficient as each attribute access is one SQL query, unless the row cache is enabled.
 
 .. code-block:: python
 
@@ -39,6 +43,15 @@ Using the ORM does not require SQL and makes for generally clean code. However,
        for gate in airport.gates:
            print(f"Airport {airport.code} has gate {gate.code}")
 
+For read-only traversal of large parts of the data, take a snapshot instead. It loads every node into plain records in one go, with relationships already resolved.
+
+.. code-block:: python
+
+   snapshot = gd.snapshot()
+   for airport in snapshot.nodes_of(gt.snapshot.AirAirport):
+       for gate in airport.gates:
+           print(f"Airport {airport.code} has gate {gate.code}")
+
 Querying the underlying SQLite database directly with ``sqlite3`` is generally more efficient and faster. It is also the only way to access the ``*Source`` tables, if you retrieved the database with those.
 
 .. code-block:: python
@@ -55,6 +68,7 @@ Usage of these methods are discouraged. These are not used in normal use 99% of
 
 from __future__ import annotations
 
+import contextlib
 import datetime
 import sqlite3
 from typing import (
@@ -63,7 +77,7 @@ from typing import (
 )
 
 from gatelogue_types.__about__ import __data_version__, __version__
-from gatelogue_types._util import _sql
+from gatelogue_types._util import _Connection, _row_cache, _RowCache, _sql
 from gatelogue_types.air import AirAirline, AirAirport, Aircraft, AirFlight, AirGate, AirMode
 from gatelogue_types.bus import BusBerth, BusCompany, BusConnection, BusLine, BusMode, BusStop
 from gatelogue_types.node import LocatedNode, Node, Proximity, SharedFacility, World
@@ -76,6 +90,7 @@ from gatelogue_types.rail import (
     RailStation,
 )
 from gatelogue_types.sea import SeaCompany, SeaConnection, SeaDock, SeaLine, SeaMode, SeaStop
+from gatelogue_types.snapshot import Snapshot
 from gatelogue_types.spawn_warp import SpawnWarp, WarpType
 from gatelogue_types.town import Rank, Town
 
@@ -117,6 +132,7 @@ __all__ = (
     "SeaMode",
     "SeaStop",
     "SharedFacility",
+    "Snapshot",
     "SpawnWarp",
     "Town",
     "WarpType",
@@ -134,36 +150,61 @@ class GD:
     conn: sqlite3.Connection
     """Connection to the underlying SQL database"""
 
-    def __init__(self, database: str | bytes | PathLike[str] | PathLike[bytes] = ":memory:"):
+    def __init__(
+        self, database: str | bytes | PathLike[str] | PathLike[bytes] = ":memory:", *, row_cache: bool = False
+    ):
+        """If ``row_cache`` is ``True``, enable the row cache (see :py:meth:`enable_row_cache`)"""
         sqlite3.threadsafety = 3
-        self.conn = sqlite3.connect(database, check_same_thread=False, autocommit=True)
+        self.conn = sqlite3.connect(database, check_same_thread=False, autocommit=True, factory=_Connection)
         self.conn.execute("PRAGMA foreign_keys = true")
+        if row_cache:
+            self.enable_row_cache()
 
     @classmethod
-    def from_bytes(cls, data: bytes) -> Self:
-        self = cls()
+    def from_bytes(cls, data: bytes, *, indices: bool = False, row_cache: bool = False) -> Self:
+        """If ``indices`` is ``True``, also build indices with :py:meth:`create_indices`"""
+        self = cls(row_cache=row_cache)
         self.conn.deserialize(data)
+        if indices:
+            self.create_indices()
         return self
 
     @classmethod
-    def from_bytes_readonly(cls, data: bytes) -> Self:
-        self = cls()
+    def from_bytes_readonly(cls, data: bytes, *, indices: bool = False, row_cache: bool = False) -> Self:
+        """If ``indices`` is ``True``, also build indices with :py:meth:`create_indices`"""
+        self = cls(row_cache=row_cache)
         self.conn.deserialize(data)
+        if indices:
+            self.create_indices()
         self.conn.execute("PRAGMA query_only = true")
         return self
 
     @classmethod
-    def get(cls, *, sources: bool = False, getter: Callable[[str], bytes] | None = None):
+    def get(
+        cls,
+        *,
+        sources: bool = False,
+        indices: bool = False,
+        row_cache: bool = False,
+        getter: Callable[[str], bytes] | None = None,
+    ):
         getter = getter or GD.Getters.urllib
-        return cls.from_bytes(getter(URL if sources else URL_NO_SOURCES))
+        return cls.from_bytes(getter(URL if sources else URL_NO_SOURCES), indices=indices, row_cache=row_cache)
 
     @classmethod
-    async def get_async(cls, *, sources: bool = False, getter: Callable[[str], Awaitable[bytes]] | None = None):
+    async def get_async(
+        cls,
+        *,
+        sources: bool = False,
+        indices: bool = False,
+        row_cache: bool = False,
+        getter: Callable[[str], Awaitable[bytes]] | None = None,
+    ):
         async def _default(url: str):
             return GD.Getters.urllib(url)
 
         getter = getter or _default
-        return cls.from_bytes(await getter(URL if sources else URL_NO_SOURCES))
+        return cls.from_bytes(await getter(URL if sources else URL_NO_SOURCES), indices=indices, row_cache=row_cache)
 
     class Getters:
         @staticmethod
@@ -250,6 +291,7 @@ class GD:
             cur.executemany("INSERT INTO Source (priority, name) VALUES (?, ?)", list(enumerate(sources)))
         else:
             self.drop_sources(cur)
+        self.create_indices(cur)
         self.conn.commit()
         return self
 
@@ -258,6 +300,110 @@ class GD:
         cur = cur or self.conn.cursor()
         cur.executescript(_sql("drop_sources"))
 
+    def create_indices(self, cur: sqlite3.Cursor | None = None):
+        """Create indices on the columns that queries commonly filter or join on, including the ``*Source`` tables if any.
+        Distributed databases do not come with them, so build them if you are doing many queries"""
+        cur = cur or self.conn.cursor()
+        cur.executescript(_sql("create_indices"))
+        if self.has_sources:
+            cur.executescript(_sql("create_source_indices"))
+
+    def drop_indices(self, cur: sqlite3.Cursor | None = None):
+        """Drop all indices created by :py:meth:`create_indices`"""
+        cur = cur or self.conn.cursor()
+        cur.executescript(_sql("drop_indices"))
+
+    def extend(self, other: GD):
+        """Internal Use. Copies all nodes of ``other`` into this database, shifting their IDs past those already used.
+        ``other`` must have been created with the same sources and aircraft"""
+        cur = self.conn.cursor()
+        cur.execute("ATTACH DATABASE ':memory:' AS staging")
+        try:
+            self.conn.deserialize(other.conn.serialize(), name="staging")
+            (offset,) = cur.execute(
+                "SELECT coalesce((SELECT seq FROM main.sqlite_sequence WHERE name = 'Node'), 0)"
+            ).fetchone()
+            tables = [
+                table
+                for (table,) in cur.execute(
+                    "SELECT name FROM staging.sqlite_schema WHERE type = 'table' "
+                    "AND name NOT IN ('sqlite_sequence', 'Metadata', 'Source', 'Aircraft') ORDER BY rowid"
+                ).fetchall()
+            ]
+
+            cur.execute("BEGIN")
+            cur.execute("PRAGMA defer_foreign_keys = true")
+            for table in tables:
+                node_columns = {
+                    column
+                    for _, _, _, column, ref_column, *_ in cur.execute(
+                        f"PRAGMA staging.foreign_key_list({table})"
+                    ).fetchall()
+                    if ref_column in ("i", "node1", "node2")
+                }
+                if table == "Node":
+                    node_columns.add("i")
+                columns = [f'"{column}"' for _, column, *_ in cur.execute(f"PRAGMA staging.table_info({table})")]
+                values = [f"{column} + :offset" if column[1:-1] in node_columns else column for column in columns]
+                cur.execute(
+                    f"INSERT INTO main.{table} ({', '.join(columns)}) SELECT {', '.join(values)} FROM staging.{table}",
+                    dict(offset=offset),
+                )
+            (staged,) = cur.execute(
+                "SELECT coalesce((SELECT seq FROM staging.sqlite_sequence WHERE name = 'Node'), 0)"
+            ).fetchone()
+            cur.execute("DELETE FROM main.sqlite_sequence WHERE name = 'Node'")
+            cur.execute("INSERT INTO main.sqlite_sequence (name, seq) VALUES ('Node', :seq)", dict(seq=offset + staged))
+            cur.execute("COMMIT")
+        finally:
+            if self.conn.in_transaction:
+                cur.execute("ROLLBACK")
+            cur.execute("DETACH DATABASE staging")
+            self.clear_row_cache()
+
+    def enable_row_cache(self):
+        """Cache every row read through the ORM, so that each node's attributes cost one query per table.
+        Writes through the ORM keep the cache up to date, but writes through raw SQL do not,
+        so call :py:meth:`clear_row_cache` after those"""
+        if _row_cache(self.conn) is None:
+            self.conn.row_cache = _RowCache()  # pyrefly: ignore[missing-attribute]
+
+    def disable_row_cache(self):
+        self.conn.row_cache = None  # pyrefly: ignore[missing-attribute]
+
+    def clear_row_cache(self):
+        if (cache := _row_cache(self.conn)) is not None:
+            cache.clear()
+
+    def tune_for_writes(self):
+        """Internal Use. Sets PRAGMAs that trade durability for write speed,
+        for databases that can be rebuilt if the process crashes midway"""
+        cur = self.conn.cursor()
+        cur.execute("PRAGMA journal_mode = MEMORY")
+        cur.execute("PRAGMA synchronous = OFF")
+        cur.execute("PRAGMA temp_store = MEMORY")
+        cur.execute("PRAGMA cache_size = -65536")
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Internal Use. Runs everything in the block in one transaction, rolling it back if the block raises.
+        Blocks nested in another block join the outer transaction"""
+        if self.conn.in_transaction:
+            yield
+            return
+        self.conn.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def snapshot(self) -> Snapshot:
+        """Load every node into read-only records, see :py:mod:`gatelogue_types.snapshot`"""
+        return Snapshot(self.conn)
+
     def get_node[T: Node = Node](self, i: int, ty: type[T] | None = None) -> T:
         """Get a single node
 
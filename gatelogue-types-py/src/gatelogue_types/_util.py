@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import contextlib
 import re
+import sqlite3
 import warnings
+from collections import defaultdict
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal, LiteralString, cast
+from typing import TYPE_CHECKING, Any, Literal, LiteralString, NamedTuple, cast
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterator
+    from collections.abc import Callable, Iterable, Iterator
 
     from gatelogue_types import Aircraft
     from gatelogue_types.node import Node
@@ -56,8 +59,7 @@ def _format_code[T: str](s: T | None) -> T | None:
     return res  # pyrefly: ignore[bad-return]
 
 
-def _warn_clash(
-    warn_fn: Callable[[str], object],
+def _clash_message(
     column: str,
     table: str,
     str_instance1: str,
@@ -67,8 +69,8 @@ def _warn_clash(
     self_sources: set[int],
     other_sources: set[int],
     priority: Literal["former", "latter"],
-):
-    warn_fn(
+) -> str:
+    return (
         f"{column} in table {table} is different "
         f"between {str_instance1} ({self_v}) and {str_instance2} ({other_v}). "
         + (
@@ -79,10 +81,158 @@ def _warn_clash(
     )
 
 
+def _warn_clash(
+    warn_fn: Callable[[str], object],
+    column: str,
+    table: str,
+    str_instance1: str,
+    self_v,
+    str_instance2: str,
+    other_v,
+    self_sources: set[int],
+    other_sources: set[int],
+    priority: Literal["former", "latter"],
+):
+    warn_fn(
+        _clash_message(
+            column, table, str_instance1, self_v, str_instance2, other_v, self_sources, other_sources, priority
+        )
+    )
+
+
+class _Clash(NamedTuple):
+    """A difference in value found while merging the nodes ``i1`` and ``i2``"""
+
+    i1: int
+    i2: int
+    column: str
+    table: str
+    self_v: Any
+    other_v: Any
+    self_sources: set[int]
+    other_sources: set[int]
+    priority: Literal["former", "latter"]
+
+
+type _Write = tuple[str, list[tuple] | None]
+"""A statement to run once a round of merges has been read, with its ``executemany`` parameters if any"""
+
+
+class _RowCache:
+    """Identity map of the full rows of nodes keyed by ``(table, i)``, and of the values of set attributes"""
+
+    def __init__(self):
+        self.rows: dict[tuple[str, int], dict[str, Any]] = {}
+        self.sets: dict[tuple[str, str, int], frozenset] = {}
+
+    def row(self, conn: sqlite3.Connection, table: str, i: int) -> dict[str, Any] | None:
+        if (row := self.rows.get((table, i))) is not None:
+            return row
+        cur = conn.execute(f"SELECT * FROM {table} WHERE i = :i", dict(i=i))
+        if (values := cur.fetchone()) is None:
+            return None
+        row = self.rows[table, i] = {name: value for (name, *_), value in zip(cur.description, values, strict=True)}
+        return row
+
+    def values(self, conn: sqlite3.Connection, table: str, column: str, i: int) -> frozenset:
+        if (values := self.sets.get((table, column, i))) is not None:
+            return values
+        values = self.sets[table, column, i] = frozenset(
+            v for (v,) in conn.execute(f"SELECT {column} FROM {table} WHERE i = :i", dict(i=i)).fetchall()
+        )
+        return values
+
+    def clear(self):
+        self.rows.clear()
+        self.sets.clear()
+
+
+class _Connection(sqlite3.Connection):
+    """Connection that may carry a :py:class:`_RowCache` for the node attributes read through it"""
+
+    row_cache: _RowCache | None = None
+
+
+def _row_cache(conn: sqlite3.Connection) -> _RowCache | None:
+    return getattr(conn, "row_cache", None)
+
+
+@contextlib.contextmanager
+def _row_cache_suspended(conn: sqlite3.Connection) -> Iterator[None]:
+    """Bypasses the row cache of ``conn`` for operations that write with raw SQL, and clears it afterwards"""
+    if (cache := _row_cache(conn)) is None:
+        yield
+        return
+    conn.row_cache = None  # pyrefly: ignore[missing-attribute]
+    try:
+        yield
+    finally:
+        conn.row_cache = cache  # pyrefly: ignore[missing-attribute]
+        cache.clear()
+
+
 def _sql(key: str) -> str:
     return (Path(__file__).parent / "sql" / (key + ".sql")).read_text()
 
 
+def _group_ids(conn: sqlite3.Connection, query: str) -> list[list[int]]:
+    """Runs a query returning one ``group_concat`` of IDs per row, and returns each group sorted"""
+    return [sorted(int(i) for i in group.split(",")) for (group,) in conn.execute(query).fetchall()]
+
+
+def _join_overlapping(groups: Iterable[Iterable[int]]) -> list[list[int]]:
+    """Joins groups that share at least one member, and returns each joined group sorted"""
+    parent: dict[int, int] = {}
+
+    def find(i: int) -> int:
+        while (p := parent.setdefault(i, i)) != i:
+            parent[i] = parent[p]
+            i = parent[i]
+        return i
+
+    for group in groups:
+        first, *rest = group
+        for i in rest:
+            parent[find(i)] = find(first)
+
+    out: dict[int, list[int]] = {}
+    for i in sorted(parent):
+        out.setdefault(find(i), []).append(i)
+    return [group for group in out.values() if len(group) > 1]
+
+
+def _resolve_merge_pairs(pairs: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Rewrites ``(keep, drop)`` pairs to refer to the nodes that their IDs were merged into by earlier pairs"""
+    merged_into: dict[int, int] = {}
+
+    def resolve(i: int) -> int:
+        while i in merged_into:
+            i = merged_into[i]
+        return i
+
+    out = []
+    for i1, i2 in pairs:
+        i1, i2 = resolve(i1), resolve(i2)  # noqa: PLW2901
+        out.append((i1, i2))
+        if i1 != i2:
+            merged_into[i2] = i1
+    return out
+
+
+def _merge_rounds(pairs: Iterable[tuple[int, int, int]]) -> list[list[tuple[int, int, int]]]:
+    """Splits ``(index, keep, drop)`` merges into rounds in which every node appears at most once,
+    with every merge placed after all earlier merges of the same nodes"""
+    last_round: dict[int, int] = {}
+    rounds: list[list[tuple[int, int, int]]] = []
+    for index, i1, i2 in pairs:
+        round_ = max(last_round.get(i1, -1), last_round.get(i2, -1)) + 1
+        last_round[i1] = last_round[i2] = round_
+        if round_ == len(rounds):
+            rounds.append([])
+        rounds[round_].append((index, i1, i2))
+    return rounds
+
+
 class _Column[T]:
     def __init__(
         self,
@@ -93,11 +243,15 @@ class _Column[T]:
         formatter: Callable[[T | None], T | None] | None = None,
     ):
         self.name = f'"{name}"'
+        self.column = name
         self.table = table
         self.sourced = sourced
         self.formatter = formatter
 
     def __get__(self, instance: Node, owner: type[Node]) -> T:
+        if (cache := _row_cache(instance.conn)) is not None:
+            row = cache.row(instance.conn, self.table, instance.i)
+            return row[self.column]  # pyrefly: ignore[unsupported-operation]
         return instance.conn.execute(
             f"SELECT {self.name} FROM {self.table} WHERE i = :i", dict(i=instance.i)
         ).fetchone()[0]
@@ -109,6 +263,8 @@ class _Column[T]:
         cur = instance.conn.cursor()
         old_value = self.__get__(instance, type(instance)) if self.sourced else None
         cur.execute(f"UPDATE {self.table} SET {self.name} = :value WHERE i = :i", dict(value=value, i=instance.i))
+        if (cache := _row_cache(instance.conn)) is not None:
+            cache.rows.pop((self.table, instance.i), None)
         if not self.sourced:
             return
         if value != old_value:
@@ -217,12 +373,104 @@ class _Column[T]:
                         )
                     self.__set__(instance1, (other_sources, other_v))
 
+    def _merge_many(
+        self, conn: sqlite3.Connection, node_sources: dict[int, set[int]]
+    ) -> tuple[list[_Clash], list[_Write]]:
+        """Bulk version of :py:meth:`_merge` over the ``MergePair`` table, returning the writes to make"""
+        rows = conn.execute(
+            f"SELECT MergePair.i1, MergePair.i2, A.{self.name}, B.{self.name} FROM MergePair "
+            f"INNER JOIN {self.table} A ON A.i = MergePair.i1 "
+            f"INNER JOIN {self.table} B ON B.i = MergePair.i2 "
+            f"WHERE A.{self.name} IS NOT B.{self.name}"
+        ).fetchall()
+        clashes: list[_Clash] = []
+        if not self.sourced:
+            updates = []
+            for i1, i2, self_v, other_v in rows:
+                self_sources = node_sources[i1]
+                other_sources = node_sources[i2]
+                priority = "former" if min(self_sources) < min(other_sources) else "latter"
+                if self_sources != other_sources:
+                    clashes.append(
+                        _Clash(
+                            i1,
+                            i2,
+                            "Column " + self.name,
+                            self.table,
+                            self_v,
+                            other_v,
+                            self_sources,
+                            other_sources,
+                            priority,
+                        )
+                    )
+                if priority == "latter":
+                    updates.append((self.formatter(other_v) if self.formatter is not None else other_v, i1))
+            return clashes, [(f"UPDATE {self.table} SET {self.name} = ? WHERE i = ?", updates)]
+
+        column_sources: dict[int, set[int]] = defaultdict(set)
+        for i, src in conn.execute(
+            f"SELECT i, source FROM {self.table + 'Source'} WHERE {self.name} = true "
+            "AND i IN (SELECT i1 FROM MergePair UNION SELECT i2 FROM MergePair)"
+        ).fetchall():
+            column_sources[i].add(src)
+        sets: list[tuple[int, T | None, set[int], T]] = []
+        for i1, i2, self_v, other_v in rows:
+            if other_v is None:
+                continue
+            if self_v is None:
+                sets.append((i1, self_v, column_sources[i2], other_v))
+                continue
+            self_sources = column_sources[i1]
+            other_sources = column_sources[i2]
+            priority = "former" if min(self_sources) < min(other_sources) else "latter"
+            if self_sources != other_sources:
+                clashes.append(
+                    _Clash(
+                        i1,
+                        i2,
+                        "Column " + self.name,
+                        self.table,
+                        self_v,
+                        other_v,
+                        self_sources,
+                        other_sources,
+                        priority,
+                    )
+                )
+            if priority == "latter":
+                sets.append((i1, self_v, other_sources, other_v))
+
+        updates = []
+        resets = []
+        upserts = []
+        for i, old_value, srcs, value in sets:
+            if self.formatter is not None:
+                value = self.formatter(value)  # noqa: PLW2901
+            updates.append((value, i))
+            if value != old_value:
+                resets.append((i,))
+            upserts.extend((i, src, value is not None) for src in srcs)
+        return clashes, [
+            (f"UPDATE {self.table} SET {self.name} = ? WHERE i = ?", updates),
+            (f"UPDATE {self.table + 'Source'} SET {self.name} = false WHERE i = ?", resets),
+            (
+                f"INSERT INTO {self.table + 'Source'} (i, source, {self.name}) VALUES (?1, ?2, ?3) "
+                f"ON CONFLICT (i, source) DO UPDATE SET {self.name} = ?3",
+                upserts,
+            ),
+        ]
+
 
 class _CoordinatesColumn:
     name = "coordinates"
 
     def __get__(self, instance: Node, owner: type[Node]) -> tuple[int, int] | None:
-        x, y = instance.conn.execute("SELECT x, y from NodeLocation WHERE i = :i", dict(i=instance.i)).fetchone()
+        if (cache := _row_cache(instance.conn)) is not None:
+            row = cache.row(instance.conn, "NodeLocation", instance.i)
+            x, y = row["x"], row["y"]  # pyrefly: ignore[unsupported-operation]
+        else:
+            x, y = instance.conn.execute("SELECT x, y from NodeLocation WHERE i = :i", dict(i=instance.i)).fetchone()
         return None if x is None or y is None else (x, y)
 
     def __set__(self, instance: Node, value: tuple[int, int] | None | tuple[set[int], tuple[int, int] | None]):
@@ -234,6 +482,8 @@ class _CoordinatesColumn:
         cur = instance.conn.cursor()
         old_value = self.__get__(instance, type(instance))
         cur.execute("UPDATE NodeLocation SET x = :x, y = :y WHERE i = :i", dict(x=x, y=y, i=instance.i))
+        if (cache := _row_cache(instance.conn)) is not None:
+            cache.rows.pop(("NodeLocation", instance.i), None)
 
         if value != old_value:
             cur.execute("UPDATE NodeLocationSource SET coordinates = false WHERE i = :i", dict(i=instance.i))
@@ -307,22 +557,81 @@ class _CoordinatesColumn:
                         )
                     self.__set__(instance1, (other_sources, other_v))
 
+    @staticmethod
+    def _merge_many(conn: sqlite3.Connection, _node_sources: dict[int, set[int]]) -> tuple[list[_Clash], list[_Write]]:
+        """Bulk version of :py:meth:`_merge` over the ``MergePair`` table, returning the writes to make"""
+        rows = conn.execute(
+            "SELECT MergePair.i1, MergePair.i2, A.x, A.y, B.x, B.y FROM MergePair "
+            "INNER JOIN NodeLocation A ON A.i = MergePair.i1 "
+            "INNER JOIN NodeLocation B ON B.i = MergePair.i2 "
+            "WHERE A.x IS NOT B.x OR A.y IS NOT B.y"
+        ).fetchall()
+        column_sources: dict[int, set[int]] = defaultdict(set)
+        for i, src in conn.execute(
+            "SELECT i, source FROM NodeLocationSource WHERE coordinates = true "
+            "AND i IN (SELECT i1 FROM MergePair UNION SELECT i2 FROM MergePair)"
+        ).fetchall():
+            column_sources[i].add(src)
+        clashes: list[_Clash] = []
+        sets: list[tuple[int, tuple[int, int] | None, set[int], tuple[int, int]]] = []
+        for i1, i2, x1, y1, x2, y2 in rows:
+            self_v = None if x1 is None or y1 is None else (x1, y1)
+            other_v = None if x2 is None or y2 is None else (x2, y2)
+            if other_v is None or self_v == other_v:
+                continue
+            if self_v is None:
+                sets.append((i1, self_v, column_sources[i2], other_v))
+                continue
+            self_sources = column_sources[i1]
+            other_sources = column_sources[i2]
+            priority = "former" if min(self_sources) < min(other_sources) else "latter"
+            if self_sources != other_sources:
+                clashes.append(
+                    _Clash(
+                        i1,
+                        i2,
+                        "Columns x/y",
+                        "NodeLocation",
+                        self_v,
+                        other_v,
+                        self_sources,
+                        other_sources,
+                        priority,
+                    )
+                )
+            if priority == "latter":
+                sets.append((i1, self_v, other_sources, other_v))
+
+        return clashes, [
+            ("UPDATE NodeLocation SET x = ?, y = ? WHERE i = ?", [(x, y, i) for i, _, _, (x, y) in sets]),
+            (
+                "UPDATE NodeLocationSource SET coordinates = false WHERE i = ?",
+                [(i,) for i, old_value, _, value in sets if value != old_value],
+            ),
+            (
+                "INSERT INTO NodeLocationSource (i, source, coordinates) VALUES (?, ?, true) "
+                "ON CONFLICT (i, source) DO UPDATE SET coordinates = true",
+                [(i, src) for i, _, srcs, _ in sets for src in srcs],
+            ),
+        ]
+
 
 class _FKColumn[T: Node | None]:
     def __init__(self, ty: type[T], name: LiteralString, table: LiteralString, *, sourced: bool = False):
         self.name = name
         self.table = table
         self.sourced = sourced
+        self._column = _Column(name, table, sourced=sourced)
         self.ty = ty
 
     def __get__(self, instance: Node, owner: type[Node]) -> T:
-        target_i = _Column(self.name, self.table, sourced=self.sourced).__get__(instance, owner)
+        target_i = self._column.__get__(instance, owner)
         if target_i is None:
             return None  # pyrefly: ignore[bad-return]
         return self.ty(instance.conn, target_i)
 
     def __set__(self, instance: Node, value: T | tuple[int, T]):
-        _Column(self.name, self.table, sourced=self.sourced).__set__(
+        self._column.__set__(
             instance,
             None  # pyrefly: ignore[bad-argument-type]
             if value is None
@@ -339,19 +648,25 @@ class _FKColumn[T: Node | None]:
         str_instance2: str | None = None,
         warn_fn: Callable[[str], object] = warnings.warn,
     ):
-        _Column(self.name, self.table, sourced=self.sourced)._merge(  # noqa: SLF001
+        self._column._merge(  # noqa: SLF001
             instance1, instance2, str_instance1, str_instance2, warn_fn
         )
 
+    def _merge_many(
+        self, conn: sqlite3.Connection, node_sources: dict[int, set[int]]
+    ) -> tuple[list[_Clash], list[_Write]]:
+        return self._column._merge_many(conn, node_sources)  # noqa: SLF001
+
 
 class _AircraftColumn:
     def __init__(self, name: LiteralString, table: LiteralString, *, sourced: bool = False):
         self.name = name
         self.table = table
         self.sourced = sourced
+        self._column = _Column(name, table, sourced=sourced)
 
     def __get__(self, instance: Node, owner: type[Node]) -> Aircraft | None:
-        target_name = _Column(self.name, self.table, sourced=self.sourced).__get__(instance, owner)
+        target_name = self._column.__get__(instance, owner)
         if target_name is None:
             return None
         from gatelogue_types import Aircraft  # noqa: PLC0415
@@ -359,7 +674,7 @@ class _AircraftColumn:
         return Aircraft(instance.conn, target_name)
 
     def __set__(self, instance: Node, value: Aircraft | tuple[int, Aircraft]):
-        _Column(self.name, self.table, sourced=self.sourced).__set__(
+        self._column.__set__(
             instance,
             None  # pyrefly: ignore[bad-argument-type]
             if value is None
@@ -376,10 +691,15 @@ class _AircraftColumn:
         str_instance2: str | None = None,
         warn_fn: Callable[[str], object] = warnings.warn,
     ):
-        _Column(self.name, self.table, sourced=self.sourced)._merge(  # noqa: SLF001
+        self._column._merge(  # noqa: SLF001
             instance1, instance2, str_instance1, str_instance2, warn_fn
         )
 
+    def _merge_many(
+        self, conn: sqlite3.Connection, node_sources: dict[int, set[int]]
+    ) -> tuple[list[_Clash], list[_Write]]:
+        return self._column._merge_many(conn, node_sources)  # noqa: SLF001
+
 
 class _SetAttr[T]:
     def __init__(
@@ -396,6 +716,8 @@ class _SetAttr[T]:
         self.formatter = formatter
 
     def __get__(self, instance: Node, owner: type[Node]) -> set[T]:
+        if (cache := _row_cache(instance.conn)) is not None:
+            return set(cache.values(instance.conn, self.table, self.table_column, instance.i))
         return {
             v
             for (v,) in instance.conn.execute(
@@ -408,6 +730,8 @@ class _SetAttr[T]:
         if self.formatter is not None:
             values = {self.formatter(value) for value in values}  # pyrefly: ignore[bad-assignment]
         source_params = "?, " * (len(srcs) - 1) + "?"
+        if (cache := _row_cache(instance.conn)) is not None:
+            cache.sets.pop((self.table, self.table_column, instance.i), None)
 
         cur = instance.conn.cursor()
         if not self.sourced:
@@ -466,3 +790,27 @@ class _SetAttr[T]:
                 dict(i1=instance1.i, i2=instance2.i),
             )
         cur.execute(f"DELETE FROM {self.table} WHERE i = :i2", dict(i1=instance1.i, i2=instance2.i))
+
+    def _merge_many(
+        self, _conn: sqlite3.Connection, _node_sources: dict[int, set[int]]
+    ) -> tuple[list[_Clash], list[_Write]]:
+        """Bulk version of :py:meth:`_merge` over the ``MergePair`` table, returning the writes to make"""
+        writes: list[_Write] = [
+            (
+                f"INSERT INTO {self.table} (i, {self.table_column}) "
+                f"SELECT MergePair.i1, {self.table_column} FROM {self.table} "
+                f"INNER JOIN MergePair ON {self.table}.i = MergePair.i2 WHERE true "
+                f"ON CONFLICT (i, {self.table_column}) DO NOTHING",
+                None,
+            )
+        ]
+        if self.sourced:
+            writes.append(
+                (
+                    f"UPDATE OR REPLACE {self.table + 'Source'} SET i = MergePair.i1 FROM MergePair "
+                    f"WHERE {self.table + 'Source'}.i = MergePair.i2",
+                    None,
+                )
+            )
+        writes.append((f"DELETE FROM {self.table} WHERE i IN (SELECT i2 FROM MergePair)", None))
+        return [], writes
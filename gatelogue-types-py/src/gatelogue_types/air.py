@@ -3,12 +3,21 @@ from __future__ import annotations
 import warnings
 from typing import TYPE_CHECKING, ClassVar, Literal, NotRequired, Required, Self, TypedDict, Unpack
 
-from gatelogue_types._util import _AircraftColumn, _Column, _FKColumn, _format_code, _format_str, _SetAttr
+from gatelogue_types._util import (
+    _AircraftColumn,
+    _Column,
+    _FKColumn,
+    _format_code,
+    _format_str,
+    _group_ids,
+    _resolve_merge_pairs,
+    _SetAttr,
+)
 from gatelogue_types.node import LocatedNode, Node
 
 if TYPE_CHECKING:
     import sqlite3
-    from collections.abc import Callable, Iterator
+    from collections.abc import Callable, Iterable, Iterator
 
 type AirMode = Literal["helicopter", "seaplane", "warp plane", "traincarts plane"]
 
@@ -139,15 +148,18 @@ class AirAirline(Node):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute("INSERT INTO AirAirline (i, name, link) VALUES (:i, :name, :link)", dict(i=i, **kwargs))
-        cur.execute(
-            "INSERT INTO AirAirlineSource (i, source, link) VALUES (:i, :source, :link_src)",
-            dict(i=i, source=src, **kwargs),
-        )
-        return cls(conn, i)
+        cur.executemany("INSERT INTO AirAirline (i, name, link) VALUES (:i, :name, :link)", params)
+        cur.executemany("INSERT INTO AirAirlineSource (i, source, link) VALUES (:i, :source, :link_src)", params)
+        return [cls(conn, i) for i in ids]
 
     @property
     def flights(self) -> Iterator[AirFlight]:
@@ -164,6 +176,13 @@ class AirAirline(Node):
         """List of all :py:class:`AirAirports` s the airline flies to or has gates in"""
         return self._sql_derived("air/airline_airports", AirAirport)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM AirAirline GROUP BY name HAVING count(i) > 1",
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         return (
             type(self)(self.conn, i)
@@ -175,6 +194,12 @@ class AirAirline(Node):
         cur.execute("UPDATE AirGate SET airline = :i1 WHERE airline = :i2", dict(i1=self.i, i2=other.i))
         cur.execute("UPDATE AirFlight SET airline = :i1 WHERE airline = :i2", dict(i1=self.i, i2=other.i))
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        cur = conn.cursor()
+        cur.execute("UPDATE AirGate SET airline = MergePair.i1 FROM MergePair WHERE AirGate.airline = MergePair.i2")
+        cur.execute("UPDATE AirFlight SET airline = MergePair.i1 FROM MergePair WHERE AirFlight.airline = MergePair.i2")
+
 
 class AirAirport(LocatedNode):
     @staticmethod
@@ -206,30 +231,47 @@ class AirAirport(LocatedNode):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        names, modes = kwargs.get("names", set()), kwargs.get("modes", set())
-        i = cls.create_node_with_location(conn, src, ty=cls.__name__, **kwargs)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes_with_location(conn, src, ty=cls.__name__, rows=rows)
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute("INSERT INTO AirAirport (i, code, link) VALUES (:i, :code, :link)", dict(i=i, **kwargs))
-        cur.executemany("INSERT INTO AirAirportNames (i, name) VALUES (?, ?)", [(i, name) for name in names])
-        cur.executemany("INSERT INTO AirAirportModes (i, mode) VALUES (?, ?)", [(i, mode) for mode in modes])
-        cur.execute(
-            "INSERT INTO AirAirportSource (i, source, link) VALUES (:i, :source, :link_src)",
-            dict(i=i, source=src, **kwargs),
+        cur.executemany("INSERT INTO AirAirport (i, code, link) VALUES (:i, :code, :link)", params)
+        cur.executemany(
+            "INSERT INTO AirAirportNames (i, name) VALUES (?, ?)",
+            [(i, name) for i, kwargs in zip(ids, rows, strict=True) for name in kwargs["names"]],
         )
         cur.executemany(
-            "INSERT INTO AirAirportNamesSource (i, name, source) VALUES (?, ?, ?)", [(i, name, src) for name in names]
+            "INSERT INTO AirAirportModes (i, mode) VALUES (?, ?)",
+            [(i, mode) for i, kwargs in zip(ids, rows, strict=True) for mode in kwargs["modes"]],
         )
+        cur.executemany("INSERT INTO AirAirportSource (i, source, link) VALUES (:i, :source, :link_src)", params)
         cur.executemany(
-            "INSERT INTO AirAirportModesSource (i, mode, source) VALUES (?, ?, ?)", [(i, mode, src) for mode in modes]
+            "INSERT INTO AirAirportNamesSource (i, name, source) VALUES (?, ?, ?)",
+            [(i, name, src) for i, kwargs in zip(ids, rows, strict=True) for name in kwargs["names"]],
         )
-        return cls(conn, i)
+        cur.executemany(
+            "INSERT INTO AirAirportModesSource (i, mode, source) VALUES (?, ?, ?)",
+            [(i, mode, src) for i, kwargs in zip(ids, rows, strict=True) for mode in kwargs["modes"]],
+        )
+        return [cls(conn, i) for i in ids]
 
     @property
     def gates(self) -> Iterator[AirGate]:
         """List of :py:class:`AirGate` s"""
         return self._sql_derived("air/airport_gates", AirGate)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM AirAirport WHERE code != '' GROUP BY code HAVING count(i) > 1",
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         if (code := self.code) == "":
             return iter(())
@@ -242,6 +284,11 @@ class AirAirport(LocatedNode):
         self.conn.execute("UPDATE AirGate SET airport = :i1 WHERE airport = :i2", dict(i1=self.i, i2=other.i))
         super()._merge(other)
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        conn.execute("UPDATE AirGate SET airport = MergePair.i1 FROM MergePair WHERE AirGate.airport = MergePair.i2")
+        super()._merge_many(conn)
+
 
 class AirGate(Node):
     code = _Column[str | None]("code", "AirGate", formatter=_format_code)
@@ -271,20 +318,26 @@ class AirGate(Node):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
+        cur.executemany(
             "INSERT INTO AirGate (i, code, airport, airline, width, mode) "
             "VALUES (:i, :code, :airport, :airline, :width, :mode)",
-            dict(i=i, **kwargs),
+            params,
         )
-        cur.execute(
+        cur.executemany(
             "INSERT INTO AirGateSource (i, source, width, mode, airline) "
             "VALUES (:i, :source, :width_src, :mode_src, :airline_src)",
-            dict(i=i, source=src, **kwargs),
+            params,
         )
-        return cls(conn, i)
+        return [cls(conn, i) for i in ids]
 
     @property
     def flights_from_here(self) -> Iterator[AirFlight]:
@@ -296,6 +349,13 @@ class AirGate(Node):
         """List of IDs of all :py:class:`AirFlight` s that arrive at this gate"""
         return self._sql_derived("air/gate_flights_to_here", AirFlight)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM AirGate WHERE code IS NOT NULL GROUP BY airport, code HAVING count(i) > 1",
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         if (code := self.code) is None:
             return iter(())
@@ -313,11 +373,33 @@ class AirGate(Node):
             other.code = self.code
         super().merge(other, warn_fn)
 
+    @classmethod
+    def _prepare_merge_many(cls, conn: sqlite3.Connection):
+        rows = conn.execute(
+            "SELECT MergePair.i1, MergePair.i2, A.code, B.code FROM MergePair "
+            "INNER JOIN AirGate A ON A.i = MergePair.i1 "
+            "INNER JOIN AirGate B ON B.i = MergePair.i2 "
+            "WHERE (A.code IS NULL) != (B.code IS NULL)"
+        ).fetchall()
+        conn.executemany(
+            "UPDATE AirGate SET code = ? WHERE i = ?",
+            [
+                (_format_code(code2), i1) if code1 is None else (_format_code(code1), i2)
+                for i1, i2, code1, code2 in rows
+            ],
+        )
+
     def _merge(self, other: Self):
         cur = self.conn.cursor()
         cur.execute('UPDATE AirFlight SET "from" = :i1 WHERE "from" = :i2', dict(i1=self.i, i2=other.i))
         cur.execute('UPDATE AirFlight SET "to" = :i1 WHERE "to" = :i2', dict(i1=self.i, i2=other.i))
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        cur = conn.cursor()
+        cur.execute('UPDATE AirFlight SET "from" = MergePair.i1 FROM MergePair WHERE AirFlight."from" = MergePair.i2')
+        cur.execute('UPDATE AirFlight SET "to" = MergePair.i1 FROM MergePair WHERE AirFlight."to" = MergePair.i2')
+
 
 class AirFlight(Node):
     airline = _FKColumn(AirAirline, "airline", "AirFlight")
@@ -346,26 +428,27 @@ class AirFlight(Node):
         aircraft: NotRequired[str | None]
 
     @classmethod
-    def create(
-        cls,
-        conn: sqlite3.Connection,
-        src: int,
-        **kwargs: Unpack[CreateParams],
-    ) -> Self:
+    def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
+        cur.executemany(
             'INSERT INTO AirFlight (i, "from", "to", code, aircraft, airline, duration) '
             "VALUES (:i, :from_, :to, :code, :aircraft, :airline, :duration)",
-            dict(i=i, **kwargs),
+            params,
         )
-        cur.execute(
+        cur.executemany(
             "INSERT INTO AirFlightSource (i, source, aircraft, duration) VALUES (:i, :source, :aircraft_src, :duration_src)",
-            dict(i=i, source=src, **kwargs),
+            params,
         )
-        return cls(conn, i)
+        return [cls(conn, i) for i in ids]
 
     @classmethod
     def create2(
@@ -374,7 +457,18 @@ class AirFlight(Node):
         kwargs2 = kwargs.copy()
         kwargs2["from_"], kwargs2["to"] = kwargs2["to"], kwargs2["from_"]
         kwargs2["code"] = code2 or kwargs2["code"]
-        return cls.create(conn, src, **kwargs), cls.create(conn, src, **kwargs2)
+        flight1, flight2 = cls.create_many(conn, src, [kwargs, kwargs2])
+        return flight1, flight2
+
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(AirFlight.i) FROM AirFlight "
+            'INNER JOIN AirGate AGFrom ON "from" = AGFrom.i '
+            'INNER JOIN AirGate AGTo ON "to" = AGTo.i '
+            "GROUP BY AirFlight.airline, AGFrom.airport, AGTo.airport HAVING count(AirFlight.i) > 1",
+        )
 
     def equivalent_nodes(self) -> Iterator[Self]:
         return (
@@ -398,3 +492,38 @@ class AirFlight(Node):
             self.to.merge(other.to, warn_fn=warn_fn)
         super().merge(other, warn_fn)
         return also_merged
+
+    @classmethod
+    def merge_many(
+        cls,
+        conn: sqlite3.Connection,
+        pairs: Iterable[tuple[int, int]],
+        warn_fn: Callable[[str], object] = warnings.warn,
+    ) -> None:
+        pairs = _resolve_merge_pairs(pairs)
+        gate_codes: dict[int, str | None] = dict(conn.execute("SELECT i, code FROM AirGate").fetchall())
+        flight_gates: dict[int, tuple[int, int]] = {
+            i: (from_, to) for i, from_, to in conn.execute('SELECT i, "from", "to" FROM AirFlight').fetchall()
+        }
+        gate_merged_into: dict[int, int] = {}
+
+        def resolve(gate: int) -> int:
+            while gate in gate_merged_into:
+                gate = gate_merged_into[gate]
+            return gate
+
+        gate_pairs = []
+        for i1, i2 in pairs:
+            if i1 == i2:
+                continue
+            for side in (0, 1):
+                gate1 = resolve(flight_gates[i1][side])
+                gate2 = resolve(flight_gates[i2][side])
+                if (gate_codes[gate1] is None or gate_codes[gate2] is None) and gate1 != gate2:
+                    gate_pairs.append((gate1, gate2))
+                    gate_merged_into[gate2] = gate1
+                    if gate_codes[gate1] is None:
+                        gate_codes[gate1] = gate_codes[gate2]
+
+        AirGate.merge_many(conn, gate_pairs, warn_fn)
+        super().merge_many(conn, pairs, warn_fn)
@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, ClassVar, Literal, NotRequired, Required, Self, TypedDict, Unpack
 
-from gatelogue_types._util import _Column, _FKColumn, _format_code, _format_str, _SetAttr
+from gatelogue_types._util import _Column, _FKColumn, _format_code, _format_str, _group_ids, _join_overlapping, _SetAttr
 from gatelogue_types.node import LocatedNode, Node
 
 if TYPE_CHECKING:
     import sqlite3
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
 
 type BusMode = Literal["warp", "traincarts"]
 
@@ -31,12 +31,18 @@ class BusCompany(Node):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute("INSERT INTO BusCompany (i, name, link) VALUES (:i, :name, :link)", dict(i=i, **kwargs))
-        cur.execute("INSERT INTO BusCompanySource (i, source) VALUES (:i, :source)", dict(i=i, source=src, **kwargs))
-        return cls(conn, i)
+        cur.executemany("INSERT INTO BusCompany (i, name, link) VALUES (:i, :name, :link)", params)
+        cur.executemany("INSERT INTO BusCompanySource (i, source) VALUES (:i, :source)", params)
+        return [cls(conn, i) for i in ids]
 
     @property
     def lines(self) -> Iterator[BusLine]:
@@ -53,6 +59,13 @@ class BusCompany(Node):
         """List of all :py:class:`BusBerth` s the company's lines stop at"""
         return self._sql_derived("bus/company_berths", BusBerth)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM BusCompany GROUP BY name HAVING count(i) > 1",
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         return (
             type(self)(self.conn, i)
@@ -64,6 +77,12 @@ class BusCompany(Node):
         cur.execute("UPDATE BusLine SET company = :i1 WHERE company = :i2", dict(i1=self.i, i2=other.i))
         cur.execute("UPDATE BusStop SET company = :i1 WHERE company = :i2", dict(i1=self.i, i2=other.i))
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        cur = conn.cursor()
+        cur.execute("UPDATE BusLine SET company = MergePair.i1 FROM MergePair WHERE BusLine.company = MergePair.i2")
+        cur.execute("UPDATE BusStop SET company = MergePair.i1 FROM MergePair WHERE BusStop.company = MergePair.i2")
+
 
 class BusLine(Node):
     code = _Column[str]("code", "BusLine", formatter=_format_str)
@@ -94,27 +113,28 @@ class BusLine(Node):
         local: bool | None
 
     @classmethod
-    def create(
-        cls,
-        conn: sqlite3.Connection,
-        src: int,
-        **kwargs: Unpack[CreateParams],
-    ) -> Self:
+    def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
+        cur.executemany(
             "INSERT INTO BusLine (i, code, company, name, colour, mode, local) "
             "VALUES (:i, :code, :company, :name, :colour, :mode, :local)",
-            dict(i=i, **kwargs),
+            params,
         )
-        cur.execute(
+        cur.executemany(
             "INSERT INTO BusLineSource (i, source, name, colour, mode, local) "
             "VALUES (:i, :source, :name_src, :colour_src, :mode_src, :local_src)",
-            dict(i=i, source=src, **kwargs),
+            params,
         )
-        return cls(conn, i)
+        return [cls(conn, i) for i in ids]
 
     @property
     def berths(self) -> Iterator[BusBerth]:
@@ -126,6 +146,13 @@ class BusLine(Node):
         """List of all :py:class:`BusStop` s the line stops at"""
         return self._sql_derived("bus/line_stops", BusStop)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM BusLine GROUP BY code, company HAVING count(i) > 1",
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         return (
             type(self)(self.conn, i)
@@ -137,6 +164,12 @@ class BusLine(Node):
     def _merge(self, other: Self):
         self.conn.execute("UPDATE BusConnection SET line = :i1 WHERE line = :i2", dict(i1=self.i, i2=other.i))
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        conn.execute(
+            "UPDATE BusConnection SET line = MergePair.i1 FROM MergePair WHERE BusConnection.line = MergePair.i2"
+        )
+
 
 class BusStop(LocatedNode):
     codes = _SetAttr[str]("BusStopCodes", "code", formatter=_format_code)
@@ -158,20 +191,22 @@ class BusStop(LocatedNode):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        codes = kwargs.get("codes", set())
-        i = cls.create_node_with_location(conn, src, ty=cls.__name__, **kwargs)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes_with_location(conn, src, ty=cls.__name__, rows=rows)
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO BusStop (i, name, company) VALUES (:i, :name, :company)",
-            dict(i=i, **kwargs),
-        )
-        cur.executemany("INSERT INTO BusStopCodes (i, code) VALUES (?, ?)", [(i, code) for code in codes])
-        cur.execute(
-            "INSERT INTO BusStopSource (i, source, name) VALUES (:i, :source, :name_src)",
-            dict(i=i, source=src, **kwargs),
+        cur.executemany("INSERT INTO BusStop (i, name, company) VALUES (:i, :name, :company)", params)
+        cur.executemany(
+            "INSERT INTO BusStopCodes (i, code) VALUES (?, ?)",
+            [(i, code) for i, kwargs in zip(ids, rows, strict=True) for code in kwargs["codes"]],
         )
-        return cls(conn, i)
+        cur.executemany("INSERT INTO BusStopSource (i, source, name) VALUES (:i, :source, :name_src)", params)
+        return [cls(conn, i) for i in ids]
 
     @property
     def berths(self) -> Iterator[BusBerth]:
@@ -193,6 +228,17 @@ class BusStop(LocatedNode):
         """List of all :py:class:`BusLines` s at this stop"""
         return self._sql_derived("bus/stop_lines", BusLine)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _join_overlapping(
+            _group_ids(
+                conn,
+                "SELECT group_concat(BusStop.i) FROM BusStop "
+                "INNER JOIN BusStopCodes ON BusStop.i = BusStopCodes.i "
+                "GROUP BY company, code HAVING count(BusStop.i) > 1",
+            )
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         if len(codes := self.codes) == 0:
             return iter(())
@@ -214,6 +260,11 @@ class BusStop(LocatedNode):
         self.conn.execute("UPDATE BusBerth SET stop = :i1 WHERE stop = :i2", dict(i1=self.i, i2=other.i))
         super()._merge(other)
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        conn.execute("UPDATE BusBerth SET stop = MergePair.i1 FROM MergePair WHERE BusBerth.stop = MergePair.i2")
+        super()._merge_many(conn)
+
 
 class BusBerth(Node):
     code = _Column[str | None]("code", "BusBerth", formatter=_format_code)
@@ -232,12 +283,18 @@ class BusBerth(Node):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute("INSERT INTO BusBerth (i, code, stop) VALUES (:i, :code, :stop)", dict(i=i, **kwargs))
-        cur.execute("INSERT INTO BusBerthSource (i, source) VALUES (:i, :source)", dict(i=i, source=src, **kwargs))
-        return cls(conn, i)
+        cur.executemany("INSERT INTO BusBerth (i, code, stop) VALUES (:i, :code, :stop)", params)
+        cur.executemany("INSERT INTO BusBerthSource (i, source) VALUES (:i, :source)", params)
+        return [cls(conn, i) for i in ids]
 
     @property
     def connections_from_here(self) -> Iterator[BusConnection]:
@@ -254,6 +311,13 @@ class BusBerth(Node):
         """List of all :py:class:`BusLines` s at this stop"""
         return self._sql_derived("bus/berth_lines", BusLine)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM BusBerth WHERE code IS NOT NULL GROUP BY stop, code HAVING count(i) > 1",
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         if (code := self.code) is None:
             return iter(())
@@ -269,6 +333,16 @@ class BusBerth(Node):
         cur.execute('UPDATE BusConnection SET "from" = :i1 WHERE "from" = :i2', dict(i1=self.i, i2=other.i))
         cur.execute('UPDATE BusConnection SET "to" = :i1 WHERE "to" = :i2', dict(i1=self.i, i2=other.i))
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        cur = conn.cursor()
+        cur.execute(
+            'UPDATE BusConnection SET "from" = MergePair.i1 FROM MergePair WHERE BusConnection."from" = MergePair.i2'
+        )
+        cur.execute(
+            'UPDATE BusConnection SET "to" = MergePair.i1 FROM MergePair WHERE BusConnection."to" = MergePair.i2'
+        )
+
 
 class BusConnection(Node):
     line = _FKColumn(BusLine, "line", "BusConnection")
@@ -296,20 +370,26 @@ class BusConnection(Node):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
+        cur.executemany(
             'INSERT INTO BusConnection (i, line, "from", "to", direction, duration) '
             "VALUES (:i, :line, :from_, :to, :direction, :duration)",
-            dict(i=i, **kwargs),
+            params,
         )
-        cur.execute(
+        cur.executemany(
             "INSERT INTO BusConnectionSource (i, source, direction, duration) "
             "VALUES (:i, :source, :direction_src, :duration_src)",
-            dict(i=i, source=src, **kwargs),
+            params,
         )
-        return cls(conn, i)
+        return [cls(conn, i) for i in ids]
 
     @classmethod
     def create2(
@@ -320,6 +400,13 @@ class BusConnection(Node):
         kwargs2["direction"] = direction2 or kwargs2["direction"]
         return cls.create(conn, src, **kwargs), cls.create(conn, src, **kwargs2)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            'SELECT group_concat(i) FROM BusConnection GROUP BY line, "from", "to" HAVING count(i) > 1',
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         return (
             type(self)(self.conn, i)
@@ -1,15 +1,31 @@
 from __future__ import annotations
 
 import warnings
-from typing import TYPE_CHECKING, ClassVar, Literal, Self, TypedDict, Unpack
-
-from gatelogue_types._util import _AircraftColumn, _Column, _CoordinatesColumn, _FKColumn, _format_str, _SetAttr, _sql
+from collections import defaultdict
+from typing import TYPE_CHECKING, ClassVar, Literal, LiteralString, Self, TypedDict
+
+from gatelogue_types._util import (
+    _AircraftColumn,
+    _clash_message,
+    _Column,
+    _CoordinatesColumn,
+    _FKColumn,
+    _format_str,
+    _merge_rounds,
+    _resolve_merge_pairs,
+    _row_cache,
+    _row_cache_suspended,
+    _SetAttr,
+    _sql,
+)
 
 if TYPE_CHECKING:
     import builtins
     import sqlite3
     from collections.abc import Callable, Iterable, Iterator
 
+    from gatelogue_types._util import _Clash, _Write
+
 
 class Node:
     """Base class of all nodes"""
@@ -54,13 +70,17 @@ class Node:
         return type(self).__name__ + f"({self.i})"
 
     @classmethod
-    def create_node(cls, conn: sqlite3.Connection, src: int, *, ty: str) -> int:
-        """Internal use"""
+    def create_nodes(cls, conn: sqlite3.Connection, src: int, *, ty: str, count: int) -> list[int]:
+        """Internal use. Reserves the next ``count`` node IDs, the same ones that ``AUTOINCREMENT`` would give"""
         cur = conn.cursor()
-        cur.execute("INSERT INTO Node ( type ) VALUES ( :type )", dict(type=ty))
-        (i,) = cur.execute("SELECT i FROM Node WHERE ROWID = last_insert_rowid()").fetchone()
-        cur.execute("INSERT INTO NodeSource ( i, source ) VALUES ( :i, :source )", dict(i=i, source=src))
-        return i
+        (last,) = cur.execute(
+            "SELECT max(coalesce((SELECT seq FROM sqlite_sequence WHERE name = 'Node'), 0), "
+            "coalesce((SELECT max(i) FROM Node), 0))"
+        ).fetchone()
+        ids = list(range(last + 1, last + 1 + count))
+        cur.executemany("INSERT INTO Node ( i, type ) VALUES ( ?, ? )", [(i, ty) for i in ids])
+        cur.executemany("INSERT INTO NodeSource ( i, source ) VALUES ( ?, ? )", [(i, src) for i in ids])
+        return ids
 
     def __eq__(self, other: object) -> bool:
         return isinstance(other, type(self)) and self.i == other.i
@@ -75,6 +95,11 @@ class Node:
         """Internal use"""
         raise NotImplementedError
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        """Internal use. All groups of more than one equivalent node of this type, each sorted by ID"""
+        raise NotImplementedError
+
     def _merge(self, other: Self):
         pass
 
@@ -83,13 +108,91 @@ class Node:
         if self == other:
             warn_fn(f"{self} tried to merge with itself")
             return
-        self_str = str(self)
-        other_str = str(other)
-        for attr in self.COLUMNS:
-            attr._merge(self, other, self_str, other_str, warn_fn)  # noqa: SLF001
+        with _row_cache_suspended(self.conn):
+            self_str = str(self)
+            other_str = str(other)
+            for attr in self.COLUMNS:
+                attr._merge(self, other, self_str, other_str, warn_fn)  # noqa: SLF001
+
+            self._merge(other)
+            other.delete()
+
+    @classmethod
+    def _prepare_merge_many(cls, conn: sqlite3.Connection):
+        pass
+
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        pass
 
-        self._merge(other)
-        other.delete()
+    @classmethod
+    def merge_many(
+        cls,
+        conn: sqlite3.Connection,
+        pairs: Iterable[tuple[int, int]],
+        warn_fn: Callable[[str], object] = warnings.warn,
+    ) -> None:
+        """Internal use. Merges every ``(keep, drop)`` pair of node IDs of this type, with the same outcome and warnings
+        as calling :py:meth:`merge` on each pair in order, but with a fixed number of queries per round of pairs"""
+        pairs = _resolve_merge_pairs(pairs)
+        messages: list[tuple[int, int, str]] = []
+
+        with _row_cache_suspended(conn):
+            cur = conn.cursor()
+            cur.execute("CREATE TEMP TABLE IF NOT EXISTS MergePair (i1 INTEGER NOT NULL, i2 INTEGER PRIMARY KEY)")
+            for round_ in _merge_rounds((index, i1, i2) for index, (i1, i2) in enumerate(pairs)):
+                messages.extend(
+                    (index, -1, f"{cls(conn, i1)} tried to merge with itself") for index, i1, i2 in round_ if i1 == i2
+                )
+                round_ = [(index, i1, i2) for index, i1, i2 in round_ if i1 != i2]  # noqa: PLW2901
+                cur.execute("DELETE FROM MergePair")
+                cur.executemany("INSERT INTO MergePair (i1, i2) VALUES (?, ?)", [(i1, i2) for _, i1, i2 in round_])
+                cls._prepare_merge_many(conn)
+
+                node_sources: dict[int, set[int]] = defaultdict(set)
+                for i, src in cur.execute(
+                    "SELECT i, source FROM NodeSource WHERE i IN (SELECT i1 FROM MergePair UNION SELECT i2 FROM MergePair)"
+                ).fetchall():
+                    node_sources[i].add(src)
+                clashes: list[tuple[int, _Clash]] = []
+                writes: list[_Write] = []
+                for column_index, attr in enumerate(cls.COLUMNS):
+                    attr_clashes, attr_writes = attr._merge_many(conn, node_sources)  # noqa: SLF001
+                    clashes.extend((column_index, clash) for clash in attr_clashes)
+                    writes.extend(attr_writes)
+
+                index_of = {i1: index for index, i1, _ in round_}
+                strs = {i: str(cls(conn, i)) for _, clash in clashes for i in (clash.i1, clash.i2)}
+                messages.extend(
+                    (
+                        index_of[clash.i1],
+                        column_index,
+                        _clash_message(
+                            clash.column,
+                            clash.table,
+                            strs[clash.i1],
+                            clash.self_v,
+                            strs[clash.i2],
+                            clash.other_v,
+                            clash.self_sources,
+                            clash.other_sources,
+                            clash.priority,
+                        ),
+                    )
+                    for column_index, clash in clashes
+                )
+
+                for query, params in writes:
+                    if params is None:
+                        cur.execute(query)
+                    else:
+                        cur.executemany(query, params)
+                cls._merge_many(conn)
+                cls._delete_merged(conn)
+            cur.execute("DELETE FROM MergePair")
+
+        for _, _, message in sorted(messages, key=lambda m: m[:2]):
+            warn_fn(message)
 
     def delete(self):
         """Internal use"""
@@ -98,6 +201,32 @@ class Node:
         cur.execute(f"DELETE FROM {type(self).__name__} WHERE i = :i", dict(i=self.i))
         cur.execute("DELETE FROM NodeSource WHERE i = :i", dict(i=self.i))
         cur.execute("DELETE FROM Node WHERE i = :i", dict(i=self.i))
+        if (cache := _row_cache(self.conn)) is not None:
+            cache.clear()
+
+    @classmethod
+    def delete_many(cls, conn: sqlite3.Connection, ids: Iterable[int]):
+        """Internal use. Deletes every node of this type in ``ids``, like calling :py:meth:`delete` on each of them,
+        but with a fixed number of queries"""
+        cur = conn.cursor()
+        cur.execute("CREATE TEMP TABLE IF NOT EXISTS DeletedNode (i INTEGER PRIMARY KEY)")
+        cur.execute("DELETE FROM DeletedNode")
+        cur.executemany("INSERT OR IGNORE INTO DeletedNode (i) VALUES (?)", [(i,) for i in ids])
+        cls._delete_in(conn, "SELECT i FROM DeletedNode")
+        if (cache := _row_cache(conn)) is not None:
+            cache.clear()
+
+    @classmethod
+    def _delete_in(cls, conn: sqlite3.Connection, ids: LiteralString):
+        cur = conn.cursor()
+        cur.execute(f"DELETE FROM {cls.__name__}Source WHERE i IN ({ids})")
+        cur.execute(f"DELETE FROM {cls.__name__} WHERE i IN ({ids})")
+        cur.execute(f"DELETE FROM NodeSource WHERE i IN ({ids})")
+        cur.execute(f"DELETE FROM Node WHERE i IN ({ids})")
+
+    @classmethod
+    def _delete_merged(cls, conn: sqlite3.Connection):
+        cls._delete_in(conn, "SELECT i2 FROM MergePair")
 
     @classmethod
     def format_create_kwargs(cls, **kwargs) -> dict:
@@ -161,21 +290,17 @@ class LocatedNode(Node):
         coordinates: tuple[int, int] | None
 
     @classmethod
-    def create_node_with_location(
-        cls, conn: sqlite3.Connection, src: int, *, ty: str, **kwargs: Unpack[CreateParams]
-    ) -> int:
-        """Internal use"""
-        i = cls.create_node(conn, src, ty=ty)
+    def create_nodes_with_location(cls, conn: sqlite3.Connection, src: int, *, ty: str, rows: list[dict]) -> list[int]:
+        """Internal use. ``rows`` are formatted with :py:meth:`format_create_kwargs`"""
+        ids = cls.create_nodes(conn, src, ty=ty, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO NodeLocation (i, world, x, y) VALUES (:i, :world, :x, :y)",
-            dict(i=i, **kwargs),
-        )
-        cur.execute(
+        cur.executemany("INSERT INTO NodeLocation (i, world, x, y) VALUES (:i, :world, :x, :y)", params)
+        cur.executemany(
             "INSERT INTO NodeLocationSource (i, source, world, coordinates) VALUES (:i, :source, :world_src, :coordinates_src)",
-            dict(i=i, source=src, **kwargs),
+            params,
         )
-        return i
+        return ids
 
     @property
     def _nodes_in_proximity(self) -> Iterator[int]:
@@ -226,6 +351,35 @@ class LocatedNode(Node):
         )
         cur.execute("DELETE FROM Proximity WHERE node1 == :i2 OR node2 == :i2", dict(i1=self.i, i2=other.i))
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        cur = conn.cursor()
+        cur.execute(
+            "UPDATE OR FAIL SharedFacility SET node1 = MergePair.i1 FROM MergePair "
+            "WHERE SharedFacility.node1 = MergePair.i2"
+        )
+        cur.execute(
+            "UPDATE OR FAIL SharedFacility SET node2 = MergePair.i1 FROM MergePair "
+            "WHERE SharedFacility.node2 = MergePair.i2"
+        )
+        cur.execute(
+            "INSERT INTO Proximity SELECT min(n1, n2), max(n1, n2), distance, explicit FROM "
+            "(SELECT coalesce(A.i1, node1) AS n1, coalesce(B.i1, node2) AS n2, distance, explicit FROM Proximity "
+            "LEFT JOIN MergePair A ON node1 = A.i2 LEFT JOIN MergePair B ON node2 = B.i2 "
+            "WHERE A.i2 IS NOT NULL OR B.i2 IS NOT NULL) "
+            "WHERE true ON CONFLICT (node1, node2) DO NOTHING"
+        )
+        cur.execute(
+            "UPDATE OR FAIL ProximitySource SET (node1, node2) = (min(M.n1, M.n2), max(M.n1, M.n2)) FROM "
+            "(SELECT ProximitySource.rowid AS r, coalesce(A.i1, node1) AS n1, coalesce(B.i1, node2) AS n2 "
+            "FROM ProximitySource LEFT JOIN MergePair A ON node1 = A.i2 LEFT JOIN MergePair B ON node2 = B.i2 "
+            "WHERE A.i2 IS NOT NULL OR B.i2 IS NOT NULL) AS M "
+            "WHERE ProximitySource.rowid = M.r"
+        )
+        cur.execute(
+            "DELETE FROM Proximity WHERE node1 IN (SELECT i2 FROM MergePair) OR node2 IN (SELECT i2 FROM MergePair)"
+        )
+
     def delete(self):
         cur = self.conn.cursor()
         cur.execute(f"DELETE FROM {type(self).__name__}Source WHERE i = :i", dict(i=self.i))
@@ -234,6 +388,18 @@ class LocatedNode(Node):
         cur.execute("DELETE FROM NodeLocation WHERE i = :i", dict(i=self.i))
         cur.execute("DELETE FROM NodeSource WHERE i = :i", dict(i=self.i))
         cur.execute("DELETE FROM Node WHERE i = :i", dict(i=self.i))
+        if (cache := _row_cache(self.conn)) is not None:
+            cache.clear()
+
+    @classmethod
+    def _delete_in(cls, conn: sqlite3.Connection, ids: LiteralString):
+        cur = conn.cursor()
+        cur.execute(f"DELETE FROM {cls.__name__}Source WHERE i IN ({ids})")
+        cur.execute(f"DELETE FROM {cls.__name__} WHERE i IN ({ids})")
+        cur.execute(f"DELETE FROM NodeLocationSource WHERE i IN ({ids})")
+        cur.execute(f"DELETE FROM NodeLocation WHERE i IN ({ids})")
+        cur.execute(f"DELETE FROM NodeSource WHERE i IN ({ids})")
+        cur.execute(f"DELETE FROM Node WHERE i IN ({ids})")
 
 
 class Proximity:
@@ -320,12 +486,15 @@ class SharedFacility:
     @classmethod
     def create(cls, conn: sqlite3.Connection, *, node1: LocatedNode, node2: LocatedNode) -> Self:
         """Internal use"""
-        if node1.i > node2.i:
-            node1, node2 = node2, node1
+        return cls.create_many(conn, [(node1, node2)])[0]
 
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, pairs: Iterable[tuple[LocatedNode, LocatedNode]]) -> list[Self]:
+        """Internal use. Creates many shared facilities as with :py:meth:`create`, with one query"""
+        facilities = [cls(conn, node1, node2) for node1, node2 in pairs]
         cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO SharedFacility (node1, node2) VALUES (:node1, :node2) ON CONFLICT DO NOTHING ",
-            dict(node1=node1.i, node2=node2.i),
+        cur.executemany(
+            "INSERT INTO SharedFacility (node1, node2) VALUES (:node1, :node2) ON CONFLICT DO NOTHING",
+            [dict(node1=facility.node1, node2=facility.node2) for facility in facilities],
         )
-        return cls(conn, node1, node2)
+        return facilities
@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, ClassVar, Literal, NotRequired, Required, Self, TypedDict, Unpack
 
-from gatelogue_types._util import _Column, _FKColumn, _format_code, _format_str, _SetAttr
+from gatelogue_types._util import _Column, _FKColumn, _format_code, _format_str, _group_ids, _join_overlapping, _SetAttr
 from gatelogue_types.node import LocatedNode, Node
 
 if TYPE_CHECKING:
     import sqlite3
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
 
 type RailMode = Literal["warp", "cart", "traincarts", "vehicles"]
 
@@ -31,12 +31,18 @@ class RailCompany(Node):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute("INSERT INTO RailCompany (i, name, link) VALUES (:i, :name, :link)", dict(i=i, **kwargs))
-        cur.execute("INSERT INTO RailCompanySource (i, source) VALUES (:i, :source)", dict(i=i, source=src, **kwargs))
-        return cls(conn, i)
+        cur.executemany("INSERT INTO RailCompany (i, name, link) VALUES (:i, :name, :link)", params)
+        cur.executemany("INSERT INTO RailCompanySource (i, source) VALUES (:i, :source)", params)
+        return [cls(conn, i) for i in ids]
 
     @property
     def lines(self) -> Iterator[RailLine]:
@@ -53,6 +59,13 @@ class RailCompany(Node):
         """List of all :py:class:`RailPlatform` s the company's lines stop at"""
         return self._sql_derived("rail/company_platforms", RailPlatform)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM RailCompany GROUP BY name HAVING count(i) > 1",
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         return (
             type(self)(self.conn, i)
@@ -64,6 +77,14 @@ class RailCompany(Node):
         cur.execute("UPDATE RailLine SET company = :i1 WHERE company = :i2", dict(i1=self.i, i2=other.i))
         cur.execute("UPDATE RailStation SET company = :i1 WHERE company = :i2", dict(i1=self.i, i2=other.i))
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        cur = conn.cursor()
+        cur.execute("UPDATE RailLine SET company = MergePair.i1 FROM MergePair WHERE RailLine.company = MergePair.i2")
+        cur.execute(
+            "UPDATE RailStation SET company = MergePair.i1 FROM MergePair WHERE RailStation.company = MergePair.i2"
+        )
+
 
 class RailLine(Node):
     code = _Column[str]("code", "RailLine", formatter=_format_str)
@@ -94,27 +115,28 @@ class RailLine(Node):
         local: bool | None
 
     @classmethod
-    def create(
-        cls,
-        conn: sqlite3.Connection,
-        src: int,
-        **kwargs: Unpack[CreateParams],
-    ) -> Self:
+    def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
+        cur.executemany(
             "INSERT INTO RailLine (i, code, company, name, colour, mode, local) "
             "VALUES (:i, :code, :company, :name, :colour, :mode, :local)",
-            dict(i=i, **kwargs),
+            params,
         )
-        cur.execute(
+        cur.executemany(
             "INSERT INTO RailLineSource (i, source, name, colour, mode, local) "
             "VALUES (:i, :source, :name_src, :colour_src, :mode_src, :local_src)",
-            dict(i=i, source=src, **kwargs),
+            params,
         )
-        return cls(conn, i)
+        return [cls(conn, i) for i in ids]
 
     @property
     def platforms(self) -> Iterator[RailPlatform]:
@@ -126,6 +148,13 @@ class RailLine(Node):
         """List of all :py:class:`RailStation` s the line stops at"""
         return self._sql_derived("rail/line_stations", RailStation)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM RailLine GROUP BY code, company HAVING count(i) > 1",
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         return (
             type(self)(self.conn, i)
@@ -137,6 +166,12 @@ class RailLine(Node):
     def _merge(self, other: Self):
         self.conn.execute("UPDATE RailConnection SET line = :i1 WHERE line = :i2", dict(i1=self.i, i2=other.i))
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        conn.execute(
+            "UPDATE RailConnection SET line = MergePair.i1 FROM MergePair WHERE RailConnection.line = MergePair.i2"
+        )
+
 
 class RailStation(LocatedNode):
     codes = _SetAttr[str]("RailStationCodes", "code", formatter=_format_code)
@@ -158,20 +193,22 @@ class RailStation(LocatedNode):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        codes = kwargs.get("codes", set())
-        i = cls.create_node_with_location(conn, src, ty=cls.__name__, **kwargs)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes_with_location(conn, src, ty=cls.__name__, rows=rows)
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO RailStation (i, name, company) VALUES (:i, :name, :company)",
-            dict(i=i, **kwargs),
+        cur.executemany("INSERT INTO RailStation (i, name, company) VALUES (:i, :name, :company)", params)
+        cur.executemany(
+            "INSERT INTO RailStationCodes (i, code) VALUES (?, ?)",
+            [(i, code) for i, kwargs in zip(ids, rows, strict=True) for code in kwargs["codes"]],
         )
-        cur.executemany("INSERT INTO RailStationCodes (i, code) VALUES (?, ?)", [(i, code) for code in codes])
-        cur.execute(
-            "INSERT INTO RailStationSource (i, source, name) VALUES (:i, :source, :name_src)",
-            dict(i=i, source=src, **kwargs),
-        )
-        return cls(conn, i)
+        cur.executemany("INSERT INTO RailStationSource (i, source, name) VALUES (:i, :source, :name_src)", params)
+        return [cls(conn, i) for i in ids]
 
     @property
     def platforms(self) -> Iterator[RailPlatform]:
@@ -193,6 +230,17 @@ class RailStation(LocatedNode):
         """List of all :py:class:`RailLine` s at this station"""
         return self._sql_derived("rail/station_lines", RailLine)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _join_overlapping(
+            _group_ids(
+                conn,
+                "SELECT group_concat(RailStation.i) FROM RailStation "
+                "INNER JOIN RailStationCodes ON RailStation.i = RailStationCodes.i "
+                "GROUP BY company, code HAVING count(RailStation.i) > 1",
+            )
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         if len(codes := self.codes) == 0:
             return iter(())
@@ -214,6 +262,13 @@ class RailStation(LocatedNode):
         self.conn.execute("UPDATE RailPlatform SET station = :i1 WHERE station = :i2", dict(i1=self.i, i2=other.i))
         super()._merge(other)
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        conn.execute(
+            "UPDATE RailPlatform SET station = MergePair.i1 FROM MergePair WHERE RailPlatform.station = MergePair.i2"
+        )
+        super()._merge_many(conn)
+
 
 class RailPlatform(Node):
     code = _Column[str | None]("code", "RailPlatform", formatter=_format_code)
@@ -233,15 +288,18 @@ class RailPlatform(Node):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO RailPlatform (i, code, station) VALUES (:i, :code, :station)",
-            dict(i=i, **kwargs),
-        )
-        cur.execute("INSERT INTO RailPlatformSource (i, source) VALUES (:i, :source)", dict(i=i, source=src, **kwargs))
-        return cls(conn, i)
+        cur.executemany("INSERT INTO RailPlatform (i, code, station) VALUES (:i, :code, :station)", params)
+        cur.executemany("INSERT INTO RailPlatformSource (i, source) VALUES (:i, :source)", params)
+        return [cls(conn, i) for i in ids]
 
     @property
     def connections_from_here(self) -> Iterator[RailConnection]:
@@ -258,6 +316,14 @@ class RailPlatform(Node):
         """List of all :py:class:`RailLine` s at this platform"""
         return self._sql_derived("rail/berth_lines", RailLine)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM RailPlatform WHERE code IS NOT NULL "
+            "GROUP BY station, code HAVING count(i) > 1",
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         if (code := self.code) is None:
             return iter(())
@@ -273,6 +339,16 @@ class RailPlatform(Node):
         cur.execute('UPDATE RailConnection SET "from" = :i1 WHERE "from" = :i2', dict(i1=self.i, i2=other.i))
         cur.execute('UPDATE RailConnection SET "to" = :i1 WHERE "to" = :i2', dict(i1=self.i, i2=other.i))
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        cur = conn.cursor()
+        cur.execute(
+            'UPDATE RailConnection SET "from" = MergePair.i1 FROM MergePair WHERE RailConnection."from" = MergePair.i2'
+        )
+        cur.execute(
+            'UPDATE RailConnection SET "to" = MergePair.i1 FROM MergePair WHERE RailConnection."to" = MergePair.i2'
+        )
+
 
 class RailConnection(Node):
     line = _FKColumn(RailLine, "line", "RailConnection")
@@ -300,20 +376,26 @@ class RailConnection(Node):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
+        cur.executemany(
             'INSERT INTO RailConnection (i, line, "from", "to", direction, duration) '
             "VALUES (:i, :line, :from_, :to, :direction, :duration)",
-            dict(i=i, **kwargs),
+            params,
         )
-        cur.execute(
+        cur.executemany(
             "INSERT INTO RailConnectionSource (i, source, direction, duration) "
             "VALUES (:i, :source, :direction_src, :duration_src)",
-            dict(i=i, source=src, **kwargs),
+            params,
         )
-        return cls(conn, i)
+        return [cls(conn, i) for i in ids]
 
     @classmethod
     def create2(
@@ -324,6 +406,13 @@ class RailConnection(Node):
         kwargs2["direction"] = direction2 or kwargs2["direction"]
         return cls.create(conn, src, **kwargs), cls.create(conn, src, **kwargs2)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            'SELECT group_concat(i) FROM RailConnection GROUP BY line, "from", "to" HAVING count(i) > 1',
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         return (
             type(self)(self.conn, i)
@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, ClassVar, Literal, NotRequired, Required, Self, TypedDict, Unpack
 
-from gatelogue_types._util import _Column, _FKColumn, _format_code, _format_str, _SetAttr
+from gatelogue_types._util import _Column, _FKColumn, _format_code, _format_str, _group_ids, _join_overlapping, _SetAttr
 from gatelogue_types.node import LocatedNode, Node
 
 if TYPE_CHECKING:
     import sqlite3
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
 
 type SeaMode = Literal["cruise", "warp ferry", "traincarts ferry"]
 
@@ -31,12 +31,18 @@ class SeaCompany(Node):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute("INSERT INTO SeaCompany (i, name, link) VALUES (:i, :name, :link)", dict(i=i, **kwargs))
-        cur.execute("INSERT INTO SeaCompanySource (i, source) VALUES (:i, :source)", dict(i=i, source=src, **kwargs))
-        return cls(conn, i)
+        cur.executemany("INSERT INTO SeaCompany (i, name, link) VALUES (:i, :name, :link)", params)
+        cur.executemany("INSERT INTO SeaCompanySource (i, source) VALUES (:i, :source)", params)
+        return [cls(conn, i) for i in ids]
 
     @property
     def lines(self) -> Iterator[SeaLine]:
@@ -53,6 +59,13 @@ class SeaCompany(Node):
         """List of all :py:class:`SeaDock` s the company's lines stop at"""
         return self._sql_derived("sea/company_docks", SeaDock)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM SeaCompany GROUP BY name HAVING count(i) > 1",
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         return (
             type(self)(self.conn, i)
@@ -64,6 +77,12 @@ class SeaCompany(Node):
         cur.execute("UPDATE SeaLine SET company = :i1 WHERE company = :i2", dict(i1=self.i, i2=other.i))
         cur.execute("UPDATE SeaStop SET company = :i1 WHERE company = :i2", dict(i1=self.i, i2=other.i))
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        cur = conn.cursor()
+        cur.execute("UPDATE SeaLine SET company = MergePair.i1 FROM MergePair WHERE SeaLine.company = MergePair.i2")
+        cur.execute("UPDATE SeaStop SET company = MergePair.i1 FROM MergePair WHERE SeaStop.company = MergePair.i2")
+
 
 class SeaLine(Node):
     code = _Column[str]("code", "SeaLine", formatter=_format_str)
@@ -94,27 +113,28 @@ class SeaLine(Node):
         local: bool | None
 
     @classmethod
-    def create(
-        cls,
-        conn: sqlite3.Connection,
-        src: int,
-        **kwargs: Unpack[CreateParams],
-    ) -> Self:
+    def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
+        cur.executemany(
             "INSERT INTO SeaLine (i, code, company, name, colour, mode, local) "
             "VALUES (:i, :code, :company, :name, :colour, :mode, :local)",
-            dict(i=i, **kwargs),
+            params,
         )
-        cur.execute(
+        cur.executemany(
             "INSERT INTO SeaLineSource (i, source, name, colour, mode, local) "
             "VALUES (:i, :source, :name_src, :colour_src, :mode_src, :local_src)",
-            dict(i=i, source=src, **kwargs),
+            params,
         )
-        return cls(conn, i)
+        return [cls(conn, i) for i in ids]
 
     @property
     def docks(self) -> Iterator[SeaDock]:
@@ -126,6 +146,13 @@ class SeaLine(Node):
         """List of all :py:class:`SeaStop` s the line stops at"""
         return self._sql_derived("sea/line_stops", SeaStop)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM SeaLine GROUP BY code, company HAVING count(i) > 1",
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         return (
             type(self)(self.conn, i)
@@ -137,6 +164,12 @@ class SeaLine(Node):
     def _merge(self, other: Self):
         self.conn.execute("UPDATE SeaConnection SET line = :i1 WHERE line = :i2", dict(i1=self.i, i2=other.i))
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        conn.execute(
+            "UPDATE SeaConnection SET line = MergePair.i1 FROM MergePair WHERE SeaConnection.line = MergePair.i2"
+        )
+
 
 class SeaStop(LocatedNode):
     codes = _SetAttr[str]("SeaStopCodes", "code", formatter=_format_code)
@@ -158,20 +191,22 @@ class SeaStop(LocatedNode):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        codes = kwargs.get("codes", set())
-        i = cls.create_node_with_location(conn, src, ty=cls.__name__, **kwargs)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes_with_location(conn, src, ty=cls.__name__, rows=rows)
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO SeaStop (i, name, company) VALUES (:i, :name, :company)",
-            dict(i=i, **kwargs),
-        )
-        cur.executemany("INSERT INTO SeaStopCodes (i, code) VALUES (?, ?)", [(i, code) for code in codes])
-        cur.execute(
-            "INSERT INTO SeaStopSource (i, source, name) VALUES (:i, :source, :name_src)",
-            dict(i=i, source=src, **kwargs),
+        cur.executemany("INSERT INTO SeaStop (i, name, company) VALUES (:i, :name, :company)", params)
+        cur.executemany(
+            "INSERT INTO SeaStopCodes (i, code) VALUES (?, ?)",
+            [(i, code) for i, kwargs in zip(ids, rows, strict=True) for code in kwargs["codes"]],
         )
-        return cls(conn, i)
+        cur.executemany("INSERT INTO SeaStopSource (i, source, name) VALUES (:i, :source, :name_src)", params)
+        return [cls(conn, i) for i in ids]
 
     @property
     def docks(self) -> Iterator[SeaDock]:
@@ -193,6 +228,17 @@ class SeaStop(LocatedNode):
         """List of all :py:class:`SeaLines` s at this stop"""
         return self._sql_derived("sea/stop_lines", SeaLine)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _join_overlapping(
+            _group_ids(
+                conn,
+                "SELECT group_concat(SeaStop.i) FROM SeaStop "
+                "INNER JOIN SeaStopCodes ON SeaStop.i = SeaStopCodes.i "
+                "GROUP BY company, code HAVING count(SeaStop.i) > 1",
+            )
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         if len(codes := self.codes) == 0:
             return iter(())
@@ -215,6 +261,11 @@ class SeaStop(LocatedNode):
         cur.execute("UPDATE SeaDock SET stop = :i1 WHERE stop = :i2", dict(i1=self.i, i2=other.i))
         super()._merge(other)
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        conn.execute("UPDATE SeaDock SET stop = MergePair.i1 FROM MergePair WHERE SeaDock.stop = MergePair.i2")
+        super()._merge_many(conn)
+
 
 class SeaDock(Node):
     code = _Column[str | None]("code", "SeaDock", formatter=_format_code)
@@ -233,12 +284,18 @@ class SeaDock(Node):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute("INSERT INTO SeaDock (i, code, stop) VALUES (:i, :code, :stop)", dict(i=i, **kwargs))
-        cur.execute("INSERT INTO SeaDockSource (i, source) VALUES (:i, :source)", dict(i=i, source=src, **kwargs))
-        return cls(conn, i)
+        cur.executemany("INSERT INTO SeaDock (i, code, stop) VALUES (:i, :code, :stop)", params)
+        cur.executemany("INSERT INTO SeaDockSource (i, source) VALUES (:i, :source)", params)
+        return [cls(conn, i) for i in ids]
 
     @property
     def connections_from_here(self) -> Iterator[SeaConnection]:
@@ -255,6 +312,13 @@ class SeaDock(Node):
         """List of all :py:class:`SeaLine` s at this dock"""
         return self._sql_derived("sea/dock_lines", SeaLine)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM SeaDock WHERE code IS NOT NULL GROUP BY stop, code HAVING count(i) > 1",
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         if (code := self.code) is None:
             return iter(())
@@ -270,6 +334,16 @@ class SeaDock(Node):
         cur.execute('UPDATE SeaConnection SET "from" = :i1 WHERE "from" = :i2', dict(i1=self.i, i2=other.i))
         cur.execute('UPDATE SeaConnection SET "to" = :i1 WHERE "to" = :i2', dict(i1=self.i, i2=other.i))
 
+    @classmethod
+    def _merge_many(cls, conn: sqlite3.Connection):
+        cur = conn.cursor()
+        cur.execute(
+            'UPDATE SeaConnection SET "from" = MergePair.i1 FROM MergePair WHERE SeaConnection."from" = MergePair.i2'
+        )
+        cur.execute(
+            'UPDATE SeaConnection SET "to" = MergePair.i1 FROM MergePair WHERE SeaConnection."to" = MergePair.i2'
+        )
+
 
 class SeaConnection(Node):
     line = _FKColumn(SeaLine, "line", "SeaConnection")
@@ -297,20 +371,26 @@ class SeaConnection(Node):
     @classmethod
     def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node(conn, src, ty=cls.__name__)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes(conn, src, ty=cls.__name__, count=len(rows))
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
+        cur.executemany(
             'INSERT INTO SeaConnection (i, line, "from", "to", direction, duration) '
             "VALUES (:i, :line, :from_, :to, :direction, :duration)",
-            dict(i=i, **kwargs),
+            params,
         )
-        cur.execute(
+        cur.executemany(
             "INSERT INTO SeaConnectionSource (i, source, direction, duration) "
             "VALUES (:i, :source, :direction_src, :duration_src)",
-            dict(i=i, source=src, **kwargs),
+            params,
         )
-        return cls(conn, i)
+        return [cls(conn, i) for i in ids]
 
     @classmethod
     def create2(
@@ -321,6 +401,13 @@ class SeaConnection(Node):
         kwargs2["direction"] = direction2 or kwargs2["direction"]
         return cls.create(conn, src, **kwargs), cls.create(conn, src, **kwargs2)
 
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            'SELECT group_concat(i) FROM SeaConnection GROUP BY line, "from", "to" HAVING count(i) > 1',
+        )
+
     def equivalent_nodes(self) -> Iterator[Self]:
         return (
             type(self)(self.conn, i)
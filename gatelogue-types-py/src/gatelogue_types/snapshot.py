@@ -0,0 +1,460 @@
+"""
+Read-only snapshot of a whole database, loaded with one query per table into plain records.
+Foreign keys are resolved to the records they refer to, and relationships (e.g. :py:attr:`AirAirport.gates`) are
+pre-computed lists, so that traversing the data does not need any SQL.
+
+.. code-block:: python
+
+   snapshot = gt.GD.get().snapshot()
+   for airport in snapshot.nodes_of(gt.snapshot.AirAirport):
+       for gate in airport.gates:
+           print(f"Airport {airport.code} has gate {gate.code}")
+
+The records have the same attribute names as their ORM counterparts. Changes to the records are not written back.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Iterable, Iterator
+
+    from gatelogue_types.air import AirMode
+    from gatelogue_types.bus import BusMode
+    from gatelogue_types.node import World
+    from gatelogue_types.rail import RailMode
+    from gatelogue_types.sea import SeaMode
+    from gatelogue_types.spawn_warp import WarpType
+    from gatelogue_types.town import Rank
+
+
+@dataclasses.dataclass(slots=True, eq=False)
+class Aircraft:
+    name: str
+    manufacturer: str
+    width: int
+    height: int
+    length: int
+    mode: AirMode
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class Node:
+    """Base class of all node records"""
+
+    i: int
+    """The ID of the node"""
+    sources: set[int] = dataclasses.field(default_factory=set)
+    """All sources that prove the node's existence. Empty in no-source databases."""
+
+    def __repr__(self):
+        return type(self).__name__ + f"({self.i})"
+
+
+@dataclasses.dataclass(slots=True, eq=False)
+class Proximity:
+    distance: float
+    explicit: bool
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class LocatedNode(Node):
+    world: World | None = None
+    coordinates: tuple[int, int] | None = None
+    nodes_in_proximity: list[tuple[LocatedNode, Proximity]] = dataclasses.field(default_factory=list)
+    shared_facilities: list[LocatedNode] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class AirAirline(Node):
+    name: str = ""
+    link: str | None = None
+    flights: list[AirFlight] = dataclasses.field(default_factory=list)
+    gates: list[AirGate] = dataclasses.field(default_factory=list)
+    airports: list[AirAirport] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class AirAirport(LocatedNode):
+    code: str = ""
+    names: set[str] = dataclasses.field(default_factory=set)
+    link: str | None = None
+    modes: set[AirMode] = dataclasses.field(default_factory=set)
+    gates: list[AirGate] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class AirGate(Node):
+    code: str | None = None
+    airport: AirAirport = None  # pyrefly: ignore[bad-assignment]
+    airline: AirAirline | None = None
+    width: int | None = None
+    mode: AirMode | None = None
+    flights_from_here: list[AirFlight] = dataclasses.field(default_factory=list)
+    flights_to_here: list[AirFlight] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class AirFlight(Node):
+    airline: AirAirline = None  # pyrefly: ignore[bad-assignment]
+    code: str = ""
+    from_: AirGate = None  # pyrefly: ignore[bad-assignment]
+    to: AirGate = None  # pyrefly: ignore[bad-assignment]
+    aircraft: Aircraft | None = None
+    duration: int | None = None
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class BusCompany(Node):
+    name: str = ""
+    link: str | None = None
+    lines: list[BusLine] = dataclasses.field(default_factory=list)
+    stops: list[BusStop] = dataclasses.field(default_factory=list)
+    berths: list[BusBerth] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class BusLine(Node):
+    code: str = ""
+    company: BusCompany = None  # pyrefly: ignore[bad-assignment]
+    name: str | None = None
+    colour: str | None = None
+    mode: BusMode | None = None
+    local: bool | None = None
+    connections: list[BusConnection] = dataclasses.field(default_factory=list)
+    berths: list[BusBerth] = dataclasses.field(default_factory=list)
+    stops: list[BusStop] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class BusStop(LocatedNode):
+    codes: set[str] = dataclasses.field(default_factory=set)
+    company: BusCompany = None  # pyrefly: ignore[bad-assignment]
+    name: str | None = None
+    berths: list[BusBerth] = dataclasses.field(default_factory=list)
+    connections_from_here: list[BusConnection] = dataclasses.field(default_factory=list)
+    connections_to_here: list[BusConnection] = dataclasses.field(default_factory=list)
+    lines: list[BusLine] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class BusBerth(Node):
+    code: str | None = None
+    stop: BusStop = None  # pyrefly: ignore[bad-assignment]
+    connections_from_here: list[BusConnection] = dataclasses.field(default_factory=list)
+    connections_to_here: list[BusConnection] = dataclasses.field(default_factory=list)
+    lines: list[BusLine] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class BusConnection(Node):
+    line: BusLine = None  # pyrefly: ignore[bad-assignment]
+    from_: BusBerth = None  # pyrefly: ignore[bad-assignment]
+    to: BusBerth = None  # pyrefly: ignore[bad-assignment]
+    direction: str | None = None
+    duration: int | None = None
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class SeaCompany(Node):
+    name: str = ""
+    link: str | None = None
+    lines: list[SeaLine] = dataclasses.field(default_factory=list)
+    stops: list[SeaStop] = dataclasses.field(default_factory=list)
+    docks: list[SeaDock] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class SeaLine(Node):
+    code: str = ""
+    company: SeaCompany = None  # pyrefly: ignore[bad-assignment]
+    name: str | None = None
+    colour: str | None = None
+    mode: SeaMode | None = None
+    local: bool | None = None
+    connections: list[SeaConnection] = dataclasses.field(default_factory=list)
+    docks: list[SeaDock] = dataclasses.field(default_factory=list)
+    stops: list[SeaStop] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class SeaStop(LocatedNode):
+    codes: set[str] = dataclasses.field(default_factory=set)
+    company: SeaCompany = None  # pyrefly: ignore[bad-assignment]
+    name: str | None = None
+    docks: list[SeaDock] = dataclasses.field(default_factory=list)
+    connections_from_here: list[SeaConnection] = dataclasses.field(default_factory=list)
+    connections_to_here: list[SeaConnection] = dataclasses.field(default_factory=list)
+    lines: list[SeaLine] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class SeaDock(Node):
+    code: str | None = None
+    stop: SeaStop = None  # pyrefly: ignore[bad-assignment]
+    connections_from_here: list[SeaConnection] = dataclasses.field(default_factory=list)
+    connections_to_here: list[SeaConnection] = dataclasses.field(default_factory=list)
+    lines: list[SeaLine] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class SeaConnection(Node):
+    line: SeaLine = None  # pyrefly: ignore[bad-assignment]
+    from_: SeaDock = None  # pyrefly: ignore[bad-assignment]
+    to: SeaDock = None  # pyrefly: ignore[bad-assignment]
+    direction: str | None = None
+    duration: int | None = None
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class RailCompany(Node):
+    name: str = ""
+    link: str | None = None
+    lines: list[RailLine] = dataclasses.field(default_factory=list)
+    stations: list[RailStation] = dataclasses.field(default_factory=list)
+    platforms: list[RailPlatform] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class RailLine(Node):
+    code: str = ""
+    company: RailCompany = None  # pyrefly: ignore[bad-assignment]
+    name: str | None = None
+    colour: str | None = None
+    mode: RailMode | None = None
+    local: bool | None = None
+    connections: list[RailConnection] = dataclasses.field(default_factory=list)
+    platforms: list[RailPlatform] = dataclasses.field(default_factory=list)
+    stations: list[RailStation] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class RailStation(LocatedNode):
+    codes: set[str] = dataclasses.field(default_factory=set)
+    company: RailCompany = None  # pyrefly: ignore[bad-assignment]
+    name: str | None = None
+    platforms: list[RailPlatform] = dataclasses.field(default_factory=list)
+    connections_from_here: list[RailConnection] = dataclasses.field(default_factory=list)
+    connections_to_here: list[RailConnection] = dataclasses.field(default_factory=list)
+    lines: list[RailLine] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class RailPlatform(Node):
+    code: str | None = None
+    station: RailStation = None  # pyrefly: ignore[bad-assignment]
+    connections_from_here: list[RailConnection] = dataclasses.field(default_factory=list)
+    connections_to_here: list[RailConnection] = dataclasses.field(default_factory=list)
+    lines: list[RailLine] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class RailConnection(Node):
+    line: RailLine = None  # pyrefly: ignore[bad-assignment]
+    from_: RailPlatform = None  # pyrefly: ignore[bad-assignment]
+    to: RailPlatform = None  # pyrefly: ignore[bad-assignment]
+    direction: str | None = None
+    duration: int | None = None
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class SpawnWarp(LocatedNode):
+    name: str = ""
+    warp_type: WarpType = None  # pyrefly: ignore[bad-assignment]
+
+
+@dataclasses.dataclass(slots=True, eq=False, repr=False)
+class Town(LocatedNode):
+    name: str = ""
+    rank: Rank = None  # pyrefly: ignore[bad-assignment]
+    mayor: str = ""
+    deputy_mayor: str | None = None
+
+
+_STR2TYPE: dict[str, type[Node]] = {
+    ty.__name__: ty
+    for ty in (
+        AirAirline, AirAirport, AirGate, AirFlight,
+        BusCompany, BusLine, BusStop, BusBerth, BusConnection,
+        SeaCompany, SeaLine, SeaStop, SeaDock, SeaConnection,
+        RailCompany, RailLine, RailStation, RailPlatform, RailConnection,
+        SpawnWarp, Town,
+    )
+}  # fmt: skip
+_FK_COLUMNS = {"from", "to", "airport", "airline", "company", "stop", "station", "line"}
+_RENAMED_COLUMNS = {"from": "from_", "warpType": "warp_type", "deputyMayor": "deputy_mayor"}
+_SET_TABLES = {
+    "AirAirportNames": "names",
+    "AirAirportModes": "modes",
+    "BusStopCodes": "codes",
+    "SeaStopCodes": "codes",
+    "RailStationCodes": "codes",
+}
+_TRANSIT_TYPES = (
+    (BusLine, BusStop, BusBerth, BusConnection, "stop", "stops", "berths"),
+    (SeaLine, SeaStop, SeaDock, SeaConnection, "stop", "stops", "docks"),
+    (RailLine, RailStation, RailPlatform, RailConnection, "station", "stations", "platforms"),
+)
+
+
+def _unique[T](it: Iterable[T]) -> list[T]:
+    return list(dict.fromkeys(it))
+
+
+class Snapshot:
+    """All nodes of a database as records. Get one with :py:meth:`gatelogue_types.GD.snapshot`"""
+
+    timestamp: str
+    """Time that the aggregation of the data was done"""
+    version: int
+    """Version number of the database format"""
+    has_sources: bool
+    """Whether the database has sources"""
+    nodes: dict[int, Node]
+    """All nodes by ID"""
+    aircraft: dict[str, Aircraft]
+    """All aircraft by name"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.timestamp, self.version, self.has_sources = conn.execute(
+            "SELECT timestamp, version, has_sources FROM Metadata"
+        ).fetchone()
+        self.has_sources = bool(self.has_sources)
+        self.aircraft = {row[0]: Aircraft(*row) for row in conn.execute("SELECT * FROM Aircraft")}
+        self.nodes = {i: _STR2TYPE[ty](i) for i, ty in conn.execute("SELECT i, type FROM Node")}
+        self._by_type: dict[type[Node], list[Node]] = defaultdict(list)
+        for node in self.nodes.values():
+            self._by_type[type(node)].append(node)
+
+        if self.has_sources:
+            for i, source in conn.execute("SELECT i, source FROM NodeSource"):
+                self.nodes[i].sources.add(source)
+        for i, world, x, y in conn.execute("SELECT i, world, x, y FROM NodeLocation"):
+            node: Any = self.nodes[i]
+            node.world = world
+            node.coordinates = None if x is None or y is None else (x, y)
+
+        for ty in _STR2TYPE.values():
+            if self._by_type[ty]:
+                self._load_table(conn, ty)
+        for table, attr in _SET_TABLES.items():
+            for i, value in conn.execute(f"SELECT * FROM {table}"):
+                getattr(self.nodes[i], attr).add(value)
+
+        for node1, node2, distance, explicit in conn.execute("SELECT * FROM Proximity"):
+            n1: Any = self.nodes[node1]
+            n2: Any = self.nodes[node2]
+            proximity = Proximity(distance, bool(explicit))
+            n1.nodes_in_proximity.append((n2, proximity))
+            n2.nodes_in_proximity.append((n1, proximity))
+        for node1, node2 in conn.execute("SELECT * FROM SharedFacility"):
+            n1 = self.nodes[node1]
+            n2 = self.nodes[node2]
+            n1.shared_facilities.append(n2)
+            n2.shared_facilities.append(n1)
+
+        self._link_air()
+        for types in _TRANSIT_TYPES:
+            self._link_transit(*types)
+
+    def _load_table(self, conn: sqlite3.Connection, ty: type[Node]):
+        cur = conn.execute(f"SELECT * FROM {ty.__name__}")
+        columns = [name for (name, *_) in cur.description]
+        setters = []
+        for index, column in enumerate(columns):
+            if column == "i":
+                continue
+            attr = _RENAMED_COLUMNS.get(column, column)
+            if column == "aircraft":
+                setters.append((index, attr, self.aircraft))
+            elif column in _FK_COLUMNS:
+                setters.append((index, attr, self.nodes))
+            elif column == "local":
+                setters.append((index, attr, {0: False, 1: True}))
+            else:
+                setters.append((index, attr, None))
+        for row in cur:
+            node = self.nodes[row[0]]
+            for index, attr, lookup in setters:
+                value = row[index]
+                setattr(node, attr, value if lookup is None or value is None else lookup[value])
+
+    def _link_air(self):
+        for gate in self.nodes_of(AirGate):
+            gate.airport.gates.append(gate)
+            if gate.airline is not None:
+                gate.airline.gates.append(gate)
+        for flight in self.nodes_of(AirFlight):
+            flight.airline.flights.append(flight)
+            flight.from_.flights_from_here.append(flight)
+            flight.to.flights_to_here.append(flight)
+        for airline in self.nodes_of(AirAirline):
+            airline.gates = sorted(
+                _unique([*airline.gates, *(g for f in airline.flights for g in (f.from_, f.to))]), key=lambda n: n.i
+            )
+            airline.airports = sorted(
+                _unique(
+                    [
+                        *(g.airport for g in airline.gates if g.airline is airline),
+                        *(g.airport for f in airline.flights for g in (f.from_, f.to)),
+                    ]
+                ),
+                key=lambda n: n.i,
+            )
+
+    def _link_transit(
+        self,
+        line_ty: type[Node],
+        stop_ty: type[Node],
+        platform_ty: type[Node],
+        connection_ty: type[Node],
+        stop_attr: str,
+        stops_attr: str,
+        platforms_attr: str,
+    ):
+        for line in self.nodes_of(line_ty):
+            line.company.lines.append(line)  # pyrefly: ignore[missing-attribute]
+        for stop in self.nodes_of(stop_ty):
+            getattr(stop.company, stops_attr).append(stop)  # pyrefly: ignore[missing-attribute]
+        for platform in self.nodes_of(platform_ty):
+            stop: Any = getattr(platform, stop_attr)
+            getattr(stop, platforms_attr).append(platform)
+            getattr(stop.company, platforms_attr).append(platform)
+        for connection in self.nodes_of(connection_ty):
+            c: Any = connection
+            c.line.connections.append(c)
+            c.from_.connections_from_here.append(c)
+            c.to.connections_to_here.append(c)
+            getattr(c.from_, stop_attr).connections_from_here.append(c)
+            getattr(c.to, stop_attr).connections_to_here.append(c)
+
+        for platform in self.nodes_of(platform_ty):
+            p: Any = platform
+            p.lines = _unique(c.line for c in (*p.connections_from_here, *p.connections_to_here))
+        for stop in self.nodes_of(stop_ty):
+            s: Any = stop
+            s.lines = _unique(c.line for c in (*s.connections_from_here, *s.connections_to_here))
+        for line in self.nodes_of(line_ty):
+            ln: Any = line
+            platforms = _unique(p for c in ln.connections for p in (c.from_, c.to))
+            setattr(ln, platforms_attr, platforms)
+            setattr(ln, stops_attr, _unique(getattr(p, stop_attr) for p in platforms))
+
+    def nodes_of[T: Node](self, ty: type[T]) -> Iterator[T]:
+        """All nodes of a specific type, or of all types if ``ty`` is :py:class:`Node`,
+        or of all located types if ``ty`` is :py:class:`LocatedNode`"""
+        if ty is Node:
+            return iter(self.nodes.values())  # pyrefly: ignore[bad-return]
+        if ty is LocatedNode:
+            return (n for n in self.nodes.values() if isinstance(n, LocatedNode))  # pyrefly: ignore[bad-return]
+        return iter(self._by_type[ty])  # pyrefly: ignore[bad-return]
+
+    def __iter__(self) -> Iterator[Node]:
+        return iter(self.nodes.values())
+
+    def __len__(self):
+        return len(self.nodes)
@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, ClassVar, Literal, Self, Unpack
 
-from gatelogue_types._util import _Column, _format_str
+from gatelogue_types._util import _Column, _format_str, _group_ids
 from gatelogue_types.node import LocatedNode
 
 if TYPE_CHECKING:
     import sqlite3
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
 
 type WarpType = Literal["premier", "terminus", "traincarts", "portal", "misc"]
 
@@ -29,21 +29,26 @@ class SpawnWarp(LocatedNode):
         warp_type: str
 
     @classmethod
-    def create(
-        cls,
-        conn: sqlite3.Connection,
-        src: int,
-        **kwargs: Unpack[CreateParams],
-    ) -> Self:
+    def create(cls, conn: sqlite3.Connection, src: int, **kwargs: Unpack[CreateParams]) -> Self:
         """Internal use"""
-        kwargs = cls.format_create_kwargs(**kwargs)  # pyrefly: ignore[bad-assignment]
-        i = cls.create_node_with_location(conn, src, ty=cls.__name__, **kwargs)
+        return cls.create_many(conn, src, [kwargs])[0]
+
+    @classmethod
+    def create_many(cls, conn: sqlite3.Connection, src: int, rows: Iterable[CreateParams]) -> list[Self]:
+        """Internal use. Creates many nodes as with :py:meth:`create`, with one query per table"""
+        rows = [cls.format_create_kwargs(**kwargs) for kwargs in rows]
+        ids = cls.create_nodes_with_location(conn, src, ty=cls.__name__, rows=rows)
+        params = [dict(i=i, source=src, **kwargs) for i, kwargs in zip(ids, rows, strict=True)]
         cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO SpawnWarp (i, name, warpType) VALUES (:i, :name, :warp_type)",
-            dict(i=i, **kwargs),
+        cur.executemany("INSERT INTO SpawnWarp (i, name, warpType) VALUES (:i, :name, :warp_type)", params)
+        return [cls(conn, i) for i in ids]
+
+    @classmethod
+    def equivalent_node_groups(cls, conn: sqlite3.Connection) -> list[list[int]]:
+        return _group_ids(
+            conn,
+            "SELECT group_concat(i) FROM SpawnWarp GROUP BY name, warpType HAVING count(i) > 1",
         )
-        return cls(conn, i)
 
     def equivalent_nodes(self) -> Iterator[Self]:
         return (
@@ -1,8 +1,11 @@
 import asyncio
 
+import pytest
+
 from gatelogue_types import GD
 from gatelogue_types.air import AirAirline, AirAirport, AirFlight, AirGate
 from gatelogue_types.bus import BusCompany, BusStop
+from gatelogue_types.node import Proximity, SharedFacility
 
 
 def test_urllib_with_sources():
@@ -86,3 +89,206 @@ def test_bus_stop_merge():
     stop2 = BusStop.create(gd.conn, 1, codes={"b", "c"}, company=company)
     assert stop2 in stop1.equivalent_nodes()
     stop1.merge(stop2)
+
+
+def test_equivalent_node_groups():
+    gd = GD.create(["0", "1"])
+
+    company = BusCompany.create(gd.conn, 0, name="Example Inc")
+    BusCompany.create(gd.conn, 1, name="Example Inc")
+    stop1 = BusStop.create(gd.conn, 0, codes={"a", "b"}, company=company)
+    stop2 = BusStop.create(gd.conn, 1, codes={"c"}, company=company)
+    stop3 = BusStop.create(gd.conn, 1, codes={"b", "c"}, company=company)
+    BusStop.create(gd.conn, 1, codes={"d"}, company=company)
+    airport1 = AirAirport.create(gd.conn, 0, code="AAA")
+    airport2 = AirAirport.create(gd.conn, 1, code="AAA")
+    AirAirport.create(gd.conn, 1, code="")
+    AirAirport.create(gd.conn, 1, code="")
+
+    assert BusCompany.equivalent_node_groups(gd.conn) == [[company.i, company.i + 1]]
+    assert BusStop.equivalent_node_groups(gd.conn) == [[stop1.i, stop2.i, stop3.i]]
+    assert AirAirport.equivalent_node_groups(gd.conn) == [[airport1.i, airport2.i]]
+
+
+def test_merge_many():
+    gd = GD.create(["0", "1"])
+
+    airline = AirAirline.create(gd.conn, 0, name="Example Air")
+    airport1 = AirAirport.create(gd.conn, 0, code="AAA")
+    airport2 = AirAirport.create(gd.conn, 1, code="AAA")
+    airport3 = AirAirport.create(gd.conn, 1, code="BBB")
+    gate1 = AirGate.create(gd.conn, 0, airport=airport1, code=None, mode="helicopter")
+    gate2 = AirGate.create(gd.conn, 0, airport=airport3, code=None)
+    gate3 = AirGate.create(gd.conn, 1, airport=airport2, code="A")
+    gate4 = AirGate.create(gd.conn, 1, airport=airport3, code="B")
+    flight1 = AirFlight.create(gd.conn, 0, airline=airline, code="001", from_=gate1, to=gate2)
+    flight2 = AirFlight.create(gd.conn, 1, airline=airline, code="001", from_=gate3, to=gate4)
+
+    AirAirport.merge_many(gd.conn, [(airport1.i, airport2.i), (airport2.i, airport1.i)], warn_fn=lambda _: None)
+    assert gd.conn.execute("SELECT count(rowid) FROM AirAirport").fetchone()[0] == 2
+    assert gate3.airport == airport1
+
+    AirFlight.merge_many(gd.conn, [(flight1.i, flight2.i)])
+    assert gd.conn.execute("SELECT count(rowid) FROM AirFlight").fetchone()[0] == 1
+    assert gd.conn.execute("SELECT count(rowid) FROM AirGate").fetchone()[0] == 2
+    assert flight1.from_.code == "A"
+    assert flight1.to.code == "B"
+    assert flight1.from_.mode == "helicopter"
+
+
+def test_create_many():
+    gd = GD.create(["0"])
+
+    airport = AirAirport.create(gd.conn, 0, code="AAA")
+    gates = AirGate.create_many(
+        gd.conn, 0, [dict(airport=airport, code=None), dict(airport=airport, code=" 1 ", width=15)]
+    )
+    gate3 = AirGate.create(gd.conn, 0, airport=airport, code="2")
+    assert [gate.i for gate in gates] == [airport.i + 1, airport.i + 2]
+    assert gate3.i == airport.i + 3
+    assert gates[1].code == "1"
+    assert gates[1].width == 15
+    assert gd.conn.execute("SELECT count(rowid) FROM AirGateSource").fetchone()[0] == 3
+
+    airports = AirAirport.create_many(
+        gd.conn, 0, [dict(code="BBB", names={"B1", "B2"}, coordinates=(1, 2)), dict(code="CCC")]
+    )
+    assert airports[0].names == {"B1", "B2"}
+    assert airports[0].coordinates == (1, 2)
+    assert airports[1].names == set()
+    assert AirGate.create_many(gd.conn, 0, []) == []
+
+    facilities = SharedFacility.create_many(gd.conn, [(airports[1], airports[0]), (airports[0], airports[1])])
+    assert [(f.node1, f.node2) for f in facilities] == [(airports[0].i, airports[1].i)] * 2
+    assert [node.i for node in airports[0].shared_facilities] == [airports[1].i]
+
+
+def test_delete_many():
+    gd = GD.create(["0"])
+
+    airport = AirAirport.create(gd.conn, 0, code="AAA", coordinates=(0, 0))
+    gate1 = AirGate.create(gd.conn, 0, airport=airport, code=None)
+    gate2 = AirGate.create(gd.conn, 0, airport=airport, code="1")
+    gate3 = AirGate.create(gd.conn, 0, airport=airport, code="2")
+
+    AirGate.delete_many(gd.conn, [gate1.i, gate3.i, gate1.i])
+    assert gd.conn.execute("SELECT i FROM AirGate").fetchall() == [(gate2.i,)]
+    assert gd.conn.execute("SELECT count(rowid) FROM AirGateSource").fetchone()[0] == 1
+
+    AirGate.delete_many(gd.conn, [gate2.i])
+    AirAirport.delete_many(gd.conn, [airport.i])
+    assert gd.conn.execute("SELECT count(rowid) FROM Node").fetchone()[0] == 0
+    assert gd.conn.execute("SELECT count(rowid) FROM NodeLocation").fetchone()[0] == 0
+
+
+def test_indices():
+    gd = GD.create(["0"])
+    indices_query = "SELECT count(*) FROM sqlite_schema WHERE type = 'index' AND name LIKE '%Index'"
+    assert gd.conn.execute(indices_query).fetchone()[0] > 0
+
+    gd.drop_indices()
+    assert gd.conn.execute(indices_query).fetchone()[0] == 0
+
+    gd.drop_sources()
+    gd = GD.from_bytes(gd.conn.serialize(), indices=True)
+    assert gd.conn.execute(indices_query).fetchone()[0] > 0
+
+
+def test_extend():
+    gd = GD.create(["0", "1"])
+    template = gd.conn.serialize()
+    staging1 = GD.from_bytes(template)
+    staging2 = GD.from_bytes(template)
+
+    airport1 = AirAirport.create(staging1.conn, 0, code="AAA")
+    AirGate.create(staging1.conn, 0, airport=airport1, code="1")
+    airport2 = AirAirport.create(staging2.conn, 1, code="BBB")
+    AirGate.create(staging2.conn, 1, airport=airport2, code="2")
+
+    gd.extend(staging1)
+    gd.extend(staging2)
+    staged = len(staging1) + len(staging2)
+    assert len(gd) == staged
+    assert sorted((gate.airport.code, gate.code) for gate in gd.nodes(AirGate)) == [("AAA", "1"), ("BBB", "2")]
+    assert {node.i for node in gd.nodes()} == set(range(1, staged + 1))
+    assert AirAirport.create(gd.conn, 0, code="CCC").i == staged + 1
+
+
+def test_batch():
+    gd = GD.create(["0"])
+
+    with gd.batch():
+        AirAirport.create(gd.conn, 0, code="AAA")
+        with gd.batch():
+            AirAirport.create(gd.conn, 0, code="BBB")
+        assert gd.conn.in_transaction
+    assert not gd.conn.in_transaction
+    assert len(gd) == 2
+
+    def fail():
+        with gd.batch():
+            AirAirport.create(gd.conn, 0, code="CCC")
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        fail()
+    assert not gd.conn.in_transaction
+    assert len(gd) == 2
+
+
+def test_row_cache():
+    gd = GD.create(["0", "1"])
+    gd.enable_row_cache()
+
+    airport = AirAirport.create(gd.conn, 0, code="AAA", names={"Example Airport"})
+    gate1 = AirGate.create(gd.conn, 0, airport=airport, code=None)
+    gate2 = AirGate.create(gd.conn, 1, airport=airport, code="1", width=15)
+    assert gate1.code is None
+    assert airport.names == {"Example Airport"}
+
+    gate1.code = "2"
+    airport.names = {"Example Airport", "Other Airport"}
+    assert gate1.code == "2"
+    assert airport.names == {"Example Airport", "Other Airport"}
+
+    gate1.merge(gate2, warn_fn=lambda _: None)
+    assert gate1.width == 15
+    assert [gate.i for gate in airport.gates] == [gate1.i]
+
+    gd.conn.execute("UPDATE AirGate SET width = 20 WHERE i = :i", dict(i=gate1.i))
+    gd.clear_row_cache()
+    assert gate1.width == 20
+
+
+def test_snapshot():
+    gd = GD.create(["0"])
+    airline = AirAirline.create(gd.conn, 0, name="Example Air")
+    airport1 = AirAirport.create(gd.conn, 0, code="AAA", names={"Example Airport"}, world="New", coordinates=(0, 0))
+    airport2 = AirAirport.create(gd.conn, 0, code="BBB")
+    gate1 = AirGate.create(gd.conn, 0, airport=airport1, code="1", airline=airline)
+    gate2 = AirGate.create(gd.conn, 0, airport=airport2, code=None)
+    flight = AirFlight.create(gd.conn, 0, airline=airline, code="1", from_=gate1, to=gate2)
+    company = BusCompany.create(gd.conn, 0, name="Example Bus")
+    stop = BusStop.create(gd.conn, 0, codes={"A"}, company=company, world="New", coordinates=(10, 0))
+    Proximity.create(gd.conn, [0], node1=airport1, node2=stop, distance=10.0)
+
+    snapshot = gd.snapshot()
+    assert len(snapshot) == len(gd)
+    assert snapshot.has_sources
+    for node in gd.nodes():
+        record = snapshot.nodes[node.i]
+        assert type(record).__name__ == type(node).__name__
+        assert record.sources == node.sources
+
+    s_airport1 = snapshot.nodes[airport1.i]
+    assert s_airport1.names == {"Example Airport"}
+    assert s_airport1.coordinates == (0, 0)
+    assert [gate.i for gate in s_airport1.gates] == [gate1.i]
+    assert [(n.i, p.distance) for n, p in s_airport1.nodes_in_proximity] == [(stop.i, 10.0)]
+    s_flight = snapshot.nodes[flight.i]
+    assert s_flight.from_ is snapshot.nodes[gate1.i]
+    assert s_flight.to.airport is snapshot.nodes[airport2.i]
+    assert [a.i for a in snapshot.nodes[airline.i].airports] == [a.i for a in airline.airports]
+    assert [g.i for g in snapshot.nodes[airline.i].gates] == [g.i for g in airline.gates]
+    assert [s.i for s in snapshot.nodes[company.i].stops] == [stop.i]
+    assert [s.i for s in snapshot.nodes_of(type(s_airport1))] == [airport1.i, airport2.i]
@@ -0,0 +1,6 @@
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS NodeSourceSourceIndex ON NodeSource (source);
+CREATE INDEX IF NOT EXISTS ProximitySourceNode2Index ON ProximitySource (node2);
+
+COMMIT;
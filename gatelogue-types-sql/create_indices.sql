@@ -0,0 +1,44 @@
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS NodeTypeIndex ON Node (type);
+
+CREATE INDEX IF NOT EXISTS AirAirlineNameIndex ON AirAirline (name);
+CREATE INDEX IF NOT EXISTS AirAirportCodeIndex ON AirAirport (code);
+CREATE INDEX IF NOT EXISTS AirAirportNamesNameIndex ON AirAirportNames (name);
+CREATE INDEX IF NOT EXISTS AirGateAirportIndex ON AirGate (airport, code);
+CREATE INDEX IF NOT EXISTS AirGateAirlineIndex ON AirGate (airline);
+CREATE INDEX IF NOT EXISTS AirFlightAirlineIndex ON AirFlight (airline, code);
+CREATE INDEX IF NOT EXISTS AirFlightFromIndex ON AirFlight ("from");
+CREATE INDEX IF NOT EXISTS AirFlightToIndex ON AirFlight ("to");
+
+CREATE INDEX IF NOT EXISTS BusCompanyNameIndex ON BusCompany (name);
+CREATE INDEX IF NOT EXISTS BusLineCompanyIndex ON BusLine (company, code);
+CREATE INDEX IF NOT EXISTS BusStopCompanyIndex ON BusStop (company, name);
+CREATE INDEX IF NOT EXISTS BusStopCodesCodeIndex ON BusStopCodes (code);
+CREATE INDEX IF NOT EXISTS BusBerthStopIndex ON BusBerth (stop, code);
+CREATE INDEX IF NOT EXISTS BusConnectionLineIndex ON BusConnection (line);
+CREATE INDEX IF NOT EXISTS BusConnectionFromIndex ON BusConnection ("from");
+CREATE INDEX IF NOT EXISTS BusConnectionToIndex ON BusConnection ("to");
+
+CREATE INDEX IF NOT EXISTS SeaCompanyNameIndex ON SeaCompany (name);
+CREATE INDEX IF NOT EXISTS SeaLineCompanyIndex ON SeaLine (company, code);
+CREATE INDEX IF NOT EXISTS SeaStopCompanyIndex ON SeaStop (company, name);
+CREATE INDEX IF NOT EXISTS SeaStopCodesCodeIndex ON SeaStopCodes (code);
+CREATE INDEX IF NOT EXISTS SeaDockStopIndex ON SeaDock (stop, code);
+CREATE INDEX IF NOT EXISTS SeaConnectionLineIndex ON SeaConnection (line);
+CREATE INDEX IF NOT EXISTS SeaConnectionFromIndex ON SeaConnection ("from");
+CREATE INDEX IF NOT EXISTS SeaConnectionToIndex ON SeaConnection ("to");
+
+CREATE INDEX IF NOT EXISTS RailCompanyNameIndex ON RailCompany (name);
+CREATE INDEX IF NOT EXISTS RailLineCompanyIndex ON RailLine (company, code);
+CREATE INDEX IF NOT EXISTS RailStationCompanyIndex ON RailStation (company, name);
+CREATE INDEX IF NOT EXISTS RailStationCodesCodeIndex ON RailStationCodes (code);
+CREATE INDEX IF NOT EXISTS RailPlatformStationIndex ON RailPlatform (station, code);
+CREATE INDEX IF NOT EXISTS RailConnectionLineIndex ON RailConnection (line);
+CREATE INDEX IF NOT EXISTS RailConnectionFromIndex ON RailConnection ("from");
+CREATE INDEX IF NOT EXISTS RailConnectionToIndex ON RailConnection ("to");
+
+CREATE INDEX IF NOT EXISTS ProximityNode2Index ON Proximity (node2);
+CREATE INDEX IF NOT EXISTS SharedFacilityNode2Index ON SharedFacility (node2);
+
+COMMIT;
@@ -0,0 +1,42 @@
+BEGIN;
+
+DROP INDEX IF EXISTS NodeTypeIndex;
+DROP INDEX IF EXISTS AirAirlineNameIndex;
+DROP INDEX IF EXISTS AirAirportCodeIndex;
+DROP INDEX IF EXISTS AirAirportNamesNameIndex;
+DROP INDEX IF EXISTS AirGateAirportIndex;
+DROP INDEX IF EXISTS AirGateAirlineIndex;
+DROP INDEX IF EXISTS AirFlightAirlineIndex;
+DROP INDEX IF EXISTS AirFlightFromIndex;
+DROP INDEX IF EXISTS AirFlightToIndex;
+DROP INDEX IF EXISTS BusCompanyNameIndex;
+DROP INDEX IF EXISTS BusLineCompanyIndex;
+DROP INDEX IF EXISTS BusStopCompanyIndex;
+DROP INDEX IF EXISTS BusStopCodesCodeIndex;
+DROP INDEX IF EXISTS BusBerthStopIndex;
+DROP INDEX IF EXISTS BusConnectionLineIndex;
+DROP INDEX IF EXISTS BusConnectionFromIndex;
+DROP INDEX IF EXISTS BusConnectionToIndex;
+DROP INDEX IF EXISTS SeaCompanyNameIndex;
+DROP INDEX IF EXISTS SeaLineCompanyIndex;
+DROP INDEX IF EXISTS SeaStopCompanyIndex;
+DROP INDEX IF EXISTS SeaStopCodesCodeIndex;
+DROP INDEX IF EXISTS SeaDockStopIndex;
+DROP INDEX IF EXISTS SeaConnectionLineIndex;
+DROP INDEX IF EXISTS SeaConnectionFromIndex;
+DROP INDEX IF EXISTS SeaConnectionToIndex;
+DROP INDEX IF EXISTS RailCompanyNameIndex;
+DROP INDEX IF EXISTS RailLineCompanyIndex;
+DROP INDEX IF EXISTS RailStationCompanyIndex;
+DROP INDEX IF EXISTS RailStationCodesCodeIndex;
+DROP INDEX IF EXISTS RailPlatformStationIndex;
+DROP INDEX IF EXISTS RailConnectionLineIndex;
+DROP INDEX IF EXISTS RailConnectionFromIndex;
+DROP INDEX IF EXISTS RailConnectionToIndex;
+DROP INDEX IF EXISTS ProximityNode2Index;
+DROP INDEX IF EXISTS SharedFacilityNode2Index;
+DROP INDEX IF EXISTS NodeSourceSourceIndex;
+DROP INDEX IF EXISTS ProximitySourceNode2Index;
+
+COMMIT;
+VACUUM;